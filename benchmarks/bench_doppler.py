@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for Doppler imaging.
+
+"""
+from .common import get_doppler_map, get_function, get_cold_start_code
+
+
+class DopplerFlux:
+    """Steady-state evaluation of the spectral timeseries."""
+
+    params = ([1, 10, 30], [100, 300, 1000], [False, True])
+    param_names = ["nt", "nw", "lazy"]
+    timeout = 600
+
+    def setup(self, nt, nw, lazy):
+        map = get_doppler_map(nt, nw, lazy)
+        self.func = get_function(lambda: map.flux(), lazy)
+        self.func()
+
+    def time_flux(self, nt, nw, lazy):
+        self.func()
+
+    def peakmem_flux(self, nt, nw, lazy):
+        self.func()
+
+
+class DopplerSolve:
+    """Linear and bilinear solves for the map and the spectrum."""
+
+    params = ([1, 10, 30], [100, 300, 1000])
+    param_names = ["nt", "nw"]
+    timeout = 600
+
+    def setup(self, nt, nw):
+        self.map = get_doppler_map(nt, nw, False)
+        self.flux = self.map.flux(normalize=False)
+        self.map.solve(
+            self.flux, fix_spectrum=True, normalized=False, quiet=True
+        )
+
+    def time_solve_map(self, nt, nw):
+        self.map.solve(
+            self.flux, fix_spectrum=True, normalized=False, quiet=True
+        )
+
+    def time_solve_spectrum(self, nt, nw):
+        self.map.solve(self.flux, fix_map=True, normalized=False, quiet=True)
+
+    def peakmem_solve_map(self, nt, nw):
+        self.map.solve(
+            self.flux, fix_spectrum=True, normalized=False, quiet=True
+        )
+
+
+class DopplerFluxColdStart:
+    """Import, instantiation and compilation time for Doppler maps."""
+
+    params = ([False, True],)
+    param_names = ["lazy"]
+    timeout = 600
+    number = 1
+    repeat = 1
+
+    def timeraw_flux(self, lazy):
+        return get_cold_start_code(
+            "map = get_doppler_map(10, 300, {lazy})\n"
+            "get_function(lambda: map.flux(), {lazy})()".format(lazy=lazy)
+        )
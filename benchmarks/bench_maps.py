@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for the light curves of the different map types.
+
+"""
+from .common import (
+    get_map,
+    get_flux_kwargs,
+    get_function,
+    get_cold_start_code,
+)
+
+KINDS = ["ylm", "ld", "rv", "reflected", "oblate", "spectral"]
+
+
+class MapFlux:
+    """Steady-state light curve evaluation for each map type."""
+
+    params = (KINDS, [2, 5, 10], [10, 1000], [False, True])
+    param_names = ["kind", "deg", "nt", "lazy"]
+    timeout = 600
+
+    def setup(self, kind, deg, nt, lazy):
+        map = get_map(kind, deg, lazy)
+        kwargs = get_flux_kwargs(kind, nt)
+        method = map.rv if kind == "rv" else map.flux
+        self.func = get_function(lambda: method(**kwargs), lazy)
+
+        # Compile the function outside of the timed region
+        self.func()
+
+    def time_flux(self, kind, deg, nt, lazy):
+        self.func()
+
+    def peakmem_flux(self, kind, deg, nt, lazy):
+        self.func()
+
+
+class MapFluxColdStart:
+    """Import, instantiation and compilation time for each map type."""
+
+    params = (KINDS, [2, 5, 10], [False, True])
+    param_names = ["kind", "deg", "lazy"]
+    timeout = 600
+    number = 1
+    repeat = 1
+
+    def timeraw_flux(self, kind, deg, lazy):
+        return get_cold_start_code(
+            "map = get_map({kind!r}, {deg}, {lazy})\n"
+            "kwargs = get_flux_kwargs({kind!r}, 10)\n"
+            "method = map.rv if {kind!r} == 'rv' else map.flux\n"
+            "get_function(lambda: method(**kwargs), {lazy})()".format(
+                kind=kind, deg=deg, lazy=lazy
+            )
+        )
+
+
+class ReflectedFlux:
+    """Reflected light curves for an extended illumination source."""
+
+    params = ([1, 10, 30], [2, 5], [10, 1000], [False, True])
+    param_names = ["source_npts", "deg", "nt", "lazy"]
+    timeout = 600
+
+    def setup(self, source_npts, deg, nt, lazy):
+        map = get_map("reflected", deg, lazy, source_npts=source_npts)
+        kwargs = get_flux_kwargs("reflected", nt)
+        self.func = get_function(lambda: map.flux(**kwargs), lazy)
+        self.func()
+
+    def time_flux(self, source_npts, deg, nt, lazy):
+        self.func()
+
+    def peakmem_flux(self, source_npts, deg, nt, lazy):
+        self.func()
+
+
+class SpectralFlux:
+    """Light curves of spectral maps with `nw` wavelength bins."""
+
+    params = ([10, 100, 1000], [2, 5], [10, 1000], [False, True])
+    param_names = ["nw", "deg", "nt", "lazy"]
+    timeout = 600
+
+    def setup(self, nw, deg, nt, lazy):
+        map = get_map("spectral", deg, lazy, nw=nw)
+        kwargs = get_flux_kwargs("spectral", nt)
+        self.func = get_function(lambda: map.flux(**kwargs), lazy)
+        self.func()
+
+    def time_flux(self, nw, deg, nt, lazy):
+        self.func()
+
+    def peakmem_flux(self, nw, deg, nt, lazy):
+        self.func()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for Keplerian systems.
+
+"""
+from .common import get_system, get_function, get_cold_start_code
+import numpy as np
+
+
+class SystemFlux:
+    """Steady-state evaluation of system light curves."""
+
+    params = ([1, 2, 4, 8], [100, 1000], [False, True])
+    param_names = ["nsec", "nt", "lazy"]
+    timeout = 600
+
+    def setup(self, nsec, nt, lazy):
+        sys = get_system(nsec, lazy)
+        t = np.linspace(-1.0, 1.0, nt)
+        self.flux = get_function(lambda: sys.flux(t), lazy)
+        self.X = get_function(lambda: sys.design_matrix(t), lazy)
+        self.flux()
+        self.X()
+
+    def time_flux(self, nsec, nt, lazy):
+        self.flux()
+
+    def time_design_matrix(self, nsec, nt, lazy):
+        self.X()
+
+    def peakmem_flux(self, nsec, nt, lazy):
+        self.flux()
+
+
+class SystemFluxColdStart:
+    """Import, instantiation and compilation time for systems."""
+
+    params = ([1, 2, 4, 8], [False, True])
+    param_names = ["nsec", "lazy"]
+    timeout = 600
+    number = 1
+    repeat = 1
+
+    def timeraw_flux(self, nsec, lazy):
+        return get_cold_start_code(
+            "sys = get_system({nsec}, {lazy})\n"
+            "t = np.linspace(-1.0, 1.0, 100)\n"
+            "get_function(lambda: sys.flux(t), {lazy})()".format(
+                nsec=nsec, lazy=lazy
+            )
+        )
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Shared helpers for the ``starry`` benchmark suite.
+
+"""
+import numpy as np
+import starry
+from starry.compat import theano
+import inspect
+
+starry.config.quiet = True
+
+
+def get_map(kind, deg, lazy, **kwargs):
+    """
+    Instantiate a map of a given `kind` ("ylm", "ld", "rv", "reflected",
+    "oblate", or "spectral") of degree `deg` with random coefficients.
+
+    """
+    rng = np.random.default_rng(0)
+    if kind == "ld":
+        map = starry.Map(udeg=deg, lazy=lazy, **kwargs)
+        map[1:] = 0.5 / np.arange(1, deg + 1)
+        return map
+    elif kind == "ylm":
+        map = starry.Map(ydeg=deg, udeg=2, lazy=lazy, **kwargs)
+    elif kind == "rv":
+        map = starry.Map(ydeg=deg, udeg=2, rv=True, lazy=lazy, **kwargs)
+        map.veq = 1e4
+    elif kind == "reflected":
+        map = starry.Map(ydeg=deg, reflected=True, lazy=lazy, **kwargs)
+    elif kind == "oblate":
+        map = starry.Map(ydeg=deg, udeg=2, oblate=True, lazy=lazy, **kwargs)
+        map.f = 0.1
+    elif kind == "spectral":
+        kwargs["nw"] = kwargs.get("nw", 100)
+        map = starry.Map(ydeg=deg, udeg=2, lazy=lazy, **kwargs)
+    else:
+        raise ValueError("Invalid map kind: {}".format(kind))
+    if map.udeg > 0:
+        map[1:] = [0.4, 0.26]
+    if map.nw is None:
+        map[1:, :] = 0.1 * rng.normal(size=map.Ny - 1)
+    else:
+        map[1:, :, :] = 0.1 * rng.normal(size=(map.Ny - 1, map.nw))
+    map.inc = 75.0
+    return map
+
+
+def get_flux_kwargs(kind, nt):
+    """Return the kwargs for a transit-like light curve with `nt` points."""
+    kwargs = dict(xo=np.linspace(-1.5, 1.5, nt), yo=0.3 * np.ones(nt), ro=0.1)
+    if kind != "ld":
+        kwargs["theta"] = np.linspace(0, 360, nt)
+    if kind == "reflected":
+        kwargs["xs"] = np.linspace(-1, 1, nt)
+        kwargs["ys"] = 0.5 * np.ones(nt)
+        kwargs["zs"] = np.ones(nt)
+        kwargs["rs"] = 0.1
+    return kwargs
+
+
+def get_system(nsec, lazy, deg=2):
+    """
+    Instantiate a system of a limb-darkened primary and `nsec` secondaries
+    with spherical harmonic maps of degree `deg` on nested orbits.
+
+    """
+    rng = np.random.default_rng(0)
+    pri = starry.Primary(starry.Map(ydeg=deg, udeg=2, lazy=lazy), r=1.0, m=1.0)
+    pri.map[1:] = [0.4, 0.26]
+    secs = []
+    for n in range(nsec):
+        map = starry.Map(ydeg=deg, lazy=lazy, amp=1e-3)
+        map[1:, :] = 0.1 * rng.normal(size=map.Ny - 1)
+        secs.append(
+            starry.Secondary(
+                map,
+                r=0.05,
+                m=1e-3,
+                porb=1.0 + 0.7 * n,
+                prot=1.0 + 0.7 * n,
+                t0=0.1 * n,
+                inc=89.0,
+                ecc=0.1,
+                w=30.0 * n,
+            )
+        )
+    return starry.System(pri, *secs)
+
+
+def get_doppler_map(nt, nw, lazy):
+    """Instantiate a Doppler map with `nt` epochs and `nw` wavelength bins."""
+    rng = np.random.default_rng(0)
+    map = starry.DopplerMap(
+        ydeg=5, nt=nt, wav=np.linspace(642.5, 643.5, nw), lazy=lazy
+    )
+    map[1:, :] = 0.1 * rng.normal(size=map.Ny - 1)
+    line = np.exp(-0.5 * (map.wav0 - 643.0) ** 2 / 0.01 ** 2)
+    map.spectrum = 1.0 - 0.5 * line
+    map.inc = 60.0
+    map.veq = 50000.0
+    return map
+
+
+def get_function(func, lazy):
+    """
+    Return a function that evaluates `func()`.
+
+    In greedy mode this is just `func`, which compiles itself on the first
+    call. In lazy mode, `func()` returns a graph, which we compile here.
+
+    """
+    if lazy:
+        return theano.function([], func())
+    else:
+        return func
+
+
+def get_cold_start_code(statement):
+    """
+    Return self-contained code for a ``timeraw`` benchmark, which runs
+    `statement` in a fresh interpreter. The timing therefore includes
+    importing ``starry``, instantiating the maps, and compiling all the
+    functions needed to evaluate `statement`.
+
+    """
+    return "\n\n".join(
+        [
+            "import numpy as np",
+            "import starry",
+            "from starry.compat import theano",
+            "starry.config.quiet = True",
+            inspect.getsource(get_map),
+            inspect.getsource(get_flux_kwargs),
+            inspect.getsource(get_system),
+            inspect.getsource(get_doppler_map),
+            inspect.getsource(get_function),
+            statement,
+        ]
+    )
@@ -162,7 +162,11 @@ class BuildExt(build_ext):
         build_ext.build_extensions(self)
 
 
-if int(os.getenv("STARRY_NDIGITS", 16)) > 16:
+# Boost is needed for multiprecision builds and for the extended
+# precision fallback in the occultation solver
+if (int(os.getenv("STARRY_NDIGITS", 16)) > 16) or (
+    int(os.getenv("STARRY_EXTENDED_NDIGITS", 32)) > 16
+):
     include_dirs = ["starry/_core/ops/lib/vendor/boost_1_66_0"]
 else:
     include_dirs = []
@@ -198,7 +202,7 @@ setup(
     long_description=open("README.md", "r").read(),
     long_description_content_type="text/markdown",
     license="MIT",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks"]),
     ext_modules=ext_modules,
     use_scm_version={
         "write_to": os.path.join("starry", "starry_version.py"),
@@ -1,15 +1,46 @@
 # -*- coding: utf-8 -*-
 import logging
+import threading
+
+
+class StarryHandler(logging.StreamHandler):
+    """
+    A stream handler whose line terminator may be set for individual
+    records via ``extra={"terminator": ""}``, so that messages can be
+    continued on the same line without mutating the handler (which is
+    shared by all threads).
+
+    """
+
+    def emit(self, record):
+        # `emit` is called with the handler lock held
+        terminator = self.terminator
+        self.terminator = getattr(record, "terminator", terminator)
+        try:
+            super().emit(record)
+        finally:
+            self.terminator = terminator
+
 
 rootLogger = logging.getLogger("starry")
-rootLogger.addHandler(logging.StreamHandler())
+rootLogger.addHandler(StarryHandler())
 rootLogger.setLevel(logging.INFO)
 
+# Per-thread state (see `ConfigType.message_lock`)
+_local = threading.local()
+
 
 class ConfigType(type):
     """Global config container."""
 
-    message_lock = False
+    @property
+    def message_lock(cls):
+        """Set while a compilation message is being logged by this thread."""
+        return getattr(_local, "message_lock", False)
+
+    @message_lock.setter
+    def message_lock(cls, value):
+        _local.message_lock = value
 
     @property
     def rootLogger(cls):
@@ -49,6 +80,25 @@ class ConfigType(type):
         """Enable function profiling in lazy mode."""
         return cls._profile
 
+    @property
+    def precision(cls):
+        """The floating point precision of numerical results in greedy mode.
+
+        If ``"double"`` (the default), all methods return ``float64`` arrays.
+        If ``"single"``, light curve design matrices and rendered images
+        are returned as ``float32`` arrays, and the dense products that
+        dominate the cost of rendering maps are carried out in single
+        precision, which speeds up rendering. For design matrices, this
+        only affects the outputs: they are computed in double precision
+        and cast on return, so computing them is no faster, and the peak
+        memory use while computing them is not reduced (it is only the
+        matrices you keep around that take half the memory). All other
+        quantities, including fluxes, intensities, linear solves and
+        likelihoods, are computed and returned in double precision. This
+        option has no effect in lazy mode.
+        """
+        return cls._precision
+
     @quiet.setter
     def quiet(cls, value):
         cls._quiet = value
@@ -87,6 +137,20 @@ class ConfigType(type):
                 "Config options should be set before instantiating any `starry` maps."
             )
 
+    @precision.setter
+    def precision(cls, value):
+        assert value in (
+            "single",
+            "double",
+        ), "Precision must be either `single` or `double`."
+        if (cls._allow_changes) or (cls._precision == value):
+            cls._precision = value
+        else:
+            raise Exception(
+                "Cannot change the `starry` config at this time. "
+                "Config options should be set before instantiating any `starry` maps."
+            )
+
     def freeze(cls):
         cls._allow_changes = False
 
@@ -97,3 +161,4 @@ class config(metaclass=ConfigType):
     _quiet = False
     _profile = False
     _mode = None
+    _precision = "double"
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from .. import config
-from ..compat import theano, tt, ts, ifelse, scan_until
+from ..compat import theano, tt, ts, fft, ifelse, scan_until
 from .._constants import *
 from .ops import (
     sTOp,
@@ -10,6 +10,7 @@ from .ops import (
     dotROp,
     tensordotRzOp,
     FOp,
+    FxOp,
     spotYlmOp,
     pTOp,
     minimizeOp,
@@ -21,8 +22,10 @@ from .ops import (
     CheckBoundsOp,
     OrenNayarOp,
     setMatrixOp,
+    KeplerOp,
 )
 from .utils import logger, autocompile, is_tensor, clear_cache
+from .orbit import KeplerianOrbit
 from .math import lazy_math as math
 from .math import lazy_linalg as linalg
 from scipy.special import legendre as LegendreP
@@ -30,9 +33,9 @@ from scipy.sparse import csc_matrix
 from scipy.sparse.linalg import inv as sparse_inv
 from scipy.sparse import eye as sparse_eye
 import numpy as np
-from astropy import units
+from collections import OrderedDict
+import threading
 import os
-import exoplanet
 
 cho_factor = math.cholesky
 cho_solve = linalg.cho_solve
@@ -43,6 +46,64 @@ if os.getenv("READTHEDOCS") == "True":  # pragma: no cover
 else:
     from .. import _c_ops
 
+# Polynomial bases on the rendering grids, keyed on
+# ``(res, projection, deg, precision)``; see ``OpsYlm.render_frames``
+_render_basis_cache = OrderedDict()
+_render_basis_cache_size = 4
+_render_basis_cache_lock = threading.Lock()
+
+
+def _get_render_cache(key):
+    """Return the cached rendering array for ``key``, or None."""
+    with _render_basis_cache_lock:
+        value = _render_basis_cache.pop(key, None)
+        if value is not None:
+            _render_basis_cache[key] = value
+        return value
+
+
+def _set_render_cache(key, value):
+    """Cache a rendering array, evicting the least recently used ones."""
+    with _render_basis_cache_lock:
+        _render_basis_cache.pop(key, None)
+        while len(_render_basis_cache) >= _render_basis_cache_size:
+            _render_basis_cache.popitem(last=False)
+        _render_basis_cache[key] = value
+
+
+def get_disk_quadrature(npts):
+    """
+    Return the nodes ``(dx, dy)`` and weights ``w`` of a quadrature rule
+    with about ``npts`` nodes for the average of a function over the
+    unit disk.
+
+    The nodes lie on ``nr ~ sqrt(npts / 4)`` concentric rings whose radii
+    ``r`` are the Gauss-Legendre nodes in ``r ** 2`` (i.e., Gauss-Jacobi
+    in ``r`` for the area element ``r dr``), each with ``nphi ~ npts / nr``
+    equally spaced nodes in azimuth (the trapezoidal rule, which converges
+    exponentially for periodic integrands). Alternate rings are rotated by
+    half a step. The weights sum to unity. If ``npts <= 1``, this returns
+    a single node at the center of the disk.
+
+    """
+    npts = int(npts)
+    if npts <= 1:
+        return np.zeros(1), np.zeros(1), np.ones(1)
+    nr = max(1, int(np.round(np.sqrt(npts / 4.0))))
+    nphi = max(3, int(np.round(npts / nr)))
+    s, ws = np.polynomial.legendre.leggauss(nr)
+    r = np.sqrt(0.5 * (1 + s))
+    phi = (
+        2
+        * np.pi
+        / nphi
+        * (np.arange(nphi).reshape(1, -1) + 0.5 * (np.arange(nr) % 2)[:, None])
+    )
+    dx = (r[:, None] * np.cos(phi)).flatten()
+    dy = (r[:, None] * np.sin(phi)).flatten()
+    w = np.repeat(0.5 * ws / nphi, nphi)
+    return dx, dy, w
+
 
 __all__ = [
     "OpsYlm",
@@ -82,14 +143,14 @@ class OpsYlm(object):
         self.Ny = (self.ydeg + 1) ** 2
 
         # Instantiate the C++ Ops
-        config.rootHandler.terminator = ""
-        logger.info("Pre-computing some matrices... ")
+        logger.info(
+            "Pre-computing some matrices... ", extra={"terminator": ""}
+        )
         self._c_ops = _c_ops.Ops(ydeg, udeg, fdeg)
-        config.rootHandler.terminator = "\n"
         logger.info("Done.")
 
         # Solution vectors
-        self._sT = sTOp(self._c_ops.sT, self._c_ops.N)
+        self._sT = sTOp(self._c_ops.sT, self._c_ops.N, self._c_ops.sTGrad)
         self._rT = tt.shape_padleft(tt.as_tensor_variable(self._c_ops.rT))
         self._rTA1 = tt.shape_padleft(tt.as_tensor_variable(self._c_ops.rTA1))
 
@@ -102,8 +163,7 @@ class OpsYlm(object):
         self._tensordotRz = tensordotRzOp(self._c_ops.tensordotRz)
         self._dotR = dotROp(self._c_ops.dotR)
 
-        # Filter
-        # TODO: Make the filter operator sparse
+        # Filter (sparse)
         self._F = FOp(self._c_ops.F, self._c_ops.N, self._c_ops.Ny)
 
         # Misc
@@ -153,6 +213,23 @@ class OpsYlm(object):
     def sT(self, b, r):
         return self._sT(b, r)
 
+    def add_sT_table(self, r, **kwargs):
+        """
+        Tabulate the occultation solution vector at a fixed occultor
+        radius `r`, so that occultations by bodies of that radius are
+        computed by interpolation instead of by solving the full
+        recursion at every impact parameter. Tables are cached and
+        shared between maps of the same degree. Keyword arguments
+        (``tol``, ``dtol``, ``order``, ``max_depth`` and ``safety``) are
+        passed to :py:class:`starry._core.ops.sTTable`.
+
+        """
+        self._sT.add_table(r, **kwargs)
+
+    def clear_sT_tables(self):
+        """Stop using tables for the occultation solution vector."""
+        self._sT.clear_tables()
+
     @autocompile
     def tensordotRz(self, matrix, theta):
         if self.ydeg + self.fdeg == 0:
@@ -169,7 +246,8 @@ class OpsYlm(object):
 
     @autocompile
     def F(self, u, f):
-        return self._F(u, f)
+        """Return the filter operator as a dense matrix."""
+        return ts.dense_from_sparse(self._F(u, f))
 
     @autocompile
     def spotYlm(self, amp, sigma, lat, lon):
@@ -190,47 +268,118 @@ class OpsYlm(object):
         """Compute the location and value of the intensity minimum."""
         return self._minimize(y)
 
-    @autocompile
+    @autocompile(downcast=True)
     def X(self, theta, xo, yo, zo, ro, inc, obl, u, f):
         """Compute the light curve design matrix."""
-        # Determine shapes
-        rows = theta.shape[0]
-        cols = self.rTA1.shape[1]
-        X = tt.zeros((rows, cols))
+        return self._X(theta, xo, yo, zo, ro, inc, obl, u, [f])
+
+    @autocompile
+    def X_geometry(self, xo, yo, zo, ro, u, f):
+        """
+        Compute the occultation stage of the light curve design matrix,
+        which does not depend on the orientation or the phase of the map.
+        Pass the result to :py:meth:`X_rotate` to get the design matrix.
+
+        """
+        return self._X_geometry(xo, yo, zo, ro, u, [f])
+
+    @autocompile(downcast=True)
+    def X_rotate(self, occ, sTAR, theta, inc, obl, u, f):
+        """
+        Compute the light curve design matrix from the output of
+        :py:meth:`X_geometry`.
+
+        """
+        return self._X_rotate(occ, sTAR, theta, inc, obl, u, [f])
+
+    def _X(self, theta, xo, yo, zo, ro, inc, obl, u, fs):
+        """
+        Compute the light curve design matrices for each of the filters in
+        the list `fs` and return them side by side. The occultation
+        geometry, the solution vectors and the rotations are computed
+        only once for all filters.
+
+        """
+        occ, sTAR = self._X_geometry(xo, yo, zo, ro, u, fs)
+        return self._X_rotate(occ, sTAR, theta, inc, obl, u, fs)
+
+    def _X_geometry(self, xo, yo, zo, ro, u, fs):
+        """
+        Return a vector flagging the occulted points (one or zero) and
+        the matrix of filtered, occultor-frame solution vectors at those
+        points, for each of the filters in the list `fs`, stacked along
+        the rows.
 
+        """
         # Compute the occultation mask
         b = tt.sqrt(xo ** 2 + yo ** 2)
-        b_rot = tt.ge(b, 1.0 + ro) | tt.le(zo, 0.0) | tt.eq(ro, 0.0)
-        b_occ = tt.invert(b_rot)
-        i_rot = tt.arange(b.size)[b_rot]
+        b_occ = tt.invert(tt.ge(b, 1.0 + ro) | tt.le(zo, 0.0) | tt.eq(ro, 0.0))
         i_occ = tt.arange(b.size)[b_occ]
 
-        # Compute filter operator
+        # Occultation operator
+        sT = self.sT(b[i_occ], ro)
+        sTA = ts.dot(sT, self.A)
+        theta_z = tt.arctan2(xo[i_occ], yo[i_occ])
+        sTAR = self.tensordotRz(sTA, theta_z)
+
+        # Apply the filters and stack the results along the rows
+        # so we can rotate them all at once
         if self.filter:
-            F = self.F(u, f)
+            F = [self._F(u, f) for f in fs]
+            sTAR = tt.concatenate(
+                [
+                    tt.dot(sTAR, ts.dot(ts.dot(self.A1Inv, Fk), self.A1))
+                    for Fk in F
+                ]
+            )
+
+        return tt.cast(b_occ, "int64"), sTAR
+
+    def _X_rotate(self, occ, sTAR, theta, inc, obl, u, fs):
+        """
+        Rotate the output of :py:meth:`_X_geometry` into the observer's
+        frame and fill in the phase curve at the points that are not
+        occulted.
+
+        """
+        # Determine shapes
+        nf = len(fs) if self.filter else 1
+        rows = theta.shape[0]
+        cols = self.rTA1.shape[1]
+        X = tt.zeros((rows, nf * cols))
+        b_occ = tt.gt(occ, 0)
+        i_rot = tt.arange(rows)[tt.invert(b_occ)]
+        i_occ = tt.arange(rows)[b_occ]
 
         # Rotation operator
         if self.filter:
-            rTA1 = ts.dot(tt.dot(self.rT, F), self.A1)
+            rTA1 = [
+                ts.dot(ts.dot(self.rT, self._F(u, f)), self.A1) for f in fs
+            ]
         else:
-            rTA1 = self.rTA1
-        rTA1 = tt.tile(rTA1, (theta[i_rot].shape[0], 1))
+            rTA1 = [self.rTA1]
         X = tt.set_subtensor(
-            X[i_rot], self.right_project(rTA1, inc, obl, theta[i_rot])
+            X[i_rot],
+            tt.concatenate(
+                [
+                    self.right_project_fourier(M, inc, obl, theta[i_rot])
+                    for M in rTA1
+                ],
+                axis=1,
+            ),
         )
 
         # Occultation + rotation operator
-        sT = self.sT(b[i_occ], ro)
-        sTA = ts.dot(sT, self.A)
-        theta_z = tt.arctan2(xo[i_occ], yo[i_occ])
-        sTAR = self.tensordotRz(sTA, theta_z)
-
-        if self.filter:
-            A1InvFA1 = ts.dot(ts.dot(self.A1Inv, F), self.A1)
-            sTAR = tt.dot(sTAR, A1InvFA1)
-        X = tt.set_subtensor(
-            X[i_occ], self.right_project(sTAR, inc, obl, theta[i_occ])
+        sTAR = self.right_project(sTAR, inc, obl, tt.tile(theta[i_occ], (nf,)))
+        sTAR = tt.reshape(
+            tt.transpose(tt.reshape(sTAR, (nf, -1, cols)), (1, 0, 2)),
+            (-1, nf * cols),
         )
+        X = tt.set_subtensor(X[i_occ], sTAR)
+
+        # Same design matrix for all filters?
+        if len(fs) > nf:
+            X = tt.tile(X, (1, len(fs)))
 
         return X
 
@@ -282,17 +431,101 @@ class OpsYlm(object):
             u0 = tt.zeros_like(u)
             u0 = tt.set_subtensor(u0[0], -1.0)
             A1y = ifelse(
-                ld, tt.dot(self.F(u, f), A1y), tt.dot(self.F(u0, f), A1y)
+                ld, ts.dot(self._F(u, f), A1y), ts.dot(self._F(u0, f), A1y)
             )
 
         # Dot the polynomial into the basis
         return tt.dot(pT, A1y)
 
-    @autocompile
+    @autocompile(downcast=True)
     def render(self, res, projection, theta, inc, obl, y, u, f):
         """Render the map on a Cartesian grid."""
-        # Compute the Cartesian grid
-        xyz = ifelse(
+        pT = self.render_basis(res, projection)
+        return self.render_from_basis(
+            res, projection, pT, theta, inc, obl, y, u, f
+        )
+
+    def render_frames(
+        self, res, projection, theta, inc, obl, y, u, f, out=None, chunk=None
+    ):
+        """Render the map on a Cartesian grid (numerical inputs only).
+
+        This is equivalent to `render`, but the polynomial basis on the
+        grid is cached across calls and the frames are rendered `chunk`
+        at a time into the array `out` (which is allocated if not
+        provided and may be memory-mapped), so the memory footprint does
+        not grow with the number of frames. By default, chunks are limited
+        to about ``2 ** 22`` pixels.
+        """
+        # Get the (cached) polynomial basis on the grid
+        pT = self.get_render_basis(res, projection)
+
+        if self.nw is None:
+            nframes = len(theta)
+        else:
+            nframes = self.nw
+        if out is None:
+            out = np.empty((nframes, res, res), dtype=pT.dtype)
+        else:
+            assert out.shape == (
+                nframes,
+                res,
+                res,
+            ), "Output array has the wrong shape."
+        if chunk is None:
+            chunk = max(1, 2 ** 22 // res ** 2)
+
+        # Render in chunks. The product with the basis dominates the
+        # cost, so we do it here in the precision of the basis.
+        if self.nw is None:
+            for i in range(0, nframes, chunk):
+                A1Ry = self.render_coeffs(
+                    projection, theta[i : i + chunk], inc, obl, y, u, f
+                )
+                out[i : i + chunk] = np.reshape(
+                    np.dot(pT, A1Ry.astype(pT.dtype, copy=False)).T,
+                    (-1, res, res),
+                )
+        else:
+            A1Ry = self.render_coeffs(projection, theta, inc, obl, y, u, f)
+            out[:] = np.reshape(
+                np.dot(pT, A1Ry.astype(pT.dtype, copy=False)).T,
+                (-1, res, res),
+            )
+        return out
+
+    def get_render_basis(self, res, projection):
+        """
+        Return the polynomial basis on the rendering grid, caching the
+        result for the most recently used grids and degrees.
+
+        """
+        key = (int(res), int(projection), self.deg, config.precision)
+        pT = _get_render_cache(key)
+        if pT is None:
+            pT = self.render_basis(res, projection)
+            if config.precision == "single":
+                pT = pT.astype(np.float32)
+            _set_render_cache(key, pT)
+        return pT
+
+    def get_render_grid(self, res, projection):
+        """
+        Return the Cartesian coordinates of the rendering grid, caching
+        the result for the most recently used grids.
+
+        """
+        key = (int(res), int(projection), None)
+        xyz = _get_render_cache(key)
+        if xyz is None:
+            xyz = self.render_grid(res, projection)
+            _set_render_cache(key, xyz)
+        return xyz
+
+    @autocompile
+    def render_grid(self, res, projection):
+        """Compute the Cartesian coordinates of the rendering grid."""
+        return ifelse(
             tt.eq(projection, STARRY_RECTANGULAR_PROJECTION),
             self.compute_rect_grid(res)[-1],
             ifelse(
@@ -302,9 +535,34 @@ class OpsYlm(object):
             ),
         )
 
+    @autocompile
+    def render_basis(self, res, projection):
+        """Compute the polynomial basis on the rendering grid."""
+        # Compute the Cartesian grid
+        xyz = self.render_grid(res, projection)
+
         # Compute the polynomial basis
-        pT = self.pT(xyz[0], xyz[1], xyz[2])
+        return self.pT(xyz[0], xyz[1], xyz[2])
+
+    @autocompile(downcast=True)
+    def render_from_basis(self, res, projection, pT, theta, inc, obl, y, u, f):
+        """Render the map on a Cartesian grid given the polynomial basis."""
+        A1Ry = self.render_coeffs(projection, theta, inc, obl, y, u, f)
+
+        # Dot the polynomial into the basis
+        res = tt.reshape(tt.dot(pT, A1Ry), [res, res, -1])
+
+        # We need the shape to be (nframes, npix, npix)
+        return res.dimshuffle(2, 0, 1)
 
+    @autocompile
+    def render_coeffs(self, projection, theta, inc, obl, y, u, f):
+        """
+        Return the polynomial coefficients of the (filtered) map in each
+        frame, i.e., the matrix that `render_from_basis` dots into the
+        polynomial basis on the grid.
+
+        """
         # If orthographic, rotate the map to the correct frame
         if self.nw is None:
             Ry = ifelse(
@@ -335,15 +593,11 @@ class OpsYlm(object):
             u0 = tt.set_subtensor(u0[0], -1.0)
             A1Ry = ifelse(
                 tt.eq(projection, STARRY_ORTHOGRAPHIC_PROJECTION),
-                tt.dot(self.F(u, f), A1Ry),
-                tt.dot(self.F(u0, f0), A1Ry),
+                ts.dot(self._F(u, f), A1Ry),
+                ts.dot(self._F(u0, f0), A1Ry),
             )
 
-        # Dot the polynomial into the basis
-        res = tt.reshape(tt.dot(pT, A1Ry), [res, res, -1])
-
-        # We need the shape to be (nframes, npix, npix)
-        return res.dimshuffle(2, 0, 1)
+        return A1Ry
 
     @autocompile
     def expand_spot(self, amp, sigma, lat, lon):
@@ -464,8 +718,66 @@ class OpsYlm(object):
         input frame to a vector in the observer's frame.
         """
         # Rotate to the sky frame
+        M = self._right_project_sky(M, inc, obl)
+
+        # Rotate to the correct phase
+        if theta.ndim > 0:
+            M = self.tensordotRz(M, theta)
+
+        else:
+            M = self.dotR(
+                M,
+                math.to_tensor(0.0),
+                math.to_tensor(0.0),
+                math.to_tensor(1.0),
+                theta,
+            )
+
+        # Rotate to the polar frame
+        return self._right_project_polar(M)
+
+    @autocompile
+    def right_project_fourier(self, M, inc, obl, theta):
+        r"""Apply the projection operator on the right at many phases.
+
+        This method returns the same result as
+        ``right_project(tile(M, (len(theta), 1)), inc, obl, theta)``
+        for a single row vector ``M``. Since the phase rotation is a rotation
+        about the stellar axis, each column of the result is a Fourier series
+        in ``theta`` of order at most ``ydeg``. We compute its coefficients
+        once (from a single rotation of ``2 * (ydeg + 1)`` rows) and evaluate
+        the series using the angle addition recurrences, so the cost per
+        phase is that of a small dense dot product.
+        """
+        # The degree and order of each Ylm
+        n = np.arange(self.Ny)
+        l = np.floor(np.sqrt(n)).astype(int)
+        m = n - l ** 2 - l
+
+        # The rotation about the stellar axis mixes the (l, m) and
+        # (l, -m) terms with weights cos(|m| theta) and sign(m) sin(|m| theta)
+        cos_mask = np.zeros((self.ydeg + 1, self.Ny))
+        cos_mask[np.abs(m), n] = 1.0
+        sin_mask = np.zeros((self.ydeg + 1, self.Ny))
+        sin_mask[np.abs(m), n] = np.sign(m)
+        M = self._right_project_sky(M, inc, obl)[0]
+        coeffs = tt.concatenate((cos_mask * M, sin_mask * M[l ** 2 + l - m]))
+        coeffs = self._right_project_polar(coeffs)
+
+        # Evaluate the series
+        cosmt = [tt.ones_like(theta)]
+        sinmt = [tt.zeros_like(theta)]
+        cost = tt.cos(theta)
+        sint = tt.sin(theta)
+        for k in range(1, self.ydeg + 1):
+            cosmt.append(cosmt[-1] * cost - sinmt[-1] * sint)
+            sinmt.append(sinmt[-1] * cost + cosmt[-2] * sint)
+        return tt.dot(tt.stack(cosmt + sinmt, axis=1), coeffs)
+
+    def _right_project_sky(self, M, inc, obl):
+        """Rotate the row vectors in `M` to the sky frame at zero phase."""
         # TODO: Do this in a single compound rotation
-        M = self.dotR(
+        return self.dotR(
             self.dotR(
                 self.dotR(
                     M,
@@ -485,21 +797,9 @@ class OpsYlm(object):
             -0.5 * np.pi,
         )
 
-        # Rotate to the correct phase
-        if theta.ndim > 0:
-            M = self.tensordotRz(M, theta)
-
-        else:
-            M = self.dotR(
-                M,
-                math.to_tensor(0.0),
-                math.to_tensor(0.0),
-                math.to_tensor(1.0),
-                theta,
-            )
-
-        # Rotate to the polar frame
-        M = self.dotR(
+    def _right_project_polar(self, M):
+        """Rotate the row vectors in `M` to the polar frame."""
+        return self.dotR(
             M,
             math.to_tensor(1.0),
             math.to_tensor(0.0),
@@ -507,8 +807,6 @@ class OpsYlm(object):
             0.5 * np.pi,
         )
 
-        return M
-
     @autocompile
     def left_project(self, M, inc, obl, theta):
         r"""Apply the projection operator on the left.
@@ -672,6 +970,7 @@ class OpsYlm(object):
 
         # Clear the compiled function cache
         clear_cache(self, self.spot)
+        clear_cache(self, self.spots)
 
         # Pre-compute the linalg stuff
         theta = np.linspace(0, np.pi, spot_pts)
@@ -712,6 +1011,39 @@ class OpsYlm(object):
 
         return y
 
+    @autocompile
+    def spots(self, contrast, radius, lat, lon):
+        """Compute the expansion of several spots at once.
+
+        Instead of rotating each spot profile, we use the addition theorem
+        to write the coefficients of a zonal profile centered on a point
+        as the product of its Legendre coefficients and the spherical
+        harmonics evaluated at that point. The harmonics are evaluated for
+        all spots in a single call to the polynomial basis op. If `radius`
+        is a scalar, the profile is computed only once.
+        """
+        # Legendre coefficients of the unit-intensity spot profile(s)
+        if radius.ndim == 0:
+            radius = tt.shape_padleft(radius, 2)
+        else:
+            radius = tt.shape_padleft(radius)
+        z = self._spot_fac * (self._spot_theta.reshape(-1, 1) - radius)
+        b = 1.0 / (1.0 + tt.exp(-z)) - 1.0
+        c = tt.dot(self._spot_Bp, b)
+
+        # Expand them to all (l, m)
+        l = np.floor(np.sqrt(np.arange(self.Ny))).astype(int)
+        c = c[l] / np.sqrt(2 * l + 1).reshape(-1, 1)
+
+        # The spherical harmonics evaluated at the center of each spot
+        # (we undo the `1 / pi` normalization of the change of basis)
+        xpt, ypt, zpt = self.latlon_to_xyz(lat, lon)
+        pT = self.pT(xpt, ypt, zpt)[:, : self.Ny]
+        Y = np.pi * tt.transpose(ts.dot(pT, self.A1))
+
+        # Weight by the contrasts and sum over spots
+        return tt.dot(Y * c, contrast)
+
 
 class OpsLD(object):
     """Class housing Theano operations for limb-darkened maps."""
@@ -725,8 +1057,9 @@ class OpsLD(object):
         self.nw = nw
 
         # Set up the ops
-        self._get_cl = GetClOp()
-        self._limbdark = LimbDarkOp()
+        self._c_limbdark = _c_ops.LimbDark(udeg)
+        self._get_cl = GetClOp(_c_ops.get_cl, _c_ops.get_cl_rev)
+        self._limbdark = LimbDarkOp(self._c_limbdark.flux)
         self._LimbDarkIsPhysical = LDPhysicalOp(_c_ops.nroots)
 
     @autocompile
@@ -772,7 +1105,7 @@ class OpsLD(object):
         )
         return flux
 
-    @autocompile
+    @autocompile(downcast=True)
     def X(self, theta, xo, yo, zo, ro, inc, obl, u, f):
         """
         Convenience function for integration of limb-darkened maps
@@ -785,14 +1118,14 @@ class OpsLD(object):
         X = tt.reshape(flux, (-1, 1))
         return X
 
-    @autocompile
+    @autocompile(downcast=True)
     def render(self, res, projection, theta, inc, obl, y, u, f):
         """Render the map on a Cartesian grid."""
         nframes = tt.shape(theta)[0]
         image = self.render_ld(res, u)
         return tt.tile(image, (nframes, 1, 1))
 
-    @autocompile
+    @autocompile(downcast=True)
     def render_ld(self, res, u):
         """Simplified version of `render` w/o the extra params.
 
@@ -889,14 +1222,18 @@ class OpsRV(OpsYlm):
     @autocompile
     def rv(self, theta, xo, yo, zo, ro, inc, obl, y, u, veq, alpha):
         """Compute the observed radial velocity anomaly."""
-        # Compute the velocity-weighted intensity
+        # Compute the velocity-weighted and the plain design
+        # matrices in a single pass
         f = self.compute_rv_filter(inc, obl, veq, alpha)
-        Iv = self.flux(theta, xo, yo, zo, ro, inc, obl, y, u, f)
-
-        # Compute the inverse of the intensity
         f0 = tt.zeros_like(f)
         f0 = tt.set_subtensor(f0[0], np.pi)
-        I = self.flux(theta, xo, yo, zo, ro, inc, obl, y, u, f0)
+        X = self._X(theta, xo, yo, zo, ro, inc, obl, u, [f, f0])
+
+        # Compute the velocity-weighted intensity
+        Iv = tt.dot(X[:, : self.Ny], y)
+
+        # Compute the inverse of the intensity
+        I = tt.dot(X[:, self.Ny :], y)
         invI = tt.ones((1,)) / I
         invI = tt.where(tt.isinf(invI), 0.0, invI)
 
@@ -913,28 +1250,19 @@ class OpsReflected(OpsYlm):
         self._sT = sTReflectedOp(self._c_ops.sTReflected, self._c_ops.N)
         self._A1Big = ts.as_sparse_variable(self._c_ops.A1Big)
 
-        # Compute grid on unit disk with ~source_npts points
+        # Quadrature rule on the unit disk with ~source_npts nodes, plus
+        # a coarser rule with about half as many nodes that we use to
+        # estimate the integration error
         source_npts = kwargs.get("source_npts", 1)
-        if source_npts <= 1:
-            self.source_dx = np.array([0.0])
-            self.source_dy = np.array([0.0])
-            self.source_dz = np.array([0.0])
-            self.source_npts = 1
-        else:
-            N = int(2 + np.sqrt(source_npts * 4 / np.pi))
-            dx = np.linspace(-1, 1, N)
-            dx, dy = np.meshgrid(dx, dx)
-            dz = 1 - dx ** 2 - dy ** 2
-            self.source_dx = dx[dz > 0].flatten()
-            self.source_dy = dy[dz > 0].flatten()
-            self.source_dz = dz[dz > 0].flatten()
-            self.source_npts = len(self.source_dx)
-
-        # NOTE: dz is *negative*, since the source is actually
-        # *closer* to the body than in the point approximation
-        self.source_dx = tt.as_tensor_variable(self.source_dx)
-        self.source_dy = tt.as_tensor_variable(self.source_dy)
-        self.source_dz = tt.as_tensor_variable(-self.source_dz)
+        dx, dy, w = get_disk_quadrature(source_npts)
+        self.source_npts = len(w)
+        self.source_dx = tt.as_tensor_variable(dx)
+        self.source_dy = tt.as_tensor_variable(dy)
+        self.source_w = tt.as_tensor_variable(w)
+        dx, dy, w = get_disk_quadrature(source_npts // 2)
+        self.source_dx_lo = tt.as_tensor_variable(dx)
+        self.source_dy_lo = tt.as_tensor_variable(dy)
+        self.source_w_lo = tt.as_tensor_variable(w)
 
         # Oren-Nayar (1994) intensity profile (for rendering)
         self._OrenNayar = OrenNayarOp(self._c_ops.OrenNayarPolynomial)
@@ -985,7 +1313,7 @@ class OpsReflected(OpsYlm):
             u0 = tt.zeros_like(u)
             u0 = tt.set_subtensor(u0[0], -1.0)
             A1y = ifelse(
-                ld, tt.dot(self.F(u, f), A1y), tt.dot(self.F(u0, f), A1y)
+                ld, ts.dot(self._F(u, f), A1y), ts.dot(self._F(u0, f), A1y)
             )
 
         # Dot the polynomial into the basis
@@ -1045,7 +1373,7 @@ class OpsReflected(OpsYlm):
             u0 = tt.zeros_like(u)
             u0 = tt.set_subtensor(u0[0], -1.0)
             A1y = ifelse(
-                ld, tt.dot(self.F(u, f), A1y), tt.dot(self.F(u0, f), A1y)
+                ld, ts.dot(self._F(u, f), A1y), ts.dot(self._F(u0, f), A1y)
             )
 
         # Dot the polynomial into the basis.
@@ -1078,7 +1406,7 @@ class OpsReflected(OpsYlm):
 
         # Compute filter operator
         if self.filter:
-            F = self.F(u, f)
+            F = self._F(u, f)
 
         # Terminator
         r2 = xs ** 2 + ys ** 2 + zs ** 2
@@ -1088,7 +1416,7 @@ class OpsReflected(OpsYlm):
         # Rotation operator
         rT = self.rT(b_term[i_rot], sigr)
         if self.filter:
-            rTA1 = ts.dot(tt.dot(rT, F), self.A1)
+            rTA1 = ts.dot(ts.dot(rT, F), self.A1)
         else:
             rTA1 = ts.dot(rT, self.A1)
         theta_z = tt.arctan2(xs[i_rot], ys[i_rot])
@@ -1118,72 +1446,105 @@ class OpsReflected(OpsYlm):
         # We're done
         return X
 
-    @autocompile
-    def X(self, theta, xs, ys, zs, Rs, xo, yo, zo, ro, inc, obl, u, f, sigr):
-        """Compute the light curve design matrix."""
+    def X_finite_source(
+        self,
+        theta,
+        xs,
+        ys,
+        zs,
+        Rs,
+        xo,
+        yo,
+        zo,
+        ro,
+        inc,
+        obl,
+        u,
+        f,
+        sigr,
+        source_dx,
+        source_dy,
+        source_w,
+    ):
+        """
+        Compute the light curve design matrix for a finite source using
+        the quadrature rule with nodes `source_dx`, `source_dy` and
+        weights `source_w` on the source disk.
 
-        if self.source_npts == 1:
+        """
+        # The effective size of the star as seen by the planet
+        # is smaller. Only include points
+        # that fall on this smaller disk.
+        rs = tt.sqrt(xs ** 2 + ys ** 2 + zs ** 2)
+        Reff = Rs * tt.sqrt(1 - ((Rs - 1) / rs) ** 2)
+        dx = tt.shape_padright(Reff) * source_dx
+        dy = tt.shape_padright(Reff) * source_dy
+        # Note that the star is *closer* to the planet, hence the - sign
+        dz = -tt.sqrt(Rs ** 2 - dx ** 2 - dy ** 2)
+
+        # Compute the illumination for each node on the source disk
+        X = self.X_point_source(
+            tt.reshape(tt.shape_padright(theta) + tt.zeros_like(dx), (-1,)),
+            tt.reshape(tt.shape_padright(xs) + dx, (-1,)),
+            tt.reshape(tt.shape_padright(ys) + dy, (-1,)),
+            tt.reshape(tt.shape_padright(zs) + dz, (-1,)),
+            tt.reshape(tt.shape_padright(xo) + tt.zeros_like(dx), (-1,)),
+            tt.reshape(tt.shape_padright(yo) + tt.zeros_like(dx), (-1,)),
+            tt.reshape(tt.shape_padright(zo) + tt.zeros_like(dx), (-1,)),
+            ro,
+            inc,
+            obl,
+            u,
+            f,
+            sigr,
+        )
+        X = tt.reshape(X, (X.shape[0], -1))
 
-            return self.X_point_source(
-                theta, xs, ys, zs, xo, yo, zo, ro, inc, obl, u, f, sigr
-            )
+        # Weighted sum over the nodes
+        return ifelse(
+            tt.shape(theta)[0] > 0,
+            tt.sum(
+                tt.reshape(X, (tt.shape(theta)[0], tt.shape(source_w)[0], -1))
+                * source_w.dimshuffle("x", 0, "x"),
+                axis=1,
+            ),
+            tt.zeros_like(X),
+        )
 
-        else:
+    @autocompile(downcast=True)
+    def X(self, theta, xs, ys, zs, Rs, xo, yo, zo, ro, inc, obl, u, f, sigr):
+        """Compute the light curve design matrix."""
+        # Point source approximation
+        X0 = self.X_point_source(
+            theta, xs, ys, zs, xo, yo, zo, ro, inc, obl, u, f, sigr
+        )
+        if self.source_npts == 1:
+            return X0
 
-            # The effective size of the star as seen by the planet
-            # is smaller. Only include points
-            # that fall on this smaller disk.
-            rs = tt.sqrt(xs ** 2 + ys ** 2 + zs ** 2)
-            Reff = Rs * tt.sqrt(1 - ((Rs - 1) / rs) ** 2)
-            dx = tt.shape_padright(Reff) * self.source_dx
-            dy = tt.shape_padright(Reff) * self.source_dy
-            # Note that the star is *closer* to the planet, hence the - sign
-            dz = -tt.sqrt(Rs ** 2 - dx ** 2 - dy ** 2)
-
-            # Compute the illumination for each point on the source disk
-            X = self.X_point_source(
-                tt.reshape(
-                    tt.shape_padright(theta) + tt.zeros_like(dx), (-1,)
-                ),
-                tt.reshape(tt.shape_padright(xs) + dx, (-1,)),
-                tt.reshape(tt.shape_padright(ys) + dy, (-1,)),
-                tt.reshape(tt.shape_padright(zs) + dz, (-1,)),
-                tt.reshape(tt.shape_padright(xo) + tt.zeros_like(dx), (-1,)),
-                tt.reshape(tt.shape_padright(yo) + tt.zeros_like(dx), (-1,)),
-                tt.reshape(tt.shape_padright(zo) + tt.zeros_like(dx), (-1,)),
+        # Integrate over the source disk if Rs != 0
+        return ifelse(
+            Rs > 0,
+            self.X_finite_source(
+                theta,
+                xs,
+                ys,
+                zs,
+                Rs,
+                xo,
+                yo,
+                zo,
                 ro,
                 inc,
                 obl,
                 u,
                 f,
                 sigr,
-            )
-            X = tt.reshape(X, (X.shape[0], -1))
-
-            # Point source approximation
-            X0 = self.X_point_source(
-                theta, xs, ys, zs, xo, yo, zo, ro, inc, obl, u, f, sigr
-            )
-            X0 = tt.reshape(X0, (X0.shape[0], -1))
-
-            # Average over each profile if Rs != 0
-            return ifelse(
-                Rs > 0,
-                ifelse(
-                    tt.shape(theta)[0] > 0,
-                    (
-                        tt.sum(
-                            tt.reshape(
-                                X, (tt.shape(theta)[0], self.source_npts, -1)
-                            ),
-                            axis=1,
-                        )
-                        / self.source_npts
-                    ),
-                    tt.zeros_like(X),
-                ),
-                X0,
-            )
+                self.source_dx,
+                self.source_dy,
+                self.source_w,
+            ),
+            tt.reshape(X0, (X0.shape[0], -1)),
+        )
 
     @autocompile
     def flux(
@@ -1210,6 +1571,35 @@ class OpsReflected(OpsYlm):
         )
 
     @autocompile
+    def flux_error(
+        self, theta, xs, ys, zs, Rs, xo, yo, zo, ro, inc, obl, y, u, f, sigr
+    ):
+        """
+        Estimate the error in the reflected light curve due to the
+        quadrature over the finite source disk.
+
+        This is the difference between the fluxes computed with the full
+        quadrature rule and with a coarser rule with about half as many
+        nodes, so it is usually a conservative estimate.
+
+        """
+        if self.source_npts == 1:
+            if y.ndim == 1:
+                return tt.zeros_like(theta)
+            else:
+                return tt.zeros((tt.shape(theta)[0], tt.shape(y)[1]))
+        args = (theta, xs, ys, zs, Rs, xo, yo, zo, ro, inc, obl, u, f, sigr)
+        X = self.X_finite_source(
+            *args, self.source_dx, self.source_dy, self.source_w
+        )
+        X_lo = self.X_finite_source(
+            *args, self.source_dx_lo, self.source_dy_lo, self.source_w_lo
+        )
+        return ifelse(
+            Rs > 0, tt.abs_(tt.dot(X - X_lo, y)), tt.zeros_like(tt.dot(X, y))
+        )
+
+    @autocompile(downcast=True)
     def render(
         self,
         res,
@@ -1229,35 +1619,171 @@ class OpsReflected(OpsYlm):
         on94_exact,
     ):
         """Render the map on a Cartesian grid."""
-        # Compute the Cartesian grid
-        xyz = ifelse(
-            tt.eq(projection, STARRY_RECTANGULAR_PROJECTION),
-            self.compute_rect_grid(res)[-1],
-            ifelse(
-                tt.eq(projection, STARRY_MOLLWEIDE_PROJECTION),
-                self.compute_moll_grid(res)[-1],
-                self.compute_ortho_grid(res)[-1],
-            ),
+        # Compute the Cartesian grid and the polynomial basis
+        xyz = self.render_grid(res, projection)
+        pT = self.pT(xyz[0], xyz[1], xyz[2])
+
+        # Compute the image
+        image = self.render_pixels(
+            projection,
+            illuminate,
+            pT,
+            xyz,
+            theta,
+            inc,
+            obl,
+            y,
+            u,
+            f,
+            xs,
+            ys,
+            zs,
+            Rs,
+            sigr,
+            on94_exact,
         )
 
-        # If orthographic, rotate the map to the correct frame
-        if self.nw is None:
-            Ry = ifelse(
-                tt.eq(projection, STARRY_ORTHOGRAPHIC_PROJECTION),
-                self.left_project(
-                    tt.transpose(tt.tile(y, [theta.shape[0], 1])),
-                    inc,
-                    obl,
-                    theta,
-                ),
-                tt.transpose(tt.tile(y, [theta.shape[0], 1])),
-            )
-        else:
-            Ry = ifelse(
-                tt.eq(projection, STARRY_ORTHOGRAPHIC_PROJECTION),
-                self.left_project(y, inc, obl, tt.tile(theta[0], self.nw)),
-                y,
-            )
+        # We need the shape to be (nframes, npix, npix)
+        return tt.reshape(image, [res, res, -1]).dimshuffle(2, 0, 1)
+
+    def render_frames(
+        self,
+        res,
+        projection,
+        illuminate,
+        theta,
+        inc,
+        obl,
+        y,
+        u,
+        f,
+        xs,
+        ys,
+        zs,
+        Rs,
+        sigr,
+        on94_exact,
+        out=None,
+        chunk=None,
+    ):
+        """Render the map on a Cartesian grid (numerical inputs only).
+
+        This is equivalent to `render`, but the grid and its polynomial
+        basis are cached across calls and the frames are rendered `chunk`
+        at a time into the array `out` (which is allocated if not
+        provided and may be memory-mapped), so the memory footprint does
+        not grow with the number of frames. Pixels that are on the night
+        side in every frame of a chunk are not evaluated at all. By
+        default, chunks are limited to about ``2 ** 22`` pixels.
+        """
+        theta, xs, ys, zs = np.broadcast_arrays(
+            np.atleast_1d(theta), xs, ys, zs
+        )
+        # Get the (cached) grid and polynomial basis
+        xyz = self.get_render_grid(res, projection)
+        pT = self.get_render_basis(res, projection)
+
+        if self.nw is None:
+            nframes = len(theta)
+        else:
+            nframes = self.nw
+        if out is None:
+            out = np.empty((nframes, res, res), dtype=pT.dtype)
+        else:
+            assert out.shape == (
+                nframes,
+                res,
+                res,
+            ), "Output array has the wrong shape."
+        if chunk is None:
+            chunk = max(1, 2 ** 22 // res ** 2)
+        if self.nw is not None:
+            chunk = len(theta)
+
+        on_grid = ~np.any(np.isnan(xyz), axis=0)
+
+        # Render in chunks
+        for i in range(0, len(theta), chunk):
+            j = slice(i, i + chunk)
+            if self.nw is None:
+                k = j
+            else:
+                k = slice(None)
+            if illuminate:
+                # A point is on the night side if it cannot see any part
+                # of the source, i.e., if `n . s + Rs <= 0`
+                cos_thetai = np.dot(xyz.T, np.array([xs[j], ys[j], zs[j]]))
+                idx = on_grid & np.any(cos_thetai + Rs > 0, axis=1)
+            else:
+                idx = on_grid
+            image = np.zeros((len(idx), out[k].shape[0]), dtype=out.dtype)
+            image[~on_grid] = np.nan
+            if np.any(idx):
+                image[idx] = self.render_pixels(
+                    projection,
+                    illuminate,
+                    pT[idx],
+                    xyz[:, idx],
+                    theta[j],
+                    inc,
+                    obl,
+                    y,
+                    u,
+                    f,
+                    xs[j],
+                    ys[j],
+                    zs[j],
+                    Rs,
+                    sigr,
+                    on94_exact,
+                )
+            out[k] = np.reshape(image, [res, res, -1]).transpose(2, 0, 1)
+        return out
+
+    @autocompile(downcast=True)
+    def render_pixels(
+        self,
+        projection,
+        illuminate,
+        pT,
+        xyz,
+        theta,
+        inc,
+        obl,
+        y,
+        u,
+        f,
+        xs,
+        ys,
+        zs,
+        Rs,
+        sigr,
+        on94_exact,
+    ):
+        """
+        Compute the intensity at the points `xyz` of a rendering grid given
+        the polynomial basis `pT` at those points. The result has shape
+        ``(npts, nframes)``.
+
+        """
+        # If orthographic, rotate the map to the correct frame
+        if self.nw is None:
+            Ry = ifelse(
+                tt.eq(projection, STARRY_ORTHOGRAPHIC_PROJECTION),
+                self.left_project(
+                    tt.transpose(tt.tile(y, [theta.shape[0], 1])),
+                    inc,
+                    obl,
+                    theta,
+                ),
+                tt.transpose(tt.tile(y, [theta.shape[0], 1])),
+            )
+        else:
+            Ry = ifelse(
+                tt.eq(projection, STARRY_ORTHOGRAPHIC_PROJECTION),
+                self.left_project(y, inc, obl, tt.tile(theta[0], self.nw)),
+                y,
+            )
 
         # Transform to polynomials
         A1Ry = ts.dot(self.A1, Ry)
@@ -1269,12 +1795,11 @@ class OpsReflected(OpsYlm):
         u0 = tt.set_subtensor(u0[0], -1.0)
         A1Ry = ifelse(
             tt.eq(projection, STARRY_ORTHOGRAPHIC_PROJECTION),
-            tt.dot(self.F(u, f), A1Ry),
-            tt.dot(self.F(u0, f0), A1Ry),
+            ts.dot(self._F(u, f), A1Ry),
+            ts.dot(self._F(u0, f0), A1Ry),
         )
 
         # Dot the polynomial into the basis
-        pT = self.pT(xyz[0], xyz[1], xyz[2])
         image = tt.dot(pT, A1Ry)
 
         # Compute the illumination profile
@@ -1293,15 +1818,12 @@ class OpsReflected(OpsYlm):
         # This is useful for thermal light maps, where the flux from a map
         # with Y_{0,0} = 1 is *unity*. But it messes up things for reflected
         # light maps, so we need to account for that here.
-        image = ifelse(
+        return ifelse(
             illuminate,
             tt.switch(tt.isnan(image), image, image * I),
             np.pi * image,
         )
 
-        # We need the shape to be (nframes, npix, npix)
-        return tt.reshape(image, [res, res, -1]).dimshuffle(2, 0, 1)
-
     @autocompile
     def compute_illumination_point_source(
         self, xyz, xs, ys, zs, sigr, on94_exact
@@ -1371,38 +1893,34 @@ class OpsReflected(OpsYlm):
     @autocompile
     def compute_illumination(self, xyz, xs, ys, zs, Rs, sigr, on94_exact):
         """Compute the illumination profile when rendering maps."""
-
+        # Point source approximation
         if self.source_npts == 1:
-
             return self.compute_illumination_point_source(
                 xyz, xs, ys, zs, sigr, on94_exact
             )
 
-        else:
-
-            # The effective size of the star as seen by the planet
-            # is smaller. Only include points
-            # that fall on this smaller disk.
-            rs = tt.sqrt(xs ** 2 + ys ** 2 + zs ** 2)
-            Reff = Rs * tt.sqrt(1 - ((Rs - 1) / rs) ** 2)
-            dx = tt.shape_padright(Reff) * self.source_dx
-            dy = tt.shape_padright(Reff) * self.source_dy
-            # Note that the star is *closer* to the planet, hence the - sign
-            dz = -tt.sqrt(Rs ** 2 - dx ** 2 - dy ** 2)
-
-            # Compute the illumination for each point on the source disk
-            I = self.compute_illumination_point_source(
-                xyz,
-                tt.reshape(tt.shape_padright(xs) + dx, (-1,)),
-                tt.reshape(tt.shape_padright(ys) + dy, (-1,)),
-                tt.reshape(tt.shape_padright(zs) + dz, (-1,)),
-                sigr,
-                on94_exact,
-            )
-            I = tt.reshape(I, (-1, tt.shape(xs)[0], self.source_npts))
-
-            # Average over each profile
-            return tt.sum(I, axis=2) / self.source_npts
+        # The effective size of the star as seen by the planet
+        # is smaller. Only include points
+        # that fall on this smaller disk.
+        rs = tt.sqrt(xs ** 2 + ys ** 2 + zs ** 2)
+        Reff = Rs * tt.sqrt(1 - ((Rs - 1) / rs) ** 2)
+        dx = tt.shape_padright(Reff) * self.source_dx
+        dy = tt.shape_padright(Reff) * self.source_dy
+        # Note that the star is *closer* to the planet, hence the - sign
+        dz = -tt.sqrt(Rs ** 2 - dx ** 2 - dy ** 2)
+
+        # Compute the illumination for each node on the source disk
+        I = self.compute_illumination_point_source(
+            xyz,
+            tt.reshape(tt.shape_padright(xs) + dx, (-1,)),
+            tt.reshape(tt.shape_padright(ys) + dy, (-1,)),
+            tt.reshape(tt.shape_padright(zs) + dz, (-1,)),
+            sigr,
+            on94_exact,
+        )
+        I = tt.reshape(I, (-1, tt.shape(xs)[0], self.source_npts))
+        I = tt.sum(I * self.source_w.dimshuffle("x", "x", 0), axis=2)
+        return I
 
 
 class OpsOblate(OpsYlm):
@@ -1462,6 +1980,9 @@ class OpsOblate(OpsYlm):
             ops_y_0_f.F, (self.ydeg + self.fdeg + 1) ** 2, (self.ydeg + 1) ** 2
         )
 
+        # Gravity darkening filters applied to each wavelength bin at once
+        self.Fgx = FxOp(ops_y_0_f.Fx, (self.ydeg + self.fdeg + 1) ** 2)
+
         # Change of basis matrices
         if self.ydeg == 0 and self.fdeg == 0:
             self.A1Inv_Nyf_x_Nyf = csc_matrix([[np.pi]])
@@ -1504,7 +2025,7 @@ class OpsOblate(OpsYlm):
         else:
             return self._dotR(matrix, ux, uy, uz, theta)
 
-    @autocompile
+    @autocompile(downcast=True)
     def render(self, res, projection, theta, inc, obl, fproj, y, u, f):
         """Render the map on a Cartesian grid."""
         # Compute the Cartesian grid
@@ -1532,22 +2053,7 @@ class OpsOblate(OpsYlm):
                     A1InvFA1 = ts.dot(ts.dot(self.A1Inv_Nyf_x_Nyf, F), self.A1)
                     y = tt.dot(A1InvFA1, y)
                 else:
-                    # We need to compute the filter for each wavelength bin.
-                    # We could speed this up by vectorization on the C++ side
-                    A1InvFA1 = tt.zeros(
-                        (
-                            self.nw,
-                            (self.ydeg + self.fdeg + 1) ** 2,
-                            (self.ydeg + 1) ** 2,
-                        )
-                    )
-                    for i in range(self.nw):
-                        F = self.Fg(tt.as_tensor_variable([-1.0]), f[:, i])
-                        A1InvFA1 = tt.set_subtensor(
-                            A1InvFA1[i],
-                            ts.dot(ts.dot(self.A1Inv_Nyf_x_Nyf, F), self.A1),
-                        )
-                    y = tt.transpose(tt.batched_dot(A1InvFA1, tt.transpose(y)))
+                    y = self.weight_ylms_by_grav_dark_filter(y, f)
 
         # If orthographic, rotate the map to the correct frame
         if self.nw is None:
@@ -1584,7 +2090,7 @@ class OpsOblate(OpsYlm):
         if self.udeg > 0:
             A1Ry = ifelse(
                 tt.eq(projection, STARRY_ORTHOGRAPHIC_PROJECTION),
-                tt.dot(self.Fu(u, tt.as_tensor_variable([np.pi])), A1Ry),
+                ts.dot(self.Fu(u, tt.as_tensor_variable([np.pi])), A1Ry),
                 A1Ry,
             )
 
@@ -1615,7 +2121,7 @@ class OpsOblate(OpsYlm):
     def sT(self, f, theta, bo, ro):
         return self._sT(f, theta, bo, ro)
 
-    @autocompile
+    @autocompile(downcast=True)
     def X(self, theta, xo, yo, zo, ro, inc, obl, fproj, u, f):
         """Compute the light curve design matrix."""
         # Determine shapes
@@ -1675,18 +2181,13 @@ class OpsOblate(OpsYlm):
 
     @autocompile
     def weight_ylms_by_grav_dark_filter(self, y, f):
-        # We need to compute the filter for each wavelength bin.
-        # We could speed this up by vectorization on the C++ side
-        A1InvFA1 = tt.zeros(
-            (self.nw, (self.ydeg + self.fdeg + 1) ** 2, (self.ydeg + 1) ** 2)
-        )
-        for i in range(self.nw):
-            F = self.Fg(tt.as_tensor_variable([-1.0]), f[:, i])
-            A1InvFA1 = tt.set_subtensor(
-                A1InvFA1[i], ts.dot(ts.dot(self.A1Inv_Nyf_x_Nyf, F), self.A1)
-            )
-        y = tt.transpose(tt.batched_dot(A1InvFA1, tt.transpose(y)))
-        return y
+        # Apply the filter in each wavelength bin in a single call: since
+        # the filter is a polynomial product, we just need to multiply
+        # the polynomial representation of each column of `y` by the
+        # corresponding filter polynomial
+        A1y = ts.dot(self.A1, y)
+        FA1y = self.Fgx(tt.as_tensor_variable([-1.0]), f, A1y)
+        return ts.dot(self.A1Inv_Nyf_x_Nyf, FA1y)
 
     @autocompile
     def grav_dark(self, z, wavnorm, omega, fobl, beta, tpole):
@@ -1751,6 +2252,7 @@ class OpsDoppler(OpsYlm):
         vsini_max,
         clight,
         log_lambda_padded,
+        conv_method="auto",
         **kwargs
     ):
         # Init the regular ops (with nw = nc, since that's
@@ -1778,22 +2280,57 @@ class OpsDoppler(OpsYlm):
             / (np.exp(-2 * lam_kernel) + 1)
         )
 
-        # Pre-compute the CSR matrix indices
+        # Pre-compute the CSR matrix indices (stacked over all epochs)
         self.indptr = (self.Ny * self.nk) * np.arange(
-            self.nw + 1, dtype="int32"
+            self.nt * self.nw + 1, dtype="int32"
         )
         i0 = np.reshape(np.arange(self.nk), (-1, 1))
         i1 = self.nwp * np.arange(self.Ny).reshape(1, -1)
         i2 = np.arange(self.nw).reshape(1, -1)
-        self.indices = np.reshape(
-            np.transpose(np.reshape(np.transpose(i0 + i1), (-1, 1)) + i2),
-            (-1,),
+        self.indices = np.tile(
+            np.reshape(
+                np.transpose(np.reshape(np.transpose(i0 + i1), (-1, 1)) + i2),
+                (-1,),
+            ),
+            self.nt,
         )
-        self.shape = np.array([self.nw, self.Ny * self.nwp])
+        self.shape = np.array([self.nt * self.nw, self.Ny * self.nwp])
 
         # Change of basis matrix (ydeg + udeg)
         self._A1Big = ts.as_sparse_variable(self._c_ops.A1Big)
 
+        # Convolution strategy
+        self._conv_method = None
+        self.conv_method = conv_method
+
+    @property
+    def conv_method(self):
+        """
+        The convolution strategy: direct (`conv2d`) or via FFTs. The cost of
+        the former scales as `nk`, while that of the latter scales roughly
+        as `log(nwp)`, so FFTs win for very wide kernels. Setting this to
+        `auto` chooses between the two based on this scaling. Changing it
+        clears all compiled functions.
+
+        """
+        return self._conv_method
+
+    @conv_method.setter
+    def conv_method(self, value):
+        if value == "auto":
+            if self.nk > 8 * np.log2(self.nwp):
+                value = "fft"
+            else:
+                value = "direct"
+        if value not in ["direct", "fft"]:
+            raise ValueError(
+                "Keyword ``conv_method`` must be one of ``auto``, "
+                "``direct``, or ``fft``."
+            )
+        if value != self._conv_method:
+            clear_cache(self)
+            self._conv_method = value
+
     @autocompile
     def enforce_shape(self, tensor, shape):
         return tensor + RaiseValueErrorIfOp(
@@ -1904,44 +2441,44 @@ class OpsDoppler(OpsYlm):
 
         # Compute the limb darkening operator
         if self.udeg > 0:
-            F = self.F(
+            F = self._F(
                 tt.as_tensor_variable(u), tt.as_tensor_variable([np.pi])
             )
             L = ts.dot(ts.dot(self.A1Inv, F), self.A1)
             kT0 = tt.dot(tt.transpose(L), kT0)
 
-        # Compute the kernels at each epoch
-        kT = tt.zeros((self.nt, self.Ny, self.nk))
-        for m in range(self.nt):
-            kT = tt.set_subtensor(
-                kT[m],
-                tt.transpose(
-                    self.right_project(
-                        tt.transpose(kT0),
-                        inc,
-                        tt.as_tensor_variable(0.0),
-                        theta[m],
-                    )
-                ),
-            )
-        return kT
-
-    @autocompile
-    def get_D_data(self, kT0, inc, theta_scalar):
-        """
-        Return the Doppler matrix as a stack of data arrays.
-
-        """
-        # Rotate the kernels
-        kT = tt.transpose(
-            self.right_project(
+        # Rotate the `nk` kernels to the sky frame once (this is the
+        # sky rotation in `right_project` at zero obliquity, where the
+        # rotation about the line of sight is the identity)
+        kT = self.dotR(
+            self.dotR(
                 tt.transpose(kT0),
-                inc,
-                tt.as_tensor_variable(0.0),
-                theta_scalar,
-            )
+                math.to_tensor(-1.0),
+                math.to_tensor(0.0),
+                math.to_tensor(0.0),
+                -(0.5 * np.pi - inc),
+            ),
+            math.to_tensor(1.0),
+            math.to_tensor(0.0),
+            math.to_tensor(0.0),
+            -0.5 * np.pi,
+        )
+
+        # Rotate a stack of `nt` copies of them, each row by its own
+        # phase, and then to the polar frame (which must follow the
+        # phase rotation). The size of the graph is therefore
+        # independent of `nt`.
+        kT = self.tensordotRz(
+            tt.tile(kT, (self.nt, 1)), tt.repeat(theta, self.nk)
+        )
+        kT = self.dotR(
+            kT,
+            math.to_tensor(1.0),
+            math.to_tensor(0.0),
+            math.to_tensor(0.0),
+            0.5 * np.pi,
         )
-        return tt.tile(tt.reshape(kT, (-1,)), self.nw)
+        return tt.swapaxes(tt.reshape(kT, (self.nt, self.nk, self.Ny)), 1, 2)
 
     @autocompile
     def get_D(self, inc, theta, veq, u):
@@ -1955,32 +2492,116 @@ class OpsDoppler(OpsYlm):
         In general, instantiating this matrix (even in its sparse form) is not
         a good idea: it's very slow, and can consume a ton of memory!
         """
-        # Compute the convolution kernels
-        vsini = self.enforce_bounds(veq * tt.sin(inc), 0.0, self.vsini_max)
-        x = self.get_x(vsini)
-        rT = self.get_rT(x)
-        kT0 = self.get_kT0(rT)
+        # Get the convolution kernels
+        kT = self.get_kT(inc, theta, veq, u)
 
-        # Compute the limb darkening operator
-        if self.udeg > 0:
-            F = self.F(
-                tt.as_tensor_variable(u), tt.as_tensor_variable([np.pi])
+        # Each row of the matrix contains all the kernels at that epoch
+        data = tt.tile(
+            tt.reshape(kT, (self.nt, 1, self.Ny * self.nk)), (1, self.nw, 1)
+        )
+        return ts.basic.CSR(
+            tt.reshape(data, (-1,)), self.indices, self.indptr, self.shape
+        )
+
+    def _rfft(self, x, n):
+        """
+        Real FFT along the last axis of the tensor `x`, whose last
+        dimension has length `n`, zero-padded to length `nwp`. Returns
+        the real and imaginary parts, each of shape (`nwp // 2 + 1`, ...).
+
+        """
+        shape = tt.shape(x)
+        if n < self.nwp:
+            x = tt.concatenate(
+                (x, tt.zeros((shape[0], shape[1], self.nwp - n))), axis=2
             )
-            L = ts.dot(ts.dot(self.A1Inv, F), self.A1)
-            kT0 = tt.dot(tt.transpose(L), kT0)
+        X = fft.rfft(tt.reshape(x, (-1, self.nwp)))
+        X = tt.reshape(X, (shape[0], shape[1], self.nwp // 2 + 1, 2))
+        return (
+            tt.transpose(X[:, :, :, 0], (2, 0, 1)),
+            tt.transpose(X[:, :, :, 1], (2, 0, 1)),
+        )
 
-        # Stack to get the full matrix
-        return ts.vstack(
-            [
-                ts.basic.CSR(
-                    self.get_D_data(kT0, inc, theta[m]),
-                    self.indices,
-                    self.indptr,
-                    self.shape,
-                )
-                for m in range(self.nt)
-            ]
+    def _irfft(self, Zr, Zi):
+        """
+        Inverse of ``_rfft`` for the real and imaginary parts `Zr` and `Zi`,
+        each of shape (`nwp // 2 + 1`, `P`, `Q`). Returns a tensor of shape
+        (`P`, `Q`, `nwp`).
+
+        """
+        shape = tt.shape(Zr)
+        Z = tt.stack((Zr, Zi), axis=-1)
+        Z = tt.reshape(
+            tt.transpose(Z, (1, 2, 0, 3)), (-1, self.nwp // 2 + 1, 2)
         )
+        z = fft.irfft(Z, is_odd=(self.nwp % 2 == 1))
+        return tt.reshape(z, (shape[1], shape[2], self.nwp))
+
+    def correlate(self, x, f, x_shape, f_shape):
+        """
+        Cross-correlate each of the signals in `x`, a tensor of shape
+        (`B`, `C`, `nwp`), with each of the filters in `f`, a tensor of
+        shape (`F`, `C`, `nk`), summing over the `C` channels. Returns a
+        tensor of shape (`B`, `F`, `nw`). This is equivalent to a `conv2d`
+        with ``border_mode="valid"`` and ``filter_flip=False``. The static
+        shapes `x_shape` and `f_shape` are passed on to `conv2d` as hints.
+
+        """
+        if self.conv_method == "fft":
+
+            # Correlation is convolution with the flipped filter;
+            # the valid part is not affected by the circular wrapping
+            Xr, Xi = self._rfft(x, self.nwp)
+            Fr, Fi = self._rfft(f[:, :, ::-1], self.nk)
+            Fr = tt.transpose(Fr, (0, 2, 1))
+            Fi = tt.transpose(Fi, (0, 2, 1))
+            Zr = tt.batched_dot(Xr, Fr) - tt.batched_dot(Xi, Fi)
+            Zi = tt.batched_dot(Xr, Fi) + tt.batched_dot(Xi, Fr)
+            return self._irfft(Zr, Zi)[:, :, self.nk - 1 :]
+
+        else:
+
+            product = tt.nnet.conv2d(
+                tt.shape_padaxis(x, 2),
+                tt.shape_padaxis(f, 2),
+                border_mode="valid",
+                filter_flip=False,
+                input_shape=(x_shape[0], x_shape[1], 1, x_shape[2]),
+                filter_shape=(f_shape[0], f_shape[1], 1, f_shape[2]),
+            )
+            return product[:, :, 0, :]
+
+    def correlate_transpose(self, y, f, y_shape, f_shape):
+        """
+        Transpose of ``correlate`` with respect to the signals: convolve
+        each of the signals in `y`, a tensor of shape (`B`, `F`, `nw`),
+        with the filters in `f`, a tensor of shape (`F`, `C`, `nk`),
+        summing over `F`. Returns a tensor of shape (`B`, `C`, `nwp`).
+        This is equivalent to a `conv2d_transpose` with
+        ``border_mode="valid"`` and ``filter_flip=False``.
+
+        """
+        if self.conv_method == "fft":
+
+            # The full convolution has length exactly `nwp`,
+            # so there is no circular wrapping
+            Yr, Yi = self._rfft(y, self.nw)
+            Fr, Fi = self._rfft(f, self.nk)
+            Zr = tt.batched_dot(Yr, Fr) - tt.batched_dot(Yi, Fi)
+            Zi = tt.batched_dot(Yr, Fi) + tt.batched_dot(Yi, Fr)
+            return self._irfft(Zr, Zi)
+
+        else:
+
+            product = tt.nnet.conv2d_transpose(
+                tt.shape_padaxis(y, 2),
+                tt.reshape(f, (f_shape[0], 1, f_shape[1], f_shape[2])),
+                border_mode="valid",
+                filter_flip=False,
+                output_shape=(y_shape[0], 1, f_shape[1], self.nwp),
+                filter_shape=(f_shape[0], 1, f_shape[1], f_shape[2]),
+            )
+            return product[:, 0, :, :]
 
     @autocompile
     def get_D_fixed_spectrum(self, inc, theta, veq, u, spectrum):
@@ -1994,14 +2615,12 @@ class OpsDoppler(OpsYlm):
         # Get the convolution kernels
         kT = self.get_kT(inc, theta, veq, u)
 
-        # The dot product is just a 2d convolution!
-        product = tt.nnet.conv2d(
-            tt.reshape(spectrum, (self.nc, 1, 1, self.nwp)),
-            tt.reshape(kT, (self.nt * self.Ny, 1, 1, self.nk)),
-            border_mode="valid",
-            filter_flip=False,
-            input_shape=(self.nc, 1, 1, self.nwp),
-            filter_shape=(self.nt * self.Ny, 1, 1, self.nk),
+        # The dot product is just a convolution!
+        product = self.correlate(
+            tt.reshape(spectrum, (self.nc, 1, self.nwp)),
+            tt.reshape(kT, (self.nt * self.Ny, 1, self.nk)),
+            (self.nc, 1, self.nwp),
+            (self.nt * self.Ny, 1, self.nk),
         )
         product = tt.reshape(product, (self.nc, self.nt, self.Ny, self.nw))
         product = tt.swapaxes(product, 1, 2)
@@ -2035,7 +2654,7 @@ class OpsDoppler(OpsYlm):
         Dot the Doppler design matrix for a fixed Ylm map
         into an arbitrary dense `matrix`. This is equivalent to
         ``tt.dot(get_D_fixed_map(), matrix)``, but computes the
-        product with a single `conv2d` operation.
+        product with a single convolution.
 
         """
         # Get the convolution kernels
@@ -2049,14 +2668,12 @@ class OpsDoppler(OpsYlm):
         if matrix.ndim == 1:
             matrix = tt.shape_padright(matrix)
 
-        # The dot product is just a 2d convolution!
-        product = tt.nnet.conv2d(
-            tt.reshape(tt.transpose(matrix), (-1, self.nc, 1, self.nwp)),
-            tt.reshape(kTy, (self.nt, self.nc, 1, self.nk)),
-            border_mode="valid",
-            filter_flip=False,
-            input_shape=(None, self.nc, 1, self.nwp),
-            filter_shape=(self.nt, self.nc, 1, self.nk),
+        # The dot product is just a convolution!
+        product = self.correlate(
+            tt.reshape(tt.transpose(matrix), (-1, self.nc, self.nwp)),
+            kTy,
+            (None, self.nc, self.nwp),
+            (self.nt, self.nc, self.nk),
         )
         return tt.transpose(tt.reshape(product, (-1, self.nt * self.nw)))
 
@@ -2068,7 +2685,7 @@ class OpsDoppler(OpsYlm):
         Dot the transpose of the Doppler design matrix for a fixed Ylm map
         into an arbitrary dense `matrix`. This is equivalent to
         ``tt.dot(get_D_fixed_map().transpose(), matrix)``, but computes the
-        product with a single `conv2d_transpose` operation.
+        product with a single transposed convolution.
 
         """
         # Get the convolution kernels
@@ -2082,25 +2699,77 @@ class OpsDoppler(OpsYlm):
         if matrix.ndim == 1:
             matrix = tt.shape_padright(matrix)
 
-        # The dot product is just a 2d convolution!
-        product = tt.nnet.conv2d_transpose(
-            tt.reshape(tt.transpose(matrix), (-1, self.nt, 1, self.nw)),
-            tt.reshape(kTy, (self.nt, 1, self.nc, self.nk)),
-            border_mode="valid",
-            filter_flip=False,
-            output_shape=(None, 1, self.nc, self.nwp),
-            filter_shape=(self.nt, 1, self.nc, self.nk),
-        )
-        product = tt.swapaxes(product, 2, 3)
-        product = tt.swapaxes(product, 0, 3)
+        # The dot product is just a transposed convolution!
+        product = self.correlate_transpose(
+            tt.reshape(tt.transpose(matrix), (-1, self.nt, self.nw)),
+            kTy,
+            (None, self.nt, self.nw),
+            (self.nt, self.nc, self.nk),
+        )
+        product = tt.transpose(product, (1, 2, 0))
         return tt.reshape(product, (self.nc * self.nwp, -1))
 
+    @autocompile
+    def get_MTCInvM_fixed_map(self, inc, theta, veq, u, y, cinv):
+        """
+        Return the matrix ``M^T C^-1 M``, where ``M`` is the Doppler design
+        matrix for a fixed Ylm map and ``C`` is a *diagonal* data covariance
+        whose inverse has entries `cinv` of shape (`nt`, `nw`).
+
+        Each (`nc`, `nc`) block of this matrix is banded with half-width
+        `nk - 1`, and band `d` of block (`c`, `c'`) is a 1d convolution
+        of `cinv` with the lagged kernel products
+        ``kTy[t, c, k] * kTy[t, c', k + d]``, summed over epochs. We compute
+        all the bands with a single (transposed) convolution, so we never
+        instantiate the design matrix or the data covariance.
+
+        """
+        # Get the convolution kernels
+        kT = self.get_kT(inc, theta, veq, u)
+
+        # Dot them into the Ylms
+        # kTy has shape (nt, nc, nk)
+        kTy = tt.swapaxes(tt.dot(tt.transpose(y), kT), 0, 1)
+
+        # Lagged products of the kernels
+        # kTykTy has shape (nt, nc, nc, 2 * nk - 1, nk)
+        nd = 2 * self.nk - 1
+        pad = tt.zeros((self.nt, self.nc, self.nk - 1))
+        kTy_pad = tt.concatenate((pad, kTy, pad), axis=2)
+        lag = np.arange(nd).reshape(-1, 1) + np.arange(self.nk).reshape(1, -1)
+        kTy_lag = tt.take(kTy_pad, lag, axis=2)
+        kTykTy = kTy.dimshuffle(0, 1, "x", "x", 2) * kTy_lag.dimshuffle(
+            0, "x", 1, 2, 3
+        )
+        kTykTy = tt.reshape(kTykTy, (self.nt, self.nc * self.nc * nd, self.nk))
+
+        # The bands are just a transposed convolution!
+        bands = self.correlate_transpose(
+            tt.reshape(cinv, (1, self.nt, self.nw)),
+            kTykTy,
+            (1, self.nt, self.nw),
+            (self.nt, self.nc * self.nc * nd, self.nk),
+        )
+        bands = tt.reshape(bands, (-1,))
+
+        # Scatter the bands into the dense (nc * nwp, nc * nwp) matrix
+        c, cp, d, a = np.indices((self.nc, self.nc, nd, self.nwp)).reshape(
+            4, -1
+        )
+        b = a + d - (self.nk - 1)
+        idx = np.flatnonzero((b >= 0) & (b < self.nwp))
+        MTCInvM = tt.zeros((self.nc * self.nwp, self.nc * self.nwp))
+        return tt.set_subtensor(
+            MTCInvM[c[idx] * self.nwp + a[idx], cp[idx] * self.nwp + b[idx]],
+            bands[idx],
+        )
+
     @autocompile
     def dot_design_matrix_into(self, inc, theta, veq, u, matrix):
         """
         Dot the full Doppler design matrix into an arbitrary dense `matrix`.
         This is equivalent to ``tt.dot(get_D(), matrix)``, but computes the
-        product with a single `conv2d` operation.
+        product with a single convolution.
 
         """
         # Get the convolution kernels
@@ -2110,14 +2779,12 @@ class OpsDoppler(OpsYlm):
         if matrix.ndim == 1:
             matrix = tt.shape_padright(matrix)
 
-        # The dot product is just a 2d convolution!
-        product = tt.nnet.conv2d(
-            tt.reshape(tt.transpose(matrix), (-1, self.Ny, 1, self.nwp)),
-            tt.reshape(kT, (self.nt, self.Ny, 1, self.nk)),
-            border_mode="valid",
-            filter_flip=False,
-            input_shape=(None, self.Ny, 1, self.nwp),
-            filter_shape=(self.nt, self.Ny, 1, self.nk),
+        # The dot product is just a convolution!
+        product = self.correlate(
+            tt.reshape(tt.transpose(matrix), (-1, self.Ny, self.nwp)),
+            kT,
+            (None, self.Ny, self.nwp),
+            (self.nt, self.Ny, self.nk),
         )
         return tt.transpose(tt.reshape(product, (-1, self.nt * self.nw)))
 
@@ -2127,7 +2794,7 @@ class OpsDoppler(OpsYlm):
         Dot the transpose of the full Doppler design matrix into an arbitrary
         dense `matrix`. This is equivalent to
         ``tt.dot(get_D().transpose(), matrix)``, but computes the product with
-        a single `conv2d` operation.
+        a single convolution.
 
         """
         # Get the convolution kernels
@@ -2137,17 +2804,14 @@ class OpsDoppler(OpsYlm):
         if matrix.ndim == 1:
             matrix = tt.shape_padright(matrix)
 
-        # The dot product is just a 2d convolution!
-        product = tt.nnet.conv2d_transpose(
-            tt.reshape(tt.transpose(matrix), (-1, self.nt, 1, self.nw)),
-            tt.reshape(kT, (self.nt, 1, self.Ny, self.nk)),
-            border_mode="valid",
-            filter_flip=False,
-            output_shape=(None, 1, self.Ny, self.nwp),
-            filter_shape=(self.nt, 1, self.Ny, self.nk),
-        )
-        product = tt.swapaxes(product, 2, 3)
-        product = tt.swapaxes(product, 0, 3)
+        # The dot product is just a transposed convolution!
+        product = self.correlate_transpose(
+            tt.reshape(tt.transpose(matrix), (-1, self.nt, self.nw)),
+            kT,
+            (None, self.nt, self.nw),
+            (self.nt, self.Ny, self.nk),
+        )
+        product = tt.transpose(product, (1, 2, 0))
         return tt.reshape(product, (self.Ny * self.nwp, -1))
 
     @autocompile
@@ -2165,28 +2829,26 @@ class OpsDoppler(OpsYlm):
     @autocompile
     def get_flux_from_conv(self, inc, theta, veq, u, a):
         """
-        Compute the flux via a single 2d convolution.
+        Compute the flux via a single convolution.
         This is the *faster* way of computing the model.
 
         """
         # Get the convolution kernels
         kT = self.get_kT(inc, theta, veq, u)
 
-        # The flux is just a 2d convolution!
-        flux = tt.nnet.conv2d(
-            tt.reshape(a, (1, self.Ny, 1, self.nwp)),
-            tt.reshape(kT, (self.nt, self.Ny, 1, self.nk)),
-            border_mode="valid",
-            filter_flip=False,
-            input_shape=(1, self.Ny, 1, self.nwp),
-            filter_shape=(self.nt, self.Ny, 1, self.nk),
+        # The flux is just a convolution!
+        flux = self.correlate(
+            tt.reshape(a, (1, self.Ny, self.nwp)),
+            kT,
+            (1, self.Ny, self.nwp),
+            (self.nt, self.Ny, self.nk),
         )
-        return flux[0, :, 0, :]
+        return flux[0]
 
     @autocompile
     def get_flux_from_dotconv(self, inc, theta, veq, u, y, spectrum):
         """
-        Compute the flux via a dot product followed by a 2d convolution.
+        Compute the flux via a dot product followed by a convolution.
         This is usually the *fastest* way of computing the model.
 
         """
@@ -2198,7 +2860,7 @@ class OpsDoppler(OpsYlm):
     @autocompile
     def get_flux_from_convdot(self, inc, theta, veq, u, y, spectrum):
         """
-        Compute the flux via a 2d convolution follwed by a dot product.
+        Compute the flux via a convolution follwed by a dot product.
         This is very fast, but usually slightly slower than
         ``get_flux_from_dotconv``.
 
@@ -2240,6 +2902,110 @@ class OpsDoppler(OpsYlm):
         w, _ = theano.scan(step, outputs_info=w, n_steps=maxiter)
         return w[-1]
 
+    @autocompile
+    def L1_fista(self, ATA, ATy, lam, maxiter, tol, w0):
+        """
+        L1 regularized least squares via the fast iterative
+        shrinkage-thresholding algorithm (FISTA) of
+
+            https://doi.org/10.1137/080716542
+
+        with adaptive (gradient) restarts. This minimizes the same objective
+        as ``L1``, but each step costs a single matrix-vector product rather
+        than a Cholesky factorization, and the iteration can be warm-started
+        from the guess `w0` (e.g., the solution at a previous tempering
+        step).
+
+        We only iterate over an active set of weights, which we initialize
+        with the nonzero weights in `w0` and those that pass the (basic)
+        strong rule of
+
+            https://doi.org/10.1111/j.1467-9868.2011.01004.x
+
+        at `w0`. Since the strong rule can discard weights that are
+        nonzero at the solution, we check the KKT conditions of the
+        full problem after each solve, add any weights that violate
+        them to the active set, and solve again, until there are no
+        violations.
+
+        """
+        ATA = tt.as_tensor_variable(ATA)
+        ATy = tt.as_tensor_variable(ATy)
+        w0 = tt.as_tensor_variable(w0)
+
+        # Lipschitz constant of the gradient (the largest eigenvalue
+        # of `ATA`) via power iteration, with a small safety margin.
+        # This is also an upper bound for any principal submatrix.
+        def power_step(v):
+            v = tt.dot(ATA, v)
+            return v / tt.sqrt(tt.sum(v ** 2))
+
+        v, _ = theano.scan(
+            power_step, outputs_info=tt.ones_like(ATy), n_steps=30
+        )
+        L = 1.05 * tt.dot(v[-1], tt.dot(ATA, v[-1]))
+
+        def fista_step(w_prev, z, t, A, b):
+            # Gradient step
+            z_ = z - (tt.dot(A, z) - b) / L
+
+            # Proximal (soft thresholding) step
+            w_new = tt.sgn(z_) * tt.maximum(
+                tt.abs_(z_) - lam / L, tt.zeros_like(z_)
+            )
+
+            # Momentum, restarted whenever it points uphill
+            t_new = 0.5 * (1.0 + tt.sqrt(1.0 + 4.0 * t ** 2))
+            restart = tt.gt(tt.dot(z - w_new, w_new - w_prev), 0.0)
+            z_new = tt.switch(
+                restart, w_new, w_new + ((t - 1.0) / t_new) * (w_new - w_prev)
+            )
+            t_new = tt.switch(restart, tt.ones_like(t_new), t_new)
+
+            chisq = tt.sum((w_prev - w_new) ** 2)
+            return [w_new, z_new, t_new], scan_until(chisq < tol)
+
+        def solve_step(w, active):
+            # Solve the problem restricted to the active set
+            idx = tt.nonzero(active)[0]
+            A = ATA[idx][:, idx]
+            b = ATy[idx]
+            (x, _, _), _ = theano.scan(
+                fista_step,
+                outputs_info=[
+                    w[idx],
+                    w[idx],
+                    tt.as_tensor_variable(np.float64(1.0)),
+                ],
+                non_sequences=[A, b],
+                n_steps=maxiter,
+            )
+            w = tt.set_subtensor(tt.zeros_like(w)[idx], x[-1])
+
+            # The weights outside the active set are zero, so they
+            # satisfy the KKT conditions iff |gradient| <= lam
+            grad = tt.dot(ATA, w) - ATy
+            violators = tt.and_(
+                tt.eq(active, 0), tt.gt(tt.abs_(grad), lam * (1.0 + 1e-6))
+            )
+            active = tt.or_(active, violators)
+            return [w, active], scan_until(tt.eq(tt.sum(violators), 0))
+
+        # Strong rule screening at `w0`; we keep weight `j` if
+        # |gradient_j| >= 2 * lam - lam_max
+        grad0 = tt.dot(ATA, w0) - ATy
+        lam_max = tt.max(tt.abs_(ATy))
+        active = tt.or_(
+            tt.neq(w0, 0.0), tt.ge(tt.abs_(grad0), 2 * lam - lam_max)
+        )
+
+        (w, _), _ = theano.scan(
+            solve_step,
+            outputs_info=[w0, active],
+            n_steps=tt.shape(ATy)[0] + 1,
+        )
+        return w[-1]
+
 
 class OpsSystem(object):
     """Class housing ops for modeling Keplerian systems."""
@@ -2267,13 +3033,11 @@ class OpsSystem(object):
         self.texp = texp
         self.oversample = oversample
         self.order = order
+        self._kepler = KeplerOp(_c_ops.kepler)
 
-    @autocompile
-    def position(
+    def _get_orbit(
         self,
-        t,
         pri_m,
-        pri_t0,
         sec_m,
         sec_t0,
         sec_porb,
@@ -2282,8 +3046,9 @@ class OpsSystem(object):
         sec_Omega,
         sec_iorb,
     ):
-        """Compute the Cartesian positions of all bodies."""
-        orbit = exoplanet.orbits.KeplerianOrbit(
+        """Return the Keplerian orbit of all secondaries."""
+        return KeplerianOrbit(
+            self._kepler,
             period=sec_porb,
             t0=sec_t0,
             incl=sec_iorb,
@@ -2292,40 +3057,37 @@ class OpsSystem(object):
             Omega=sec_Omega,
             m_planet=sec_m,
             m_star=pri_m,
-            r_star=1.0,  # doesn't matter
         )
-        # Position of the primary
-        if len(self.secondaries) > 1:
-            xyz = tt.sum(orbit.get_star_position(t), axis=-1)
-            x_pri = tt.reshape(xyz[0], (-1, 1))
-            y_pri = tt.reshape(xyz[1], (-1, 1))
-            z_pri = tt.reshape(xyz[2], (-1, 1))
-        else:
-            x_pri, y_pri, z_pri = orbit.get_star_position(t)
 
-        # The shape of `x`, `y`, `z` in `exoplanet` is unreliable!
-        if x_pri.ndim == 1:
-            x_pri = tt.reshape(x_pri, (-1, 1))
-            y_pri = tt.reshape(y_pri, (-1, 1))
-            z_pri = tt.reshape(z_pri, (-1, 1))
+    @autocompile
+    def position(
+        self,
+        t,
+        pri_m,
+        pri_t0,
+        sec_m,
+        sec_t0,
+        sec_porb,
+        sec_ecc,
+        sec_w,
+        sec_Omega,
+        sec_iorb,
+    ):
+        """Compute the Cartesian positions of all bodies."""
+        orbit = self._get_orbit(
+            pri_m, sec_m, sec_t0, sec_porb, sec_ecc, sec_w, sec_Omega, sec_iorb
+        )
 
-        # Positions of the secondaries
-        try:
-            x_sec, y_sec, z_sec = orbit.get_planet_position(
-                t, light_delay=self.light_delay
-            )
-        except TypeError:
-            if self.light_delay:
-                logger.warn(
-                    "This version of `exoplanet` does not model light delays."
-                )
-            x_sec, y_sec, z_sec = orbit.get_planet_position(t)
+        # Position of the primary
+        x_pri, y_pri, z_pri = [
+            tt.sum(xyz, axis=-1, keepdims=True)
+            for xyz in orbit.get_star_position(t)
+        ]
 
-        # The shape of `x`, `y`, `z` in `exoplanet` is unreliable!
-        if x_sec.ndim == 1:
-            x_sec = tt.reshape(x_sec, (-1, 1))
-            y_sec = tt.reshape(y_sec, (-1, 1))
-            z_sec = tt.reshape(z_sec, (-1, 1))
+        # Positions of the secondaries
+        x_sec, y_sec, z_sec = orbit.get_planet_position(
+            t, light_delay=self.light_delay
+        )
 
         # Concatenate them
         x = tt.transpose(tt.concatenate((x_pri, x_sec), axis=-1))
@@ -2334,7 +3096,7 @@ class OpsSystem(object):
 
         return x, y, z
 
-    @autocompile
+    @autocompile(downcast=True)
     def X(
         self,
         t,
@@ -2367,6 +3129,87 @@ class OpsSystem(object):
         sec_sigr,
     ):
         """Compute the system light curve design matrix."""
+        return self._X(
+            t,
+            pri_r,
+            pri_m,
+            pri_prot,
+            pri_t0,
+            pri_theta0,
+            pri_amp,
+            pri_inc,
+            pri_obl,
+            pri_fproj,
+            pri_u,
+            [pri_f],
+            sec_r,
+            sec_m,
+            sec_prot,
+            sec_t0,
+            sec_theta0,
+            sec_porb,
+            sec_ecc,
+            sec_w,
+            sec_Omega,
+            sec_iorb,
+            sec_amp,
+            sec_inc,
+            sec_obl,
+            sec_u,
+            [sec_f],
+            sec_sigr,
+        )[0]
+
+    def _get_body_X(self, ops, theta, xo, yo, zo, ro, inc, obl, u, fs):
+        """
+        Compute the design matrices of a body for each of the filters in
+        the list `fs` and return them side by side.
+
+        """
+        if len(fs) == 1:
+            return ops.X(theta, xo, yo, zo, ro, inc, obl, u, fs[0])
+        else:
+            return ops._X(theta, xo, yo, zo, ro, inc, obl, u, fs)
+
+    def _X(
+        self,
+        t,
+        pri_r,
+        pri_m,
+        pri_prot,
+        pri_t0,
+        pri_theta0,
+        pri_amp,
+        pri_inc,
+        pri_obl,
+        pri_fproj,
+        pri_u,
+        pri_fs,
+        sec_r,
+        sec_m,
+        sec_prot,
+        sec_t0,
+        sec_theta0,
+        sec_porb,
+        sec_ecc,
+        sec_w,
+        sec_Omega,
+        sec_iorb,
+        sec_amp,
+        sec_inc,
+        sec_obl,
+        sec_u,
+        sec_fs,
+        sec_sigr,
+    ):
+        """
+        Compute the system light curve design matrices for each of the
+        filters in the lists `pri_fs` and `sec_fs`.
+
+        The design matrices of each body for all filters are placed side by
+        side. Also returns the Keplerian orbit instance.
+
+        """
         # Exposure time integration?
         if self.texp != 0.0:
 
@@ -2397,33 +3240,10 @@ class OpsSystem(object):
             t = tt.reshape(t, (-1,))
 
         # Compute the relative positions of all bodies
-        orbit = exoplanet.orbits.KeplerianOrbit(
-            period=sec_porb,
-            t0=sec_t0,
-            incl=sec_iorb,
-            ecc=sec_ecc,
-            omega=sec_w,
-            Omega=sec_Omega,
-            m_planet=sec_m,
-            m_star=pri_m,
-            r_star=pri_r,
+        orbit = self._get_orbit(
+            pri_m, sec_m, sec_t0, sec_porb, sec_ecc, sec_w, sec_Omega, sec_iorb
         )
-        try:
-            x, y, z = orbit.get_relative_position(
-                t, light_delay=self.light_delay
-            )
-        except TypeError:
-            if self.light_delay:
-                logger.warn(
-                    "This version of `exoplanet` does not model light delays."
-                )
-            x, y, z = orbit.get_relative_position(t)
-
-        # The shape of `x`, `y`, `z` in `exoplanet` is unreliable!
-        if x.ndim == 1:
-            x = tt.reshape(x, (-1, 1))
-            y = tt.reshape(y, (-1, 1))
-            z = tt.reshape(z, (-1, 1))
+        x, y, z = orbit.get_relative_position(t, light_delay=self.light_delay)
 
         # Get all rotational phases
         pri_prot = ifelse(
@@ -2449,10 +3269,11 @@ class OpsSystem(object):
                 pri_obl,
                 pri_fproj,
                 pri_u,
-                pri_f,
+                pri_fs[0],
             )
         else:
-            phase_pri = pri_amp * self.primary.map.ops.X(
+            phase_pri = pri_amp * self._get_body_X(
+                self.primary.map.ops,
                 theta_pri,
                 tt.zeros_like(t),
                 tt.zeros_like(t),
@@ -2461,7 +3282,7 @@ class OpsSystem(object):
                 pri_inc,
                 pri_obl,
                 pri_u,
-                pri_f,
+                pri_fs,
             )
         if self._reflected:
             phase_sec = [
@@ -2480,7 +3301,7 @@ class OpsSystem(object):
                     sec_inc[i],
                     sec_obl[i],
                     sec_u[i],
-                    sec_f[i],
+                    sec_fs[0][i],
                     sec_sigr[i],
                 )
                 for i, sec in enumerate(self.secondaries)
@@ -2488,7 +3309,8 @@ class OpsSystem(object):
         else:
             phase_sec = [
                 sec_amp[i]
-                * sec.map.ops.X(
+                * self._get_body_X(
+                    sec.map.ops,
                     theta_sec[i],
                     -x[:, i],
                     -y[:, i],
@@ -2497,7 +3319,7 @@ class OpsSystem(object):
                     sec_inc[i],
                     sec_obl[i],
                     sec_u[i],
-                    sec_f[i],
+                    [f[i] for f in sec_fs],
                 )
                 for i, sec in enumerate(self.secondaries)
             ]
@@ -2540,7 +3362,7 @@ class OpsSystem(object):
                         pri_obl,
                         pri_fproj,
                         pri_u,
-                        pri_f,
+                        pri_fs[0],
                     )
                     - phase_pri[idx],
                 )
@@ -2549,7 +3371,8 @@ class OpsSystem(object):
                     occ_pri[idx],
                     occ_pri[idx]
                     + pri_amp
-                    * self.primary.map.ops.X(
+                    * self._get_body_X(
+                        self.primary.map.ops,
                         theta_pri[idx],
                         xo[idx],
                         yo[idx],
@@ -2558,7 +3381,7 @@ class OpsSystem(object):
                         pri_inc,
                         pri_obl,
                         pri_u,
-                        pri_f,
+                        pri_fs,
                     )
                     - phase_pri[idx],
                 )
@@ -2584,7 +3407,8 @@ class OpsSystem(object):
                     occ_sec[i][idx],
                     occ_sec[i][idx]
                     + sec_amp[i]
-                    * sec.map.ops.X(
+                    * self._get_body_X(
+                        sec.map.ops,
                         theta_sec[i, idx],
                         xo[idx],
                         yo[idx],
@@ -2593,7 +3417,7 @@ class OpsSystem(object):
                         sec_inc[i],
                         sec_obl[i],
                         sec_u[i],
-                        sec_f[i],
+                        [f[i] for f in sec_fs],
                     )
                     - phase_sec[i][idx],
                 )
@@ -2616,7 +3440,7 @@ class OpsSystem(object):
                         sec_inc[i],
                         sec_obl[i],
                         sec_u[i],
-                        sec_f[i],
+                        sec_fs[0][i],
                         sec_sigr[i],
                     )
                     - phase_sec[i][idx],
@@ -2626,7 +3450,8 @@ class OpsSystem(object):
                     occ_sec[i][idx],
                     occ_sec[i][idx]
                     + sec_amp[i]
-                    * sec.map.ops.X(
+                    * self._get_body_X(
+                        sec.map.ops,
                         theta_sec[i, idx],
                         xo[idx],
                         yo[idx],
@@ -2635,7 +3460,7 @@ class OpsSystem(object):
                         sec_inc[i],
                         sec_obl[i],
                         sec_u[i],
-                        sec_f[i],
+                        [f[i] for f in sec_fs],
                     )
                     - phase_sec[i][idx],
                 )
@@ -2676,7 +3501,7 @@ class OpsSystem(object):
                             sec_inc[i],
                             sec_obl[i],
                             sec_u[i],
-                            sec_f[i],
+                            sec_fs[0][i],
                             sec_sigr[i],
                         )
                         - phase_sec[i][idx],
@@ -2686,7 +3511,8 @@ class OpsSystem(object):
                         occ_sec[i][idx],
                         occ_sec[i][idx]
                         + sec_amp[i]
-                        * sec.map.ops.X(
+                        * self._get_body_X(
+                            sec.map.ops,
                             theta_sec[i, idx],
                             xo[idx],
                             yo[idx],
@@ -2695,7 +3521,7 @@ class OpsSystem(object):
                             sec_inc[i],
                             sec_obl[i],
                             sec_u[i],
-                            sec_f[i],
+                            [f[i] for f in sec_fs],
                         )
                         - phase_sec[i][idx],
                     )
@@ -2708,15 +3534,16 @@ class OpsSystem(object):
         # Sum and return
         if self.texp == 0.0:
 
-            return X
+            return X, orbit
 
         else:
 
             stencil = tt.shape_padright(tt.shape_padleft(stencil, 1), 1)
-            return tt.sum(
+            X = tt.sum(
                 stencil * tt.reshape(X, (-1, self.oversample, X.shape[1])),
                 axis=1,
             )
+            return X, orbit
 
     @autocompile
     def rv(
@@ -2756,11 +3583,6 @@ class OpsSystem(object):
         keplerian,
     ):
         """Compute the observed system radial velocity (RV maps only)."""
-        # TODO: This method is currently very inefficient, as it
-        # calls `X` twice per call and instantiates an `orbit`
-        # instance up to three separate times per call. We should
-        # re-code the logic from `X()` in here to optimize it.
-
         # Compute the RV filter
         pri_f = self.primary.map.ops.compute_rv_filter(
             pri_inc, pri_obl, pri_veq, pri_alpha
@@ -2779,39 +3601,8 @@ class OpsSystem(object):
         pri_f0 = tt.set_subtensor(pri_f0[0], np.pi)
         sec_f0 = tt.as_tensor_variable([pri_f0 for sec in self.secondaries])
 
-        # Compute the two design matrices
-        X = self.X(
-            t,
-            pri_r,
-            pri_m,
-            pri_prot,
-            pri_t0,
-            pri_theta0,
-            pri_amp,
-            pri_inc,
-            pri_obl,
-            pri_fproj,
-            pri_u,
-            pri_f,
-            sec_r,
-            sec_m,
-            sec_prot,
-            sec_t0,
-            sec_theta0,
-            sec_porb,
-            sec_ecc,
-            sec_w,
-            sec_Omega,
-            sec_iorb,
-            sec_amp,
-            sec_inc,
-            sec_obl,
-            sec_u,
-            sec_f,
-            sec_sigr,
-        )
-
-        X0 = self.X(
+        # Compute the two design matrices in a single pass
+        X, orbit = self._X(
             t,
             pri_r,
             pri_m,
@@ -2823,7 +3614,7 @@ class OpsSystem(object):
             pri_obl,
             pri_fproj,
             pri_u,
-            pri_f0,
+            [pri_f, pri_f0],
             sec_r,
             sec_m,
             sec_prot,
@@ -2838,17 +3629,24 @@ class OpsSystem(object):
             sec_inc,
             sec_obl,
             sec_u,
-            sec_f0,
+            [sec_f, sec_f0],
             sec_sigr,
         )
 
         # Get the indices of X corresponding to each body
-        pri_inds = np.arange(0, self.primary.map.Ny, dtype=int)
+        # for the velocity-weighted (`inds`) and the plain
+        # (`inds0`) design matrices, which are side by side
+        Ny = self.primary.map.Ny
+        pri_inds = np.arange(0, Ny, dtype=int)
+        pri_inds0 = np.arange(Ny, 2 * Ny, dtype=int)
         sec_inds = [None for sec in self.secondaries]
-        n = self.primary.map.Ny
+        sec_inds0 = [None for sec in self.secondaries]
+        n = 2 * Ny
         for i, sec in enumerate(self.secondaries):
-            sec_inds[i] = np.arange(n, n + sec.map.Ny, dtype=int)
-            n += sec.map.Ny
+            Ny = sec.map.Ny
+            sec_inds[i] = np.arange(n, n + Ny, dtype=int)
+            sec_inds0[i] = np.arange(n + Ny, n + 2 * Ny, dtype=int)
+            n += 2 * Ny
 
         # Compute the integral of the velocity-weighted intensity
         Iv = tt.as_tensor_variable(
@@ -2861,9 +3659,9 @@ class OpsSystem(object):
 
         # Compute the inverse of the integral of the intensity
         invI = tt.as_tensor_variable(
-            [tt.ones((1,)) / tt.dot(X0[:, pri_inds], pri_y)]
+            [tt.ones((1,)) / tt.dot(X[:, pri_inds0], pri_y)]
             + [
-                tt.ones((1,)) / tt.dot(X0[:, sec_inds[n]], sec_y[n])
+                tt.ones((1,)) / tt.dot(X[:, sec_inds0[n]], sec_y[n])
                 for n in range(len(self.secondaries))
             ]
         )
@@ -2872,32 +3670,17 @@ class OpsSystem(object):
         # The RV anomaly is just the product
         rv = Iv * invI
 
-        # Compute the Keplerian RV
-        orbit = exoplanet.orbits.KeplerianOrbit(
-            period=sec_porb,
-            t0=sec_t0,
-            incl=sec_iorb,
-            ecc=sec_ecc,
-            omega=sec_w,
-            Omega=sec_Omega,
-            m_planet=sec_m,
-            m_star=pri_m,
-            r_star=pri_r,
-        )
+        # Add the Keplerian RV
         return ifelse(
             keplerian,
             tt.inc_subtensor(
                 rv[1:],
-                tt.transpose(
-                    orbit.get_radial_velocity(
-                        t, output_units=units.m / units.s
-                    )
-                ),
+                tt.transpose(orbit.get_radial_velocity(t)),
             ),
             rv,
         )
 
-    @autocompile
+    @autocompile(downcast=True)
     def render(
         self,
         t,
@@ -2932,33 +3715,10 @@ class OpsSystem(object):
     ):
         """Render all of the bodies in the system."""
         # Compute the relative positions of all bodies
-        orbit = exoplanet.orbits.KeplerianOrbit(
-            period=sec_porb,
-            t0=sec_t0,
-            incl=sec_iorb,
-            ecc=sec_ecc,
-            omega=sec_w,
-            Omega=sec_Omega,
-            m_planet=sec_m,
-            m_star=pri_m,
-            r_star=pri_r,
+        orbit = self._get_orbit(
+            pri_m, sec_m, sec_t0, sec_porb, sec_ecc, sec_w, sec_Omega, sec_iorb
         )
-        try:
-            x, y, z = orbit.get_relative_position(
-                t, light_delay=self.light_delay
-            )
-        except TypeError:
-            if self.light_delay:
-                logger.warn(
-                    "This version of `exoplanet` does not model light delays."
-                )
-            x, y, z = orbit.get_relative_position(t)
-
-        # The shape of `x`, `y`, `z` in `exoplanet` is unreliable!
-        if x.ndim == 1:
-            x = tt.reshape(x, (-1, 1))
-            y = tt.reshape(y, (-1, 1))
-            z = tt.reshape(z, (-1, 1))
+        x, y, z = orbit.get_relative_position(t, light_delay=self.light_delay)
 
         # Get all rotational phases
         pri_prot = ifelse(
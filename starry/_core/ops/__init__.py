@@ -8,3 +8,5 @@ from .polybasis import *
 from .rotation import *
 from .spot import *
 from .indices import *
+from .kepler import *
+from .sttable import *
@@ -10,10 +10,15 @@ else:
     from ..._c_ops import STARRY_OREN_NAYAR_DEG
 
 
-__all__ = ["FOp", "OrenNayarOp"]
+__all__ = ["FOp", "FxOp", "OrenNayarOp"]
 
 
 class FOp(Op):
+    """
+    The polynomial filter operator, a sparse matrix in CSC format.
+
+    """
+
     def __init__(self, func, N, Ny):
         self.func = func
         self.N = N
@@ -22,7 +27,7 @@ class FOp(Op):
 
     def make_node(self, *inputs):
         inputs = [tt.as_tensor_variable(i) for i in inputs]
-        outputs = [tt.TensorType(inputs[-1].dtype, (False, False))()]
+        outputs = [ts.SparseType("csc", inputs[-1].dtype)()]
         return Apply(self, inputs, outputs)
 
     def infer_shape(self, *args):
@@ -44,6 +49,64 @@ class FGradientOp(Op):
     def __init__(self, base_op):
         self.base_op = base_op
 
+    def make_node(self, *inputs):
+        # NOTE: The gradient with respect to `F` may be sparse or dense
+        inputs = [tt.as_tensor_variable(i) for i in inputs[:-1]] + [
+            ts.as_sparse_or_tensor_variable(inputs[-1])
+        ]
+        outputs = [i.type() for i in inputs[:-1]]
+        return Apply(self, inputs, outputs)
+
+    def infer_shape(self, *args):
+        shapes = args[-1]
+        return shapes[:-1]
+
+    def perform(self, node, inputs, outputs):
+        u, f, bF = inputs
+        if hasattr(bF, "toarray"):
+            bF = bF.toarray()
+        bu, bf = self.base_op.func(u, f, bF)
+        outputs[0][0] = np.reshape(bu, np.shape(inputs[0]))
+        outputs[1][0] = np.reshape(bf, np.shape(inputs[1]))
+
+
+class FxOp(Op):
+    """
+    The filter operator applied to a batch of polynomials: column `k` of
+    the output is ``F(u, f[:, k]) . x[:, k]``.
+
+    """
+
+    def __init__(self, func, N):
+        self.func = func
+        self.N = N
+        self._grad_op = FxGradientOp(self)
+
+    def make_node(self, *inputs):
+        inputs = [tt.as_tensor_variable(i) for i in inputs]
+        outputs = [tt.TensorType(inputs[-1].dtype, (False, False))()]
+        return Apply(self, inputs, outputs)
+
+    def infer_shape(self, *args):
+        shapes = args[-1]
+        return [(self.N, shapes[-1][1])]
+
+    def R_op(self, inputs, eval_points):
+        if eval_points[0] is None:
+            return eval_points
+        return self.grad(inputs, eval_points)
+
+    def perform(self, node, inputs, outputs):
+        outputs[0][0] = self.func(*inputs)
+
+    def grad(self, inputs, gradients):
+        return self._grad_op(*(inputs + gradients))
+
+
+class FxGradientOp(Op):
+    def __init__(self, base_op):
+        self.base_op = base_op
+
     def make_node(self, *inputs):
         inputs = [tt.as_tensor_variable(i) for i in inputs]
         outputs = [i.type() for i in inputs[:-1]]
@@ -54,9 +117,10 @@ class FGradientOp(Op):
         return shapes[:-1]
 
     def perform(self, node, inputs, outputs):
-        bu, bf = self.base_op.func(*inputs)
+        bu, bf, bx = self.base_op.func(*inputs)
         outputs[0][0] = np.reshape(bu, np.shape(inputs[0]))
         outputs[1][0] = np.reshape(bf, np.shape(inputs[1]))
+        outputs[2][0] = np.reshape(bx, np.shape(inputs[2]))
 
 
 class OrenNayarOp(Op):
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 from ...compat import Apply, Op, tt, floatX
+from ..utils import DesignMatrixCache
+from .sttable import get_sT_table
 import numpy as np
 
 
@@ -7,11 +9,48 @@ __all__ = ["sTOp", "rTReflectedOp", "sTReflectedOp", "sTOblateOp"]
 
 
 class sTOp(Op):
-    def __init__(self, func, N):
+    """
+    The occultation solution vector in emitted light.
+
+    If ``grad_func``, a function returning the solution vectors and
+    their derivatives with respect to ``b`` and ``r``, is provided,
+    the solution may be tabulated for fixed values of the occultor
+    radius (see :py:meth:`add_table`), in which case it is evaluated by
+    interpolation whenever the radius matches one of the tables.
+
+    """
+
+    def __init__(self, func, N, grad_func=None):
         self.func = func
+        self.grad_func = grad_func
         self.N = N
+        self.tables = {}
         self._grad_op = sTGradientOp(self)
 
+    def add_table(self, r, **kwargs):
+        """
+        Tabulate the solution at occultor radius ``r``. Keyword arguments
+        are passed to :py:class:`sTTable`.
+
+        """
+        assert self.grad_func is not None, "Tables are not supported."
+        self.tables[float(r)] = get_sT_table(
+            self.grad_func, self.N, r, **kwargs
+        )
+        DesignMatrixCache.invalidate()
+
+    def clear_tables(self):
+        """Remove all tables."""
+        self.tables = {}
+        DesignMatrixCache.invalidate()
+
+    def get_table(self, r):
+        """Return the table for radius ``r`` or None if there isn't one."""
+        if len(self.tables):
+            return self.tables.get(float(r), None)
+        else:
+            return None
+
     def make_node(self, *inputs):
         inputs = [tt.as_tensor_variable(i) for i in inputs]
         outputs = [tt.TensorType(inputs[-1].dtype, (False, False))()]
@@ -27,7 +66,14 @@ class sTOp(Op):
         return self.grad(inputs, eval_points)
 
     def perform(self, node, inputs, outputs):
-        outputs[0][0] = self.func(*inputs)
+        b, r = inputs
+        table = self.get_table(r)
+        if table is None:
+            outputs[0][0] = self.func(b, r)
+        else:
+            outputs[0][0] = np.reshape(
+                table.evaluate(b, self.grad_func), (-1, self.N)
+            )
 
     def grad(self, inputs, gradients):
         return self._grad_op(*(inputs + gradients))
@@ -47,7 +93,16 @@ class sTGradientOp(Op):
         return shapes[:-1]
 
     def perform(self, node, inputs, outputs):
-        bb, br = self.base_op.func(*inputs)
+        b, r, bsT = inputs
+        table = self.base_op.get_table(r)
+        if table is None:
+            bb, br = self.base_op.func(b, r, bsT)
+        else:
+            _, dsTdb, dsTdr = table.evaluate(
+                b, self.base_op.grad_func, gradient=True
+            )
+            bb = np.sum(dsTdb * bsT, axis=-1)
+            br = np.sum(dsTdr * bsT)
         outputs[0][0] = np.reshape(bb, np.shape(inputs[0]))
         outputs[1][0] = np.reshape(br, np.shape(inputs[1]))
 
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from ...compat import Apply, Op, theano, tt
+from collections import OrderedDict
+import numpy as np
+import hashlib
+import threading
+
+__all__ = ["KeplerOp"]
+
+
+class KeplerOp(Op):
+    """
+    Solve Kepler's equation for a matrix of mean anomalies `M` with one
+    column per orbit and return the sine and cosine of the true anomaly.
+
+    Since the design matrix of a system is usually re-evaluated many
+    times for the same orbit (e.g., when only the map coefficients
+    change), the most recent solutions are cached, keyed on the mean
+    anomalies and eccentricities. The cache is shared by all threads
+    evaluating the op and is guarded by a lock.
+
+    """
+
+    def __init__(self, func, cache_size=8):
+        self.func = func
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_cache"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def make_node(self, M, ecc):
+        inputs = [tt.as_tensor_variable(M), tt.as_tensor_variable(ecc)]
+        outputs = [inputs[0].type(), inputs[0].type()]
+        return Apply(self, inputs, outputs)
+
+    def infer_shape(self, *args):
+        shapes = args[-1]
+        return shapes[0], shapes[0]
+
+    def perform(self, node, inputs, outputs):
+        M = np.ascontiguousarray(inputs[0], dtype=np.float64)
+        ecc = np.ascontiguousarray(inputs[1], dtype=np.float64)
+        key = (
+            M.shape,
+            hashlib.sha1(M).hexdigest(),
+            hashlib.sha1(ecc).hexdigest(),
+        )
+        with self._lock:
+            result = self._cache.get(key, None)
+            if result is not None:
+                self._cache.move_to_end(key)
+        if result is None:
+            result = self.func(M, ecc)
+            with self._lock:
+                self._cache[key] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        dtype = node.outputs[0].dtype
+        outputs[0][0] = np.array(result[0], dtype=dtype)
+        outputs[1][0] = np.array(result[1], dtype=dtype)
+
+    def grad(self, inputs, gradients):
+        M, ecc = inputs
+        sinf, cosf = self(*inputs)
+        bsinf, bcosf = gradients
+
+        # Derivative of the true anomaly
+        bf = tt.zeros_like(M)
+        if not isinstance(bsinf.type, theano.gradient.DisconnectedType):
+            bf += bsinf * cosf
+        if not isinstance(bcosf.type, theano.gradient.DisconnectedType):
+            bf -= bcosf * sinf
+
+        # Chain rule
+        e2 = ecc ** 2
+        ecosf = ecc * cosf
+        dfdM = (1 + ecosf) ** 2 / (1 - e2) ** 1.5
+        dfde = (2 + ecosf) * sinf / (1 - e2)
+        return bf * dfdM, tt.sum(bf * dfde, axis=0)
+
+    def R_op(self, inputs, eval_points):
+        if eval_points[0] is None:
+            return eval_points
+        return self.grad(inputs, eval_points)
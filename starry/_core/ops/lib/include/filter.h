@@ -36,10 +36,13 @@ protected:
                polynomial */
 
 public:
-  Matrix<Scalar>
-      F; /**< The filter operator in the polynomial basis. TODO: Make sparse? */
+  Eigen::SparseMatrix<Scalar>
+      F; /**< The (sparse) filter operator in the polynomial basis */
   Vector<Scalar> bu;
   Vector<Scalar> bf;
+  Matrix<Scalar> Fx;  /**< The filter applied to a batch of polynomials */
+  Matrix<Scalar> bfx; /**< Gradient of `Fx` w/ respect to the filters */
+  Matrix<Scalar> bx;  /**< Gradient of `Fx` w/ respect to the polynomials */
 
   // Constructor: compute the matrices
   explicit Filter(basis::Basis<Scalar> &B)
@@ -54,28 +57,35 @@ public:
   /**
   Compute the polynomial product matrix.
 
+  Each column has at most three nonzero entries per term in `p`, so we
+  assemble the matrix directly in sparse (CSC) form.
+
   */
   inline void computePolynomialProductMatrix(const int plmax,
                                              const Vector<Scalar> &p,
-                                             Matrix<Scalar> &M) {
+                                             Eigen::SparseMatrix<Scalar> &M) {
     bool odd1;
     int l, n;
     int n1 = 0, n2 = 0;
-    M.setZero((plmax + ydeg + 1) * (plmax + ydeg + 1), Ny);
+    const int Np = (plmax + 1) * (plmax + 1);
+    std::vector<Eigen::Triplet<Scalar>> triplets;
+    triplets.reserve(3 * Np * Ny);
     for (int l1 = 0; l1 < ydeg + 1; ++l1) {
       for (int m1 = -l1; m1 < l1 + 1; ++m1) {
         odd1 = (l1 + m1) % 2 == 0 ? false : true;
         n2 = 0;
         for (int l2 = 0; l2 < plmax + 1; ++l2) {
           for (int m2 = -l2; m2 < l2 + 1; ++m2) {
-            l = l1 + l2;
-            n = l * l + l + m1 + m2;
-            if (odd1 && ((l2 + m2) % 2 != 0)) {
-              M(n - 4 * l + 2, n1) += p(n2);
-              M(n - 2, n1) -= p(n2);
-              M(n + 2, n1) -= p(n2);
-            } else {
-              M(n, n1) += p(n2);
+            if (p(n2) != 0) {
+              l = l1 + l2;
+              n = l * l + l + m1 + m2;
+              if (odd1 && ((l2 + m2) % 2 != 0)) {
+                triplets.emplace_back(n - 4 * l + 2, n1, p(n2));
+                triplets.emplace_back(n - 2, n1, -p(n2));
+                triplets.emplace_back(n + 2, n1, -p(n2));
+              } else {
+                triplets.emplace_back(n, n1, p(n2));
+              }
             }
             ++n2;
           }
@@ -83,6 +93,9 @@ public:
         ++n1;
       }
     }
+    M.resize((plmax + ydeg + 1) * (plmax + ydeg + 1), Ny);
+    M.setFromTriplets(triplets.begin(), triplets.end());
+    M.prune(Scalar(0.0));
   }
 
   /**
@@ -133,9 +146,7 @@ public:
     bool odd1;
     int l, n;
     int n1 = 0, n2 = 0;
-    Vector<Matrix<Scalar>> DFDp_dense(Nuf);
-    for (n = 0; n < Nuf; ++n)
-      DFDp_dense(n).setZero(N, Ny);
+    std::vector<std::vector<Eigen::Triplet<Scalar>>> triplets(Nuf);
     for (int l1 = 0; l1 < ydeg + 1; ++l1) {
       for (int m1 = -l1; m1 < l1 + 1; ++m1) {
         odd1 = (l1 + m1) % 2 == 0 ? false : true;
@@ -145,11 +156,11 @@ public:
             l = l1 + l2;
             n = l * l + l + m1 + m2;
             if (odd1 && ((l2 + m2) % 2 != 0)) {
-              DFDp_dense[n2](n - 4 * l + 2, n1) += 1;
-              DFDp_dense[n2](n - 2, n1) -= 1;
-              DFDp_dense[n2](n + 2, n1) -= 1;
+              triplets[n2].emplace_back(n - 4 * l + 2, n1, 1);
+              triplets[n2].emplace_back(n - 2, n1, -1);
+              triplets[n2].emplace_back(n + 2, n1, -1);
             } else {
-              DFDp_dense[n2](n, n1) += 1;
+              triplets[n2].emplace_back(n, n1, 1);
             }
             ++n2;
           }
@@ -157,8 +168,11 @@ public:
         ++n1;
       }
     }
-    for (n = 0; n < Nuf; ++n)
-      DFDp(n) = DFDp_dense(n).sparseView();
+    for (n = 0; n < Nuf; ++n) {
+      DFDp(n).resize(N, Ny);
+      DFDp(n).setFromTriplets(triplets[n].begin(), triplets[n].end());
+      DFDp(n).prune(Scalar(0.0));
+    }
   }
 
   /**
@@ -257,8 +271,15 @@ public:
 
     // Backprop p
     RowVector<Scalar> bp(Nuf);
-    for (int j = 0; j < Nuf; ++j)
-      bp(j) = DFDp(j).cwiseProduct(bF).sum();
+    for (int j = 0; j < Nuf; ++j) {
+      bp(j) = 0;
+      for (int k = 0; k < DFDp(j).outerSize(); ++k) {
+        for (typename Eigen::SparseMatrix<Scalar>::InnerIterator it(DFDp(j),
+                                                                    k);
+             it; ++it)
+          bp(j) += it.value() * bF(it.row(), it.col());
+      }
+    }
 
     // Compute the limb darkening derivatives
     Matrix<Scalar> DpuDu =
@@ -269,6 +290,132 @@ public:
     // Compute the Ylm filter derivatives
     bf = bp * DpDpf * B.A1_f;
   }
+
+  /**
+  Backpropagate the gradient `bp1p2` of a polynomial product
+  `p1p2 = p1 * p2` (see `computePolynomialProduct`) onto the factors,
+  accumulating the result into `bp1` and `bp2`.
+
+  */
+  inline void computePolynomialProductRev(const int lmax1,
+                                          const Vector<Scalar> &p1,
+                                          const int lmax2,
+                                          const Vector<Scalar> &p2,
+                                          const Vector<Scalar> &bp1p2,
+                                          Vector<Scalar> &bp1,
+                                          Vector<Scalar> &bp2) {
+    int n1, n2, l1, m1, l2, m2, l, n;
+    bool odd1;
+    Scalar g;
+    n1 = 0;
+    for (l1 = 0; l1 < lmax1 + 1; ++l1) {
+      for (m1 = -l1; m1 < l1 + 1; ++m1) {
+        odd1 = (l1 + m1) % 2 == 0 ? false : true;
+        n2 = 0;
+        for (l2 = 0; l2 < lmax2 + 1; ++l2) {
+          for (m2 = -l2; m2 < l2 + 1; ++m2) {
+            l = l1 + l2;
+            n = l * l + l + m1 + m2;
+            if (odd1 && ((l2 + m2) % 2 != 0)) {
+              g = bp1p2(n - 4 * l + 2) - bp1p2(n - 2) - bp1p2(n + 2);
+            } else {
+              g = bp1p2(n);
+            }
+            bp1(n1) += g * p2(n2);
+            bp2(n2) += g * p1(n1);
+            ++n2;
+          }
+        }
+        ++n1;
+      }
+    }
+  }
+
+  /**
+  Apply the filter to a batch of polynomials: column `k` of the result
+  is `F(u, f.col(k)) * x.col(k)`. Since `F` is a polynomial product
+  matrix, this is just a polynomial product, so we never form the
+  filter operators themselves.
+
+  */
+  void computeFx(const Vector<Scalar> &u, const Matrix<Scalar> &f,
+                 const Matrix<Scalar> &x) {
+#ifndef STARRY_NO_EXCEPTIONS
+    if ((f.rows() != Nf) || (x.rows() != Ny) || (f.cols() != x.cols()))
+      throw std::invalid_argument(
+          "Arguments `f` and `x` have the wrong shape.");
+#endif
+
+    // Compute the limb darkening polynomial
+    Vector<Scalar> tmp = B.U1 * u;
+    Scalar norm =
+        Scalar(1.0) / B.rT.segment(0, (udeg + 1) * (udeg + 1)).dot(tmp);
+    Vector<Scalar> pu = tmp * norm * pi<Scalar>();
+
+    // Apply the filters
+    Vector<Scalar> pf, p, Fxk;
+    Fx.resize(N, x.cols());
+    for (int k = 0; k < x.cols(); ++k) {
+      pf = B.A1_f * f.col(k);
+      if (udeg > fdeg) {
+        computePolynomialProduct(udeg, pu, fdeg, pf, p);
+      } else {
+        computePolynomialProduct(fdeg, pf, udeg, pu, p);
+      }
+      computePolynomialProduct(ydeg, x.col(k), udeg + fdeg, p, Fxk);
+      Fx.col(k) = Fxk;
+    }
+  }
+
+  /**
+  Compute the gradient of the filter applied to a batch of polynomials.
+
+  */
+  void computeFx(const Vector<Scalar> &u, const Matrix<Scalar> &f,
+                 const Matrix<Scalar> &x, const Matrix<Scalar> &bFx) {
+#ifndef STARRY_NO_EXCEPTIONS
+    if ((f.rows() != Nf) || (x.rows() != Ny) || (f.cols() != x.cols()) ||
+        (bFx.rows() != N) || (bFx.cols() != x.cols()))
+      throw std::invalid_argument(
+          "Arguments `f`, `x` and `bFx` have the wrong shape.");
+#endif
+    Matrix<Scalar> DpDpu;
+    Matrix<Scalar> DpDpf;
+
+    // Compute the limb darkening polynomial
+    Vector<Scalar> tmp = B.U1 * u;
+    Scalar norm =
+        Scalar(1.0) / B.rT.segment(0, (udeg + 1) * (udeg + 1)).dot(tmp);
+    Vector<Scalar> pu = tmp * norm * pi<Scalar>();
+    Matrix<Scalar> DpuDu =
+        pi<Scalar>() * norm * B.U1 -
+        pu * B.rT.segment(0, (udeg + 1) * (udeg + 1)) * B.U1 * norm;
+
+    // Backprop each filter
+    Vector<Scalar> pf, p, bxk, bp;
+    RowVector<Scalar> bpu;
+    bpu.setZero(pu.size());
+    bfx.resize(Nf, x.cols());
+    bx.resize(Ny, x.cols());
+    for (int k = 0; k < x.cols(); ++k) {
+      pf = B.A1_f * f.col(k);
+      if (udeg > fdeg) {
+        computePolynomialProduct(udeg, pu, fdeg, pf, DpDpu, DpDpf);
+        computePolynomialProduct(udeg, pu, fdeg, pf, p);
+      } else {
+        computePolynomialProduct(fdeg, pf, udeg, pu, DpDpf, DpDpu);
+        computePolynomialProduct(fdeg, pf, udeg, pu, p);
+      }
+      bxk.setZero(Ny);
+      bp.setZero(Nuf);
+      computePolynomialProductRev(ydeg, x.col(k), udeg + fdeg, p,
+                                  bFx.col(k), bxk, bp);
+      bx.col(k) = bxk;
+      bfx.col(k) = (bp.transpose() * DpDpf * B.A1_f).transpose();
+      bpu += bp.transpose() * DpDpu;
+    }
+    bu = bpu * DpuDu;
+  }
 };
 
 } // namespace filter
@@ -11,6 +11,8 @@
 
 // Includes
 #include "basis.h"
+#include "kepler.h"
+#include "limbdark.h"
 #include "ops.h"
 #include "reflected/scatter.h"
 #include "sturm.h"
@@ -54,9 +56,8 @@ PYBIND11_MODULE(_c_ops, m) {
         if (t.size() != 3)
           throw std::runtime_error("Invalid state!");
 #endif
-        starry::Ops<Scalar> ops(t[0].cast<int>(), t[1].cast<int>(),
-                                t[2].cast<int>());
-        return ops;
+        return new starry::Ops<Scalar>(t[0].cast<int>(), t[1].cast<int>(),
+                                       t[2].cast<int>());
       }));
 
   // Map dimensions
@@ -80,28 +81,78 @@ PYBIND11_MODULE(_c_ops, m) {
   // Occultation solution in emitted light
   Ops.def("sT", [](starry::Ops<Scalar> &ops, const Vector<double> &b,
                    const double &r) {
+    py::gil_scoped_release release;
     size_t npts = size_t(b.size());
     Matrix<double, RowMajor> sT(npts, ops.N);
+    auto G = ops.greens();
     for (size_t n = 0; n < npts; ++n) {
-      ops.G.compute(static_cast<Scalar>(b(n)), static_cast<Scalar>(r));
-      sT.row(n) = ops.G.sT.template cast<double>();
+      G->compute(static_cast<Scalar>(b(n)), static_cast<Scalar>(r));
+      sT.row(n) = G->sT.template cast<double>();
     }
     return sT;
   });
 
+  // Error tolerance above which occultations are computed in extended
+  // precision
+  Ops.def_property(
+      "sT_tol",
+      [](starry::Ops<Scalar> &ops) { return static_cast<double>(ops.sT_tol); },
+      [](starry::Ops<Scalar> &ops, const double &tol) {
+        ops.sT_tol = static_cast<Scalar>(tol);
+      });
+
+  // Points at which the occultation solution is computed in extended
+  // precision
+  Ops.def("sT_extended", [](starry::Ops<Scalar> &ops, const Vector<double> &b,
+                            const double &r) {
+    size_t npts = size_t(b.size());
+    Vector<bool> extended(npts);
+    auto G = ops.greens();
+    for (size_t n = 0; n < npts; ++n) {
+      extended(n) =
+          G->extended(static_cast<Scalar>(b(n)), static_cast<Scalar>(r));
+    }
+    return extended;
+  });
+
+  // Occultation solution in emitted light and its derivatives
+  Ops.def("sTGrad", [](starry::Ops<Scalar> &ops, const Vector<double> &b,
+                       const double &r) {
+    size_t npts = size_t(b.size());
+    Matrix<double, RowMajor> sT(npts, ops.N);
+    Matrix<double, RowMajor> dsTdb(npts, ops.N);
+    Matrix<double, RowMajor> dsTdr(npts, ops.N);
+    {
+      py::gil_scoped_release release;
+      auto G = ops.greens();
+      for (size_t n = 0; n < npts; ++n) {
+        G->template compute<true>(static_cast<Scalar>(b(n)),
+                                  static_cast<Scalar>(r));
+        sT.row(n) = G->sT.template cast<double>();
+        dsTdb.row(n) = G->dsTdb.template cast<double>();
+        dsTdr.row(n) = G->dsTdr.template cast<double>();
+      }
+    }
+    return py::make_tuple(sT, dsTdb, dsTdr);
+  });
+
   // Gradient of occultation solution in emitted light
   Ops.def("sT", [](starry::Ops<Scalar> &ops, const Vector<double> &b,
                    const double &r, const Matrix<double, RowMajor> &bsT) {
     size_t npts = size_t(b.size());
     Vector<double> bb(npts);
     double br = 0.0;
-    for (size_t n = 0; n < npts; ++n) {
-      ops.G.template compute<true>(static_cast<Scalar>(b(n)),
-                                   static_cast<Scalar>(r));
-      bb(n) = static_cast<double>(
-          ops.G.dsTdb.dot(bsT.row(n).template cast<Scalar>()));
-      br += static_cast<double>(
-          ops.G.dsTdr.dot(bsT.row(n).template cast<Scalar>()));
+    {
+      py::gil_scoped_release release;
+      auto G = ops.greens();
+      for (size_t n = 0; n < npts; ++n) {
+        G->template compute<true>(static_cast<Scalar>(b(n)),
+                                  static_cast<Scalar>(r));
+        bb(n) = static_cast<double>(
+            G->dsTdb.dot(bsT.row(n).template cast<Scalar>()));
+        br += static_cast<double>(
+            G->dsTdr.dot(bsT.row(n).template cast<Scalar>()));
+      }
     }
     return py::make_tuple(bb, br);
   });
@@ -175,26 +226,31 @@ PYBIND11_MODULE(_c_ops, m) {
     Matrix<double> ddb(K, ops.N);
     Matrix<double> ddsigr(K, ops.N);
 
-    // Loop through the timeseries
-    for (int k = 0; k < K; ++k) {
-
-      // Hack: deriv undefined for b = +/- 1 (not a numerical issue)
-      if (b_(k) >= 1.0 - 1e-15) {
-        b.value() = Scalar(1.0) - Scalar(1e-15);
-      } else if (b_(k) <= -1.0 + 1e-15) {
-        b.value() = Scalar(-1.0) + Scalar(1e-15);
-      } else {
-        b.value() = static_cast<Scalar>(b_(k));
-      }
-
-      // Compute rT for this timestep
-      ops.RP.compute(b, sigr);
-
-      // Process the ADScalar
-      for (int n = 0; n < ops.N; ++n) {
-        result(k, n) = static_cast<double>(ops.RP.rT(n).value());
-        ddb(k, n) = static_cast<double>(ops.RP.rT(n).derivatives()(0));
-        ddsigr(k, n) = static_cast<double>(ops.RP.rT(n).derivatives()(1));
+    {
+      py::gil_scoped_release release;
+      auto RP = ops.RP.acquire();
+
+      // Loop through the timeseries
+      for (int k = 0; k < K; ++k) {
+
+        // Hack: deriv undefined for b = +/- 1 (not a numerical issue)
+        if (b_(k) >= 1.0 - 1e-15) {
+          b.value() = Scalar(1.0) - Scalar(1e-15);
+        } else if (b_(k) <= -1.0 + 1e-15) {
+          b.value() = Scalar(-1.0) + Scalar(1e-15);
+        } else {
+          b.value() = static_cast<Scalar>(b_(k));
+        }
+
+        // Compute rT for this timestep
+        RP->compute(b, sigr);
+
+        // Process the ADScalar
+        for (int n = 0; n < ops.N; ++n) {
+          result(k, n) = static_cast<double>(RP->rT(n).value());
+          ddb(k, n) = static_cast<double>(RP->rT(n).derivatives()(0));
+          ddsigr(k, n) = static_cast<double>(RP->rT(n).derivatives()(1));
+        }
       }
     }
 
@@ -230,32 +286,37 @@ PYBIND11_MODULE(_c_ops, m) {
     Matrix<double> ddro(K, ops.N);
     Matrix<double> ddsigr(K, ops.N);
 
-    // Loop through the timeseries
-    for (int k = 0; k < K; ++k) {
-
-      // Hack: deriv undefined for b = +/- 1 (not a numerical issue)
-      if (b_(k) >= 1.0 - 1e-15) {
-        b.value() = Scalar(1.0) - Scalar(1e-15);
-      } else if (b_(k) <= -1.0 + 1e-15) {
-        b.value() = Scalar(-1.0) + Scalar(1e-15);
-      } else {
-        b.value() = static_cast<Scalar>(b_(k));
-      }
-
-      theta.value() = static_cast<Scalar>(theta_(k));
-      bo.value() = static_cast<Scalar>(bo_(k));
-
-      // Compute sT for this timestep
-      ops.RO.compute(b, theta, bo, ro, sigr);
-
-      // Process the ADScalar
-      for (int n = 0; n < ops.N; ++n) {
-        result(k, n) = static_cast<double>(ops.RO.sT(n).value());
-        ddb(k, n) = static_cast<double>(ops.RO.sT(n).derivatives()(0));
-        ddtheta(k, n) = static_cast<double>(ops.RO.sT(n).derivatives()(1));
-        ddbo(k, n) = static_cast<double>(ops.RO.sT(n).derivatives()(2));
-        ddro(k, n) = static_cast<double>(ops.RO.sT(n).derivatives()(3));
-        ddsigr(k, n) = static_cast<double>(ops.RO.sT(n).derivatives()(4));
+    {
+      py::gil_scoped_release release;
+      auto RO = ops.RO.acquire();
+
+      // Loop through the timeseries
+      for (int k = 0; k < K; ++k) {
+
+        // Hack: deriv undefined for b = +/- 1 (not a numerical issue)
+        if (b_(k) >= 1.0 - 1e-15) {
+          b.value() = Scalar(1.0) - Scalar(1e-15);
+        } else if (b_(k) <= -1.0 + 1e-15) {
+          b.value() = Scalar(-1.0) + Scalar(1e-15);
+        } else {
+          b.value() = static_cast<Scalar>(b_(k));
+        }
+
+        theta.value() = static_cast<Scalar>(theta_(k));
+        bo.value() = static_cast<Scalar>(bo_(k));
+
+        // Compute sT for this timestep
+        RO->compute(b, theta, bo, ro, sigr);
+
+        // Process the ADScalar
+        for (int n = 0; n < ops.N; ++n) {
+          result(k, n) = static_cast<double>(RO->sT(n).value());
+          ddb(k, n) = static_cast<double>(RO->sT(n).derivatives()(0));
+          ddtheta(k, n) = static_cast<double>(RO->sT(n).derivatives()(1));
+          ddbo(k, n) = static_cast<double>(RO->sT(n).derivatives()(2));
+          ddro(k, n) = static_cast<double>(RO->sT(n).derivatives()(3));
+          ddsigr(k, n) = static_cast<double>(RO->sT(n).derivatives()(4));
+        }
       }
     }
 
@@ -278,17 +339,22 @@ PYBIND11_MODULE(_c_ops, m) {
     // The output
     Matrix<double> result(K, ops.N);
 
-    // Loop through the timeseries
-    for (int k = 0; k < K; ++k) {
+    {
+      py::gil_scoped_release release;
+      auto OBL = ops.OBL.acquire();
+
+      // Loop through the timeseries
+      for (int k = 0; k < K; ++k) {
 
-      // Compute sT for this timestep
-      theta.value() = static_cast<Scalar>(theta_(k));
-      bo.value() = static_cast<Scalar>(bo_(k));
-      ops.OBL.compute(bo, ro, f, theta);
+        // Compute sT for this timestep
+        theta.value() = static_cast<Scalar>(theta_(k));
+        bo.value() = static_cast<Scalar>(bo_(k));
+        OBL->compute(bo, ro, f, theta);
 
-      // Process the ADScalar
-      for (int n = 0; n < ops.N; ++n) {
-        result(k, n) = static_cast<double>(ops.OBL.sT(n).value());
+        // Process the ADScalar
+        for (int n = 0; n < ops.N; ++n) {
+          result(k, n) = static_cast<double>(OBL->sT(n).value());
+        }
       }
     }
     return result;
@@ -317,20 +383,25 @@ PYBIND11_MODULE(_c_ops, m) {
     Matrix<double> ddbo(K, ops.N);
     Matrix<double> ddro(K, ops.N);
 
-    // Loop through the timeseries
-    for (int k = 0; k < K; ++k) {
-
-      // Compute sT for this timestep
-      theta.value() = static_cast<Scalar>(theta_(k));
-      bo.value() = static_cast<Scalar>(bo_(k));
-      ops.OBLAD.compute(bo, ro, f, theta);
-
-      // Process the ADScalar
-      for (int n = 0; n < ops.N; ++n) {
-        ddf(k, n) = static_cast<double>(ops.OBLAD.sT(n).derivatives()(0));
-        ddtheta(k, n) = static_cast<double>(ops.OBLAD.sT(n).derivatives()(1));
-        ddbo(k, n) = static_cast<double>(ops.OBLAD.sT(n).derivatives()(2));
-        ddro(k, n) = static_cast<double>(ops.OBLAD.sT(n).derivatives()(3));
+    {
+      py::gil_scoped_release release;
+      auto OBLAD = ops.OBLAD.acquire();
+
+      // Loop through the timeseries
+      for (int k = 0; k < K; ++k) {
+
+        // Compute sT for this timestep
+        theta.value() = static_cast<Scalar>(theta_(k));
+        bo.value() = static_cast<Scalar>(bo_(k));
+        OBLAD->compute(bo, ro, f, theta);
+
+        // Process the ADScalar
+        for (int n = 0; n < ops.N; ++n) {
+          ddf(k, n) = static_cast<double>(OBLAD->sT(n).derivatives()(0));
+          ddtheta(k, n) = static_cast<double>(OBLAD->sT(n).derivatives()(1));
+          ddbo(k, n) = static_cast<double>(OBLAD->sT(n).derivatives()(2));
+          ddro(k, n) = static_cast<double>(OBLAD->sT(n).derivatives()(3));
+        }
       }
     }
 
@@ -353,138 +424,220 @@ PYBIND11_MODULE(_c_ops, m) {
   Ops.def("pT", [](starry::Ops<Scalar> &ops, const int deg,
                    const RowVector<double> &x, const RowVector<double> &y,
                    const RowVector<double> &z) {
-    ops.B.computePolyBasis(deg, x.template cast<Scalar>(),
-                           y.template cast<Scalar>(),
-                           z.template cast<Scalar>());
-    return ops.B.pT.template cast<double>();
+    py::gil_scoped_release release;
+    return ops
+        .pT(deg, x.template cast<Scalar>(), y.template cast<Scalar>(),
+            z.template cast<Scalar>())
+        .template cast<double>()
+        .eval();
   });
 
   // Rotation dot product operator (vectors)
   Ops.def("dotR", [](starry::Ops<Scalar> &ops, const RowVector<double> &M,
                      const double &x, const double &y, const double &z,
                      const double &theta) {
-    ops.W.dotR(M.template cast<Scalar>(), static_cast<Scalar>(x),
-               static_cast<Scalar>(y), static_cast<Scalar>(z),
-               static_cast<Scalar>(theta));
-    return ops.W.dotR_result.template cast<double>();
+    py::gil_scoped_release release;
+    auto W = ops.W.acquire();
+    W->dotR(M.template cast<Scalar>(), static_cast<Scalar>(x),
+            static_cast<Scalar>(y), static_cast<Scalar>(z),
+            static_cast<Scalar>(theta));
+    return W->dotR_result.template cast<double>().eval();
   });
 
   // Rotation dot product operator (matrices)
   Ops.def("dotR",
           [](starry::Ops<Scalar> &ops, const Matrix<double> &M, const double &x,
              const double &y, const double &z, const double &theta) {
-            ops.W.dotR(M.template cast<Scalar>(), static_cast<Scalar>(x),
-                       static_cast<Scalar>(y), static_cast<Scalar>(z),
-                       static_cast<Scalar>(theta));
-            return ops.W.dotR_result.template cast<double>();
+            py::gil_scoped_release release;
+            auto W = ops.W.acquire();
+            W->dotR(M.template cast<Scalar>(), static_cast<Scalar>(x),
+                    static_cast<Scalar>(y), static_cast<Scalar>(z),
+                    static_cast<Scalar>(theta));
+            return W->dotR_result.template cast<double>().eval();
           });
 
   // Gradient of rotation dot product operator (vectors)
   Ops.def("dotR", [](starry::Ops<Scalar> &ops, const RowVector<double> &M,
                      const double &x, const double &y, const double &z,
                      const double &theta, const Matrix<double> &bMR) {
-    ops.W.dotR(M.template cast<Scalar>(), static_cast<Scalar>(x),
-               static_cast<Scalar>(y), static_cast<Scalar>(z),
-               static_cast<Scalar>(theta), bMR.template cast<Scalar>());
-    return py::make_tuple(ops.W.dotR_bM.template cast<double>(),
-                          static_cast<double>(ops.W.dotR_bx),
-                          static_cast<double>(ops.W.dotR_by),
-                          static_cast<double>(ops.W.dotR_bz),
-                          static_cast<double>(ops.W.dotR_btheta));
+    Matrix<double> bM;
+    double bx, by, bz, btheta;
+    {
+      py::gil_scoped_release release;
+      auto W = ops.W.acquire();
+      W->dotR(M.template cast<Scalar>(), static_cast<Scalar>(x),
+              static_cast<Scalar>(y), static_cast<Scalar>(z),
+              static_cast<Scalar>(theta), bMR.template cast<Scalar>());
+      bM = W->dotR_bM.template cast<double>();
+      bx = static_cast<double>(W->dotR_bx);
+      by = static_cast<double>(W->dotR_by);
+      bz = static_cast<double>(W->dotR_bz);
+      btheta = static_cast<double>(W->dotR_btheta);
+    }
+    return py::make_tuple(bM, bx, by, bz, btheta);
   });
 
   // Gradient of rotation dot product operator (matrices)
   Ops.def("dotR", [](starry::Ops<Scalar> &ops, const Matrix<double> &M,
                      const double &x, const double &y, const double &z,
                      const double &theta, const Matrix<double> &bMR) {
-    ops.W.dotR(M.template cast<Scalar>(), static_cast<Scalar>(x),
-               static_cast<Scalar>(y), static_cast<Scalar>(z),
-               static_cast<Scalar>(theta), bMR.template cast<Scalar>());
-    return py::make_tuple(ops.W.dotR_bM.template cast<double>(),
-                          static_cast<double>(ops.W.dotR_bx),
-                          static_cast<double>(ops.W.dotR_by),
-                          static_cast<double>(ops.W.dotR_bz),
-                          static_cast<double>(ops.W.dotR_btheta));
+    Matrix<double> bM;
+    double bx, by, bz, btheta;
+    {
+      py::gil_scoped_release release;
+      auto W = ops.W.acquire();
+      W->dotR(M.template cast<Scalar>(), static_cast<Scalar>(x),
+              static_cast<Scalar>(y), static_cast<Scalar>(z),
+              static_cast<Scalar>(theta), bMR.template cast<Scalar>());
+      bM = W->dotR_bM.template cast<double>();
+      bx = static_cast<double>(W->dotR_bx);
+      by = static_cast<double>(W->dotR_by);
+      bz = static_cast<double>(W->dotR_bz);
+      btheta = static_cast<double>(W->dotR_btheta);
+    }
+    return py::make_tuple(bM, bx, by, bz, btheta);
   });
 
   // Z rotation operator (vectors)
   Ops.def("tensordotRz", [](starry::Ops<Scalar> &ops,
                             const RowVector<double> &M,
                             const Vector<double> &theta) {
-    ops.W.tensordotRz(M.template cast<Scalar>(), theta.template cast<Scalar>());
-    return ops.W.tensordotRz_result.template cast<double>();
+    py::gil_scoped_release release;
+    auto W = ops.W.acquire();
+    W->tensordotRz(M.template cast<Scalar>(), theta.template cast<Scalar>());
+    return W->tensordotRz_result.template cast<double>().eval();
   });
 
   // Z rotation operator (matrices)
   Ops.def("tensordotRz", [](starry::Ops<Scalar> &ops, const Matrix<double> &M,
                             const Vector<double> &theta) {
-    ops.W.tensordotRz(M.template cast<Scalar>(), theta.template cast<Scalar>());
-    return ops.W.tensordotRz_result.template cast<double>();
+    py::gil_scoped_release release;
+    auto W = ops.W.acquire();
+    W->tensordotRz(M.template cast<Scalar>(), theta.template cast<Scalar>());
+    return W->tensordotRz_result.template cast<double>().eval();
   });
 
   // Gradient of Z rotation matrix (vectors)
-  Ops.def("tensordotRz", [](starry::Ops<Scalar> &ops,
-                            const RowVector<double> &M,
-                            const Vector<double> &theta,
-                            const Matrix<double> &bMRz) {
-    ops.W.tensordotRz(M.template cast<Scalar>(), theta.template cast<Scalar>(),
-                      bMRz.template cast<Scalar>());
-    return py::make_tuple(ops.W.tensordotRz_bM.template cast<double>(),
-                          ops.W.tensordotRz_btheta.template cast<double>());
-  });
+  Ops.def("tensordotRz",
+          [](starry::Ops<Scalar> &ops, const RowVector<double> &M,
+             const Vector<double> &theta, const Matrix<double> &bMRz) {
+            Matrix<double> bM;
+            Vector<double> btheta;
+            {
+              py::gil_scoped_release release;
+              auto W = ops.W.acquire();
+              W->tensordotRz(M.template cast<Scalar>(),
+                             theta.template cast<Scalar>(),
+                             bMRz.template cast<Scalar>());
+              bM = W->tensordotRz_bM.template cast<double>();
+              btheta = W->tensordotRz_btheta.template cast<double>();
+            }
+            return py::make_tuple(bM, btheta);
+          });
 
   // Gradient of Z rotation matrix (matrices)
   Ops.def("tensordotRz", [](starry::Ops<Scalar> &ops, const Matrix<double> &M,
                             const Vector<double> &theta,
                             const Matrix<double> &bMRz) {
-    ops.W.tensordotRz(M.template cast<Scalar>(), theta.template cast<Scalar>(),
-                      bMRz.template cast<Scalar>());
-    return py::make_tuple(ops.W.tensordotRz_bM.template cast<double>(),
-                          ops.W.tensordotRz_btheta.template cast<double>());
+    Matrix<double> bM;
+    Vector<double> btheta;
+    {
+      py::gil_scoped_release release;
+      auto W = ops.W.acquire();
+      W->tensordotRz(M.template cast<Scalar>(), theta.template cast<Scalar>(),
+                     bMRz.template cast<Scalar>());
+      bM = W->tensordotRz_bM.template cast<double>();
+      btheta = W->tensordotRz_btheta.template cast<double>();
+    }
+    return py::make_tuple(bM, btheta);
   });
 
-  // Filter operator
+  // Filter operator (sparse)
   Ops.def("F", [](starry::Ops<Scalar> &ops, const Vector<double> &u,
                   const Vector<double> &f) {
-    ops.F.computeF(u.template cast<Scalar>(), f.template cast<Scalar>());
-    return ops.F.F.template cast<double>();
+    py::gil_scoped_release release;
+    auto F = ops.F.acquire();
+    F->computeF(u.template cast<Scalar>(), f.template cast<Scalar>());
+    return Eigen::SparseMatrix<double>(F->F.template cast<double>());
   });
 
   // Gradient of filter operator
   Ops.def("F", [](starry::Ops<Scalar> &ops, const Vector<double> &u,
                   const Vector<double> &f, const Matrix<double> &bF) {
-    ops.F.computeF(u.template cast<Scalar>(), f.template cast<Scalar>(),
-                   bF.template cast<Scalar>());
-    return py::make_tuple(ops.F.bu.template cast<double>(),
-                          ops.F.bf.template cast<double>());
+    Vector<double> bu, bf;
+    {
+      py::gil_scoped_release release;
+      auto F = ops.F.acquire();
+      F->computeF(u.template cast<Scalar>(), f.template cast<Scalar>(),
+                  bF.template cast<Scalar>());
+      bu = F->bu.template cast<double>();
+      bf = F->bf.template cast<double>();
+    }
+    return py::make_tuple(bu, bf);
+  });
+
+  // Filter applied to a batch of polynomials
+  Ops.def("Fx", [](starry::Ops<Scalar> &ops, const Vector<double> &u,
+                   const Matrix<double> &f, const Matrix<double> &x) {
+    py::gil_scoped_release release;
+    auto F = ops.F.acquire();
+    F->computeFx(u.template cast<Scalar>(), f.template cast<Scalar>(),
+                 x.template cast<Scalar>());
+    return F->Fx.template cast<double>().eval();
+  });
+
+  // Gradient of the filter applied to a batch of polynomials
+  Ops.def("Fx", [](starry::Ops<Scalar> &ops, const Vector<double> &u,
+                   const Matrix<double> &f, const Matrix<double> &x,
+                   const Matrix<double> &bFx) {
+    Vector<double> bu;
+    Matrix<double> bfx, bx;
+    {
+      py::gil_scoped_release release;
+      auto F = ops.F.acquire();
+      F->computeFx(u.template cast<Scalar>(), f.template cast<Scalar>(),
+                   x.template cast<Scalar>(), bFx.template cast<Scalar>());
+      bu = F->bu.template cast<double>();
+      bfx = F->bfx.template cast<double>();
+      bx = F->bx.template cast<double>();
+    }
+    return py::make_tuple(bu, bfx, bx);
   });
 
   // Compute the Ylm expansion of a gaussian spot
   Ops.def("spotYlm", [](starry::Ops<Scalar> &ops, const RowVector<Scalar> &amp,
                         const Scalar &sigma, const Scalar &lat,
                         const Scalar &lon) {
+    py::gil_scoped_release release;
     return ops
         .spotYlm(amp.template cast<double>(), static_cast<Scalar>(sigma),
                  static_cast<Scalar>(lat), static_cast<Scalar>(lon))
-        .template cast<double>();
+        .template cast<double>()
+        .eval();
   });
 
   // Gradient of the Ylm expansion of a gaussian spot
   Ops.def("spotYlm", [](starry::Ops<Scalar> &ops, const RowVector<Scalar> &amp,
                         const Scalar &sigma, const Scalar &lat,
                         const Scalar &lon, const Matrix<double> &by) {
-    ops.spotYlm(amp.template cast<double>(), static_cast<Scalar>(sigma),
-                static_cast<Scalar>(lat), static_cast<Scalar>(lon),
-                by.template cast<Scalar>());
-    return py::make_tuple(
-        ops.bamp.template cast<double>(), static_cast<double>(ops.bsigma),
-        static_cast<double>(ops.blat), static_cast<double>(ops.blon));
+    RowVector<Scalar> bamp;
+    Scalar bsigma, blat, blon;
+    {
+      py::gil_scoped_release release;
+      ops.spotYlm(amp.template cast<double>(), static_cast<Scalar>(sigma),
+                  static_cast<Scalar>(lat), static_cast<Scalar>(lon),
+                  by.template cast<Scalar>(), bamp, bsigma, blat, blon);
+    }
+    return py::make_tuple(bamp.template cast<double>().eval(),
+                          static_cast<double>(bsigma),
+                          static_cast<double>(blat), static_cast<double>(blon));
   });
 
   // Oren-Nayar (1994) illumination polynomial (reflected light)
   Ops.def("OrenNayarPolynomial",
           [](starry::Ops<Scalar> &ops, const Vector<double> &b,
              const Vector<double> &theta, const double &sigr) {
+            py::gil_scoped_release release;
             int N = (STARRY_OREN_NAYAR_DEG + 1) * (STARRY_OREN_NAYAR_DEG + 1);
             Matrix<double> p(N, b.size());
             for (int i = 0; i < b.size(); ++i) {
@@ -508,6 +661,68 @@ PYBIND11_MODULE(_c_ops, m) {
                                                static_cast<Scalar>(b));
         });
 
+  // Limb darkening: Agol `c` coefficients from the `u` coefficients
+  m.def("get_cl", [](const Vector<double> &u) {
+    return starry::limbdark::get_cl(u.template cast<Scalar>())
+        .template cast<double>();
+  });
+
+  // Limb darkening: gradient of the Agol `c` coefficients
+  m.def("get_cl_rev", [](const Vector<double> &bc) {
+    return starry::limbdark::get_cl_rev(bc.template cast<Scalar>())
+        .template cast<double>();
+  });
+
+  // Limb darkening: occultation flux (Agol, Luger & Foreman-Mackey 2019)
+  py::class_<starry::limbdark::LimbDark<Scalar>> LimbDark(m, "LimbDark");
+  LimbDark.def(py::init<int>());
+  LimbDark.def_property_readonly(
+      "lmax", [](starry::limbdark::LimbDark<Scalar> &L) { return L.lmax; });
+  LimbDark.def(py::pickle(
+      [](const starry::limbdark::LimbDark<Scalar> &L) {
+        // __getstate__
+        return py::make_tuple(L.lmax);
+      },
+      [](py::tuple t) {
+        // __setstate__
+#ifndef STARRY_NO_EXCEPTIONS
+        if (t.size() != 1)
+          throw std::runtime_error("Invalid state!");
+#endif
+        return new starry::limbdark::LimbDark<Scalar>(t[0].cast<int>());
+      }));
+
+  // Vectorized flux and its gradients with respect to `cl`, `b`, and `r`
+  LimbDark.def("flux", [](starry::limbdark::LimbDark<Scalar> &L,
+                          const Vector<double> &cl, const Vector<double> &b,
+                          const Vector<double> &r, const Vector<double> &los) {
+    Vector<Scalar> f, dfdb, dfdr;
+    Matrix<Scalar, RowMajor> dfdcl;
+    {
+      py::gil_scoped_release release;
+      L.compute(cl.template cast<Scalar>(), b.template cast<Scalar>(),
+                r.template cast<Scalar>(), los.template cast<Scalar>(), f,
+                dfdcl, dfdb, dfdr);
+    }
+    return py::make_tuple(f.template cast<double>().eval(),
+                          dfdcl.template cast<double>().eval(),
+                          dfdb.template cast<double>().eval(),
+                          dfdr.template cast<double>().eval());
+  });
+
+  // Kepler solver: sine and cosine of the true anomaly
+  m.def("kepler", [](const Matrix<double, RowMajor> &M,
+                     const Vector<double> &ecc) {
+    Matrix<Scalar, RowMajor> sinf, cosf;
+    {
+      py::gil_scoped_release release;
+      starry::kepler::sinCosTrueAnomaly<Scalar>(
+          M.template cast<Scalar>(), ecc.template cast<Scalar>(), sinf, cosf);
+    }
+    return py::make_tuple(sinf.template cast<double>().eval(),
+                          cosf.template cast<double>().eval());
+  });
+
 #ifdef STARRY_UNIT_TESTS
 
   m.attr("STARRY_UNIT_TESTS") = py::bool_(1);
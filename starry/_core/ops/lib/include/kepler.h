@@ -0,0 +1,143 @@
+/**
+\file kepler.h
+\brief Batched solver for Kepler's equation.
+
+*/
+
+#ifndef _STARRY_KEPLER_H_
+#define _STARRY_KEPLER_H_
+
+#include "utils.h"
+#include <cmath>
+
+namespace starry {
+namespace kepler {
+
+using namespace utils;
+
+/**
+Wrap an angle into the interval `[0, 2 pi)`.
+
+*/
+template <typename T> inline T wrap(const T &M) {
+  T twopi = 2 * pi<T>();
+  T Mw = M - twopi * floor(M / twopi);
+  if (unlikely(Mw >= twopi))
+    Mw -= twopi;
+  return Mw;
+}
+
+/**
+A robust starting guess for the eccentric anomaly (Danby 1987)
+given a mean anomaly `M` in `[0, 2 pi)`.
+
+*/
+template <typename T> inline T starter(const T &M, const T &e) {
+  T E = M + T(0.85) * e * (M < pi<T>() ? 1 : -1);
+  return E;
+}
+
+/**
+Solve Kepler's equation `E - e sin(E) = M` for the eccentric anomaly
+`E` given a mean anomaly `M` in `[0, 2 pi)` and a starting guess `E`.
+
+We use Halley's method safeguarded by bisection on the bracket
+`[0, 2 pi]`, within which the equation has exactly one root.
+
+*/
+template <typename T> inline T solve(const T &M, const T &e, T E) {
+  const T tol = 4 * mach_eps<T>();
+  T lo = 0, hi = 2 * pi<T>();
+  T sinE, cosE, g, dg, dE;
+  if ((E < lo) || (E > hi))
+    E = starter(M, e);
+  for (int n = 0; n < STARRY_KEPLER_MAX_ITER; ++n) {
+    sinE = sin(E);
+    cosE = cos(E);
+    g = E - e * sinE - M;
+    if (g == 0)
+      break;
+    if (g < 0)
+      lo = E;
+    else
+      hi = E;
+    dg = 1 - e * cosE;
+    dE = -g / dg;
+    dE = -g / (dg + T(0.5) * dE * e * sinE);
+    if ((E + dE <= lo) || (E + dE >= hi)) {
+      // Bisect if Halley takes us out of the bracket
+      dE = T(0.5) * (lo + hi) - E;
+    }
+    E += dE;
+    if (abs(dE) <= tol * (1 + abs(E)))
+      break;
+  }
+  return E;
+}
+
+/**
+Compute the sine and cosine of the true anomaly for a batch of mean
+anomalies. Each column of `M` corresponds to one orbit with
+eccentricity `ecc(k)`; the rows are usually consecutive times, so the
+eccentric anomaly at each time is used to warm-start the solver at
+the next one.
+
+*/
+template <typename T>
+inline void sinCosTrueAnomaly(const Matrix<T, RowMajor> &M,
+                              const Vector<T> &ecc, Matrix<T, RowMajor> &sinf,
+                              Matrix<T, RowMajor> &cosf) {
+  const int nt = M.rows();
+  const int nk = M.cols();
+#ifndef STARRY_NO_EXCEPTIONS
+  if (ecc.size() != nk)
+    throw std::invalid_argument(
+        "Argument `ecc` must have one entry per column of `M`.");
+#endif
+  sinf.resize(nt, nk);
+  cosf.resize(nt, nk);
+  for (int k = 0; k < nk; ++k) {
+    const T e = ecc(k);
+    if (unlikely((e < 0) || (e >= 1))) {
+      sinf.col(k).setConstant(NAN);
+      cosf.col(k).setConstant(NAN);
+      continue;
+    }
+    const T sqrt1me2 = sqrt((1 - e) * (1 + e));
+    T Mprev = 0, E = -1, dM;
+    for (int i = 0; i < nt; ++i) {
+      T Mi = wrap(M(i, k));
+      if (unlikely(e == 0)) {
+        E = Mi;
+      } else {
+        // Warm start from the previous solution using a first order
+        // Taylor expansion, unless the step in `M` is large
+        if (i > 0) {
+          dM = Mi - Mprev;
+          if (dM > pi<T>())
+            dM -= 2 * pi<T>();
+          else if (dM < -pi<T>())
+            dM += 2 * pi<T>();
+          if (abs(dM) < T(0.5)) {
+            E = wrap(E + dM / (1 - e * cos(E)));
+          } else {
+            E = starter(Mi, e);
+          }
+        } else {
+          E = starter(Mi, e);
+        }
+        E = solve(Mi, e, E);
+      }
+      Mprev = Mi;
+      T sinE = sin(E), cosE = cos(E);
+      T denom = 1 / (1 - e * cosE);
+      cosf(i, k) = (cosE - e) * denom;
+      sinf(i, k) = sqrt1me2 * sinE * denom;
+    }
+  }
+}
+
+} // namespace kepler
+} // namespace starry
+
+#endif
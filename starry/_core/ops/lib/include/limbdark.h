@@ -228,9 +228,10 @@ inline void GreensLimbDark<T>::computeS1() {
         ellip::CEL(ksq, kc, T((b - r) * (b - r) * kcsq), T(0.0), T(1.0), T(1.0),
                    T(3 * kcsq * (b - r) * (b + r)), kcsq, T(0.0), Piofk, Eofk,
                    Em1mKdm);
-        Lambda1 = onembmr2 * (Piofk + (-3 + 6 * r2 + 2 * b * r) * Em1mKdm -
-                              fourbr * Eofk) *
-                  sqbrinv * third;
+        Lambda1 =
+            onembmr2 *
+            (Piofk + (-3 + 6 * r2 + 2 * b * r) * Em1mKdm - fourbr * Eofk) *
+            sqbrinv * third;
         if (GRADIENT) {
           dsTdb(1) = 2 * r * onembmr2 * (-Em1mKdm + 2 * Eofk) * sqbrinv * third;
           dsTdr(1) = -2 * r * onembmr2 * Em1mKdm * sqbrinv;
@@ -670,8 +671,9 @@ inline void GreensLimbDark<T>::compute(const T &b_, const T &r_) {
   if (GRADIENT) {
     // Compute ds/dr
     dsTdr.segment(3, lmax - 2) =
-        -2 * r * (n_.segment(5, lmax - 2).cwiseProduct(M.segment(3, lmax - 2)) -
-                  n_.segment(3, lmax - 2).cwiseProduct(M.segment(1, lmax - 2)));
+        -2 * r *
+        (n_.segment(5, lmax - 2).cwiseProduct(M.segment(3, lmax - 2)) -
+         n_.segment(3, lmax - 2).cwiseProduct(M.segment(1, lmax - 2)));
 
     if (b > STARRY_BCUT) {
       // Compute ds/db
@@ -698,6 +700,168 @@ inline void GreensLimbDark<T>::compute(const T &b_, const T &r_) {
   }
 }
 
+/**
+Sign function.
+
+*/
+template <typename T> inline int sgn(const T &val) {
+  return (T(0) < val) - (val < T(0));
+}
+
+/**
+Compute the Agol `c` coefficients from the limb darkening coefficients `u`.
+
+*/
+template <class T> inline Vector<T> get_cl(const Vector<T> &u) {
+  const int N = u.size();
+  Vector<T> c(N);
+  Vector<T> a(N);
+  a.setZero();
+  a(0) = 1;
+
+  // Compute the a_n coefficients
+  T bcoeff;
+  int sign;
+  for (int i = 1; i < N; ++i) {
+    bcoeff = 1;
+    sign = 1;
+    for (int j = 0; j <= i; ++j) {
+      a(j) -= u(i) * bcoeff * sign;
+      sign *= -1;
+      bcoeff *= (T(i - j) / (j + 1));
+    }
+  }
+
+  // Now, compute the c_n coefficients
+  for (int j = N - 1; j >= max(2, N - 2); --j) {
+    c(j) = a(j) / (j + 2);
+  }
+  for (int j = N - 3; j >= 2; --j) {
+    c(j) = a(j) / (j + 2) + c(j + 2);
+  }
+  if (N >= 4)
+    c(1) = a(1) + 3 * c(3);
+  else if (N >= 2)
+    c(1) = a(1);
+  if (N >= 3)
+    c(0) = a(0) + 2 * c(2);
+  else if (N >= 1)
+    c(0) = a(0);
+
+  return c;
+}
+
+/**
+Backpropagate the gradient `bc` of the `c` coefficients onto the
+limb darkening coefficients `u`.
+
+*/
+template <class T> inline Vector<T> get_cl_rev(const Vector<T> &bc_in) {
+  const int N = bc_in.size();
+  Vector<T> bc(bc_in);
+  Vector<T> ba(N);
+  Vector<T> bu(N);
+  bu.setZero();
+  if (N == 0)
+    return bu;
+
+  // c[0] = a(0) + 2 * c[2];
+  ba(0) = bc(0);
+  if (N >= 3)
+    bc(2) += 2 * bc(0);
+
+  // c[1] = a(1) + 3 * c[3];
+  if (N >= 2)
+    ba(1) = bc(1);
+  if (N >= 4)
+    bc(3) += 3 * bc(1);
+
+  for (int j = 2; j <= N - 3; ++j) {
+    // c[j] = a(j) / (j + 2) + c[j + 2];
+    ba(j) = bc(j) / (j + 2);
+    bc(j + 2) += bc(j);
+  }
+  for (int j = max(2, N - 2); j <= N - 1; ++j) {
+    // c[j] = a(j) / (j + 2);
+    ba(j) = bc(j) / (j + 2);
+  }
+
+  // Compute the a_n coefficients
+  T bcoeff;
+  int sign;
+  for (int i = 1; i < N; ++i) {
+    bcoeff = 1;
+    sign = 1;
+    for (int j = 0; j <= i; ++j) {
+      // a(j) -= u[i] * bcoeff * sign;
+      bu(i) -= ba(j) * bcoeff * sign;
+      sign *= -1;
+      bcoeff *= (T(i - j) / (j + 1));
+    }
+  }
+
+  return bu;
+}
+
+/**
+Vectorized limb-darkened occultation flux and its gradients.
+
+*/
+template <class T> class LimbDark {
+public:
+  const int lmax;
+
+  // The solvers, one per concurrent caller
+  ScratchPool<GreensLimbDark<T>> L;
+
+  explicit LimbDark(int lmax)
+      : lmax(lmax), L([lmax] { return new GreensLimbDark<T>(lmax); }) {}
+
+  /**
+  Compute the flux `f` and its gradients given the Agol `c` coefficients,
+  the impact parameters `b`, the radius ratios `r`, and the line-of-sight
+  positions `los` of the occultor. Points with `los <= 0` are not
+  occulted and have zero flux.
+
+  */
+  inline void compute(const Vector<T> &cl, const Vector<T> &b,
+                      const Vector<T> &r, const Vector<T> &los, Vector<T> &f,
+                      Matrix<T, RowMajor> &dfdcl, Vector<T> &dfdb,
+                      Vector<T> &dfdr) {
+    const size_t npts = size_t(b.size());
+#ifndef STARRY_NO_EXCEPTIONS
+    if (cl.size() != lmax + 1)
+      throw std::invalid_argument(
+          "Vector `cl` has the wrong number of coefficients.");
+    if ((size_t(r.size()) != npts) || (size_t(los.size()) != npts))
+      throw std::invalid_argument(
+          "Vectors `b`, `r`, and `los` must have the same size.");
+#endif
+    auto L_ = L.acquire();
+    f.setZero(npts);
+    dfdcl.setZero(lmax + 1, npts);
+    dfdb.setZero(npts);
+    dfdr.setZero(npts);
+    for (size_t i = 0; i < npts; ++i) {
+      if (los(i) > 0) {
+        T b_ = abs(b(i));
+        T r_ = abs(r(i));
+        if (b_ < 1 + r_) {
+          L_->template compute<true>(b_, r_);
+
+          // The value of the light curve
+          f(i) = L_->sT.dot(cl);
+
+          // The gradients
+          dfdcl.col(i) = L_->sT.transpose();
+          dfdb(i) = sgn(b(i)) * L_->dsTdb.dot(cl);
+          dfdr(i) = sgn(r(i)) * L_->dsTdr.dot(cl);
+        }
+      }
+    }
+  }
+};
+
 } // namespace limbdark
 } // namespace starry
 
@@ -12,6 +12,21 @@
 #define STARRY_NDIGITS 16
 #endif
 
+//! Digits of precision of the fallback occultation solver (0 = disabled)
+#ifndef STARRY_EXTENDED_NDIGITS
+#define STARRY_EXTENDED_NDIGITS 32
+#endif
+
+//! Compute occultations in extended precision above this error estimate
+#ifndef STARRY_EXTENDED_TOL
+#define STARRY_EXTENDED_TOL 1e-10
+#endif
+
+//! Relative step for finite difference derivatives in extended precision
+#ifndef STARRY_EXTENDED_FD_STEP
+#define STARRY_EXTENDED_FD_STEP 1e-8
+#endif
+
 //! Number of Gaussian-Legendre quadrature points for numerical integration
 #ifndef STARRY_QUAD_POINTS
 #define STARRY_QUAD_POINTS 100
@@ -27,6 +42,11 @@
 #define STARRY_MN_MAX_ITER 100
 #endif
 
+//! Max iterations in the Kepler solver
+#ifndef STARRY_KEPLER_MAX_ITER
+#define STARRY_KEPLER_MAX_ITER 50
+#endif
+
 //! Max iterations in computing the I & J integrals
 #ifndef STARRY_IJ_MAX_ITER
 #define STARRY_IJ_MAX_ITER 200
@@ -19,6 +19,15 @@ namespace starry {
 using namespace utils;
 
 //! The Ops class
+/**
+The operators that hold mutable state (solvers, rotation operators, and
+so forth) live in thread-safe pools: each call checks out an instance for
+its exclusive use, so the same `Ops` may be evaluated concurrently from
+several threads. The change of basis matrices in `B` are read-only, with
+the exception of the polynomial basis cache (see `pT`), which is guarded
+by `pT_lock`.
+
+*/
 template <class Scalar> class Ops {
 public:
   const int ydeg;
@@ -32,30 +41,48 @@ public:
 
   // Standard starry
   basis::Basis<Scalar> B;
-  wigner::Wigner<Scalar> W;
-  solver::Greens<Scalar> G;
-  filter::Filter<Scalar> F;
+  ScratchPool<wigner::Wigner<Scalar>> W;
+  ScratchPool<solver::Greens<Scalar>> G;
+  ScratchPool<filter::Filter<Scalar>> F;
 
   // Reflected light starry
-  reflected::phasecurve::PhaseCurve<ADScalar<Scalar, 2>> RP;
-  reflected::occultation::Occultation<ADScalar<Scalar, 5>> RO;
+  ScratchPool<reflected::phasecurve::PhaseCurve<ADScalar<Scalar, 2>>> RP;
+  ScratchPool<reflected::occultation::Occultation<ADScalar<Scalar, 5>>> RO;
 
   // Oblate starry
-  oblate::occultation::Occultation<Scalar, 0> OBL;
-  oblate::occultation::Occultation<Scalar, 4> OBLAD;
+  ScratchPool<oblate::occultation::Occultation<Scalar, 0>> OBL;
+  ScratchPool<oblate::occultation::Occultation<Scalar, 4>> OBLAD;
 
-  // Spot gradients
-  RowVector<Scalar> bamp;
-  Scalar bsigma;
-  Scalar blat;
-  Scalar blon;
+  // Error tolerance above which occultations are computed in extended
+  // precision (see `solver::Greens`)
+  Scalar sT_tol;
+
+  // Guards the polynomial basis cache in `B`
+  std::mutex pT_lock;
 
   // Constructor
   explicit Ops(int ydeg, int udeg, int fdeg)
       : ydeg(ydeg), Ny((ydeg + 1) * (ydeg + 1)), udeg(udeg), Nu(udeg + 1),
         fdeg(fdeg), Nf((fdeg + 1) * (fdeg + 1)), deg(ydeg + udeg + fdeg),
-        N((deg + 1) * (deg + 1)), B(ydeg, udeg, fdeg), W(ydeg, udeg, fdeg),
-        G(deg), F(B), RP(deg, B), RO(deg, B), OBL(deg), OBLAD(deg) {
+        N((deg + 1) * (deg + 1)), B(ydeg, udeg, fdeg), W([this] {
+          return new wigner::Wigner<Scalar>(this->ydeg, this->udeg, this->fdeg);
+        }),
+        G([this] { return new solver::Greens<Scalar>(this->deg); }),
+        F([this] { return new filter::Filter<Scalar>(this->B); }), RP([this] {
+          return new reflected::phasecurve::PhaseCurve<ADScalar<Scalar, 2>>(
+              this->deg, this->B);
+        }),
+        RO([this] {
+          return new reflected::occultation::Occultation<ADScalar<Scalar, 5>>(
+              this->deg, this->B);
+        }),
+        OBL([this] {
+          return new oblate::occultation::Occultation<Scalar, 0>(this->deg);
+        }),
+        OBLAD([this] {
+          return new oblate::occultation::Occultation<Scalar, 4>(this->deg);
+        }),
+        sT_tol(STARRY_EXTENDED_TOL) {
     // Bounds checks
 #ifndef STARRY_NO_EXCEPTIONS
     if ((ydeg < 0) || (ydeg > STARRY_MAX_LMAX))
@@ -67,20 +94,44 @@ public:
 #endif
   };
 
+  // The pools hold pointers back to this object
+  Ops(const Ops &) = delete;
+  Ops &operator=(const Ops &) = delete;
+
+  // Check a Greens solver out of the pool, applying the current tolerance
+  inline typename ScratchPool<solver::Greens<Scalar>>::Handle greens() {
+    auto G_ = G.acquire();
+    G_->tol = sT_tol;
+    return G_;
+  }
+
+  // Compute the polynomial basis at a vector of points
+  inline Matrix<Scalar> pT(const int deg, const RowVector<Scalar> &x,
+                           const RowVector<Scalar> &y,
+                           const RowVector<Scalar> &z) {
+    std::lock_guard<std::mutex> guard(pT_lock);
+    B.computePolyBasis(deg, x, y, z);
+    return B.pT;
+  }
+
   // Compute the Ylm expansion of a gaussian spot at a
   // given latitude/longitude on the map.
   inline Matrix<Scalar> spotYlm(const RowVector<Scalar> &amp,
                                 const Scalar &sigma, const Scalar &lat = 0,
                                 const Scalar &lon = 0) {
-    return misc::spotYlm(amp, sigma, lat, lon, ydeg, W);
+    auto W_ = W.acquire();
+    return misc::spotYlm(amp, sigma, lat, lon, ydeg, *W_);
   }
 
   // Compute the gradient of the Ylm expansion of a gaussian spot at a
   // given latitude/longitude on the map.
   inline void spotYlm(const RowVector<Scalar> &amp, const Scalar &sigma,
                       const Scalar &lat, const Scalar &lon,
-                      const Matrix<double> &by) {
-    misc::spotYlm(amp, sigma, lat, lon, by, ydeg, W, bamp, bsigma, blat, blon);
+                      const Matrix<double> &by, RowVector<Scalar> &bamp,
+                      Scalar &bsigma, Scalar &blat, Scalar &blon) {
+    auto W_ = W.acquire();
+    misc::spotYlm(amp, sigma, lat, lon, by, ydeg, *W_, bamp, bsigma, blat,
+                  blon);
   }
 
 }; // class Ops
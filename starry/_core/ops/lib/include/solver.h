@@ -1058,6 +1058,64 @@ public:
   }
 };
 
+/**
+Return true if the solution vector computed in type `T` at the point
+`(b, r)` is expected to have an absolute error larger than `tol`.
+
+We flag three regimes in which the recursions lose precision:
+
+  (A) Occultors larger than the body near the point of contact with a
+      complete occultation (`b ~ r - 1`), where `k^2` underflows and the
+      error scales as `1 / k^2`;
+  (B) Occultors with `0.5 < r < 1.1` close to the center of the disk,
+      where the error grows geometrically with `lmax` at a rate `g` that
+      peaks at `r ~ 1` and falls off as `b^-0.4` away from the center;
+  (C) Occultors with `r ~ 1` close to the center of the disk, where the
+      error scales as `1 / max(b, |1 - r|)` independently of `lmax`.
+
+The error estimates are conservative fits to the difference between
+the double precision solution and a 50-digit reference.
+
+*/
+template <typename T>
+inline bool isIllConditioned(const T &b, const T &r, const int lmax,
+                             const T &tol) {
+  const T eps = mach_eps<T>();
+  T lo = abs(T(1.0) - r);
+
+  // Complete occultation: nothing to compute
+  if (b < r - 1)
+    return false;
+
+  // (A) Complete occultation contact point
+  if ((r > 1) && (b < r)) {
+    T bmr = b - r;
+    T ksq = 0.25 * (T(1.0) - bmr) * (T(1.0) + bmr) / (b * r);
+    if (eps > tol * ksq)
+      return true;
+  }
+
+  // (C) Occultor radius close to unity near the center of the disk
+  if (eps > tol * max(b, lo))
+    return true;
+
+  // (B) High degree, occultor close to the center of the disk
+  T growth;
+  if (r < 1)
+    growth = 3.2 * r - 0.24;
+  else
+    growth = 2.96 - 19.6 * (r - 1);
+  if (growth > 1) {
+    T bc = max(lo, T(0.07));
+    if (b > bc)
+      growth *= pow(bc / b, 0.4);
+    if (10 * eps * pow(growth, lmax) > tol)
+      return true;
+  }
+
+  return false;
+}
+
 /**
 Greens integral solver wrapper class.
 Emitted light specialization.
@@ -1066,6 +1124,13 @@ Emitted light specialization.
 template <class Scalar> class Greens {
 protected:
   using ADType = ADScalar<Scalar, 2>;
+#ifdef STARRY_EXTENDED
+  using ExtendedType =
+      typename std::conditional<std::is_same<Scalar, double>::value,
+                                Extended, Scalar>::type;
+#else
+  using ExtendedType = Scalar;
+#endif
 
   // Indices
   int lmax;
@@ -1074,31 +1139,160 @@ protected:
   // Solvers
   Solver<Scalar, false> ScalarSolver;
   Solver<ADType, true> ADTypeSolver;
+  Solver<ExtendedType, false> ExtendedSolver;
 
   // AutoDiff
   ADType b_ad;
   ADType r_ad;
 
+  // Extended precision solution and finite difference stencil
+  RowVector<ExtendedType> sT0;
+  RowVector<ExtendedType> sT1;
+  RowVector<ExtendedType> sT2;
+
+  /**
+  Solve for the solution vector in extended precision.
+
+  */
+  inline RowVector<ExtendedType> &solveExtended(const ExtendedType &b,
+                                                  const ExtendedType &r) {
+    ExtendedSolver.compute(b, r);
+    return ExtendedSolver.sT;
+  }
+
+  /**
+  Compute the derivative of the extended precision solution vector with
+  respect to `b` (`WRT_B = true`) or `r` (`WRT_B = false`) by finite
+  differences about the point stored in `sT0`. The solution has square
+  root singularities at `b = 0`, `b = |1 - r|` and `b = 1 + r` (and the
+  corresponding values of `r`), so the step is scaled to the distance to
+  the nearest singular point; if we are too close to one to resolve that
+  step, we use a one-sided stencil pointing away from it.
+
+  */
+  template <bool WRT_B>
+  inline void computeExtendedDerivative(const ExtendedType &b,
+                                        const ExtendedType &r,
+                                        RowVector<Scalar> &deriv) {
+    ExtendedType x = WRT_B ? b : r;
+    ExtendedType y = WRT_B ? r : b;
+    ExtendedType scale = x > 1 ? x : ExtendedType(1.0);
+
+    // Distance to the nearest singular point below and above `x`
+    ExtendedType dlo = scale;
+    ExtendedType dhi = scale;
+    for (ExtendedType s : {ExtendedType(0.0), abs(ExtendedType(1.0) - y),
+                           ExtendedType(1.0) + y}) {
+      if ((s <= x) && (x - s < dlo))
+        dlo = x - s;
+      else if ((s > x) && (s - x < dhi))
+        dhi = s - x;
+    }
+
+    ExtendedType h;
+    ExtendedType d = dlo < dhi ? dlo : dhi;
+    if (d > mach_eps<ExtendedType>() / STARRY_EXTENDED_FD_STEP * scale) {
+      // Central differences
+      h = STARRY_EXTENDED_FD_STEP * d;
+      sT1 = WRT_B ? solveExtended(b - h, r) : solveExtended(b, r - h);
+      sT2 = WRT_B ? solveExtended(b + h, r) : solveExtended(b, r + h);
+      for (int n = 0; n < N; ++n)
+        deriv(n) = static_cast<Scalar>((sT2(n) - sT1(n)) / (2 * h));
+    } else {
+      // Second order one-sided differences
+      h = (dlo <= dhi) ? STARRY_EXTENDED_FD_STEP * dhi
+                       : -STARRY_EXTENDED_FD_STEP * dlo;
+      sT1 = WRT_B ? solveExtended(b + h, r) : solveExtended(b, r + h);
+      sT2 = WRT_B ? solveExtended(b + 2 * h, r)
+                  : solveExtended(b, r + 2 * h);
+      for (int n = 0; n < N; ++n)
+        deriv(n) = static_cast<Scalar>((4 * sT1(n) - 3 * sT0(n) - sT2(n)) /
+                                       (2 * h));
+    }
+  }
+
+  /**
+  Compute the solution vector (and optionally its derivatives) in
+  extended precision. Returns false if the computation failed, in which
+  case the caller should fall back to the regular solver.
+
+  */
+  template <bool GRADIENT>
+  inline bool computeExtended(const Scalar &b, const Scalar &r) {
+    ExtendedType b_ext(b);
+    ExtendedType r_ext(r);
+    RowVector<Scalar> sT_ext(N), dsTdb_ext(N), dsTdr_ext(N);
+    try {
+      sT0 = solveExtended(b_ext, r_ext);
+      for (int n = 0; n < N; ++n)
+        sT_ext(n) = static_cast<Scalar>(sT0(n));
+      if (GRADIENT) {
+        computeExtendedDerivative<true>(b_ext, r_ext, dsTdb_ext);
+        computeExtendedDerivative<false>(b_ext, r_ext, dsTdr_ext);
+      }
+    } catch (...) {
+      return false;
+    }
+    if (!sT_ext.allFinite())
+      return false;
+    if (GRADIENT && !(dsTdb_ext.allFinite() && dsTdr_ext.allFinite()))
+      return false;
+    sT = sT_ext;
+    if (GRADIENT) {
+      dsTdb = dsTdb_ext;
+      dsTdr = dsTdr_ext;
+    }
+    return true;
+  }
+
 public:
   // Solutions
   RowVector<Scalar> &sT;
   RowVector<Scalar> dsTdb;
   RowVector<Scalar> dsTdr;
 
+  // Error tolerance above which we compute in extended precision
+  Scalar tol;
+
   // Constructor
   explicit Greens(int lmax)
       : lmax(lmax), N((lmax + 1) * (lmax + 1)), ScalarSolver(lmax),
-        ADTypeSolver(lmax), b_ad(ADType(0.0, Vector<Scalar>::Unit(2, 0))),
+        ADTypeSolver(lmax), ExtendedSolver(lmax),
+        b_ad(ADType(0.0, Vector<Scalar>::Unit(2, 0))),
         r_ad(ADType(0.0, Vector<Scalar>::Unit(2, 1))), sT(ScalarSolver.sT),
-        dsTdb(RowVector<Scalar>::Zero(N)), dsTdr(RowVector<Scalar>::Zero(N)) {}
+        dsTdb(RowVector<Scalar>::Zero(N)), dsTdr(RowVector<Scalar>::Zero(N)),
+        tol(STARRY_EXTENDED_TOL) {}
+
+  /**
+  Return true if the solution at `(b, r)` will be computed in extended
+  precision.
+
+  */
+  inline bool extended(const Scalar &b, const Scalar &r) {
+#ifdef STARRY_EXTENDED
+    return std::is_same<Scalar, double>::value &&
+           isIllConditioned(b, r, lmax, tol);
+#else
+    return false;
+#endif
+  }
 
   /**
   Compute the `s^T` occultation solution vector
   with or without the gradient.
 
+  Points at which the double precision solution is ill-conditioned
+  (see `isIllConditioned`) are computed in extended precision. Since
+  the solver cannot be autodiffed in extended precision, the derivatives
+  at those points are computed by finite differences.
+
   */
   template <bool GRADIENT = false>
   inline void compute(const Scalar &b, const Scalar &r) {
+    // Ill-conditioned points are computed in extended precision
+    if (unlikely(extended(b, r)) && computeExtended<GRADIENT>(b, r))
+      return;
+
     if (!GRADIENT) {
       ScalarSolver.compute(b, r);
 
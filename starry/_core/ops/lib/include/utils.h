@@ -15,8 +15,11 @@
 #include <chrono>
 #include <cmath>
 #include <exception>
+#include <functional>
 #include <iomanip>
 #include <iostream>
+#include <memory>
+#include <mutex>
 #include <random>
 #include <stdarg.h>
 #include <stdlib.h>
@@ -30,6 +33,14 @@
 #endif
 #endif
 
+//! Extended precision fallback for ill-conditioned occultations?
+#if STARRY_EXTENDED_NDIGITS > 16
+#define STARRY_EXTENDED
+#ifndef STARRY_ENABLE_BOOST
+#define STARRY_ENABLE_BOOST
+#endif
+#endif
+
 //! Use the boost library?
 #ifdef STARRY_ENABLE_BOOST
 #include <boost/math/special_functions/gamma.hpp>
@@ -40,6 +51,14 @@ typedef boost::multiprecision::number<mp_backend, boost::multiprecision::et_off>
 #else
 typedef void Multi;
 #endif
+#ifdef STARRY_EXTENDED
+typedef boost::multiprecision::number<
+    boost::multiprecision::cpp_dec_float<STARRY_EXTENDED_NDIGITS>,
+    boost::multiprecision::et_off>
+    Extended;
+#else
+typedef void Extended;
+#endif
 
 //! Compiler branching optimizations
 #ifdef STARRY_BRANCHING_DISABLE_OPTIM
@@ -123,6 +142,65 @@ using std::swap;
 template <bool B, class T = void>
 using EnableIf = typename std::enable_if<B, T>::type;
 
+/**
+A thread-safe pool of scratch objects (solvers, rotation operators,
+etc.) that hold mutable state. Each call `acquire`s an object for its
+exclusive use, which is returned to the pool when the handle goes out of
+scope. New objects are built by `factory` whenever the pool is empty, so
+the pool grows to the number of concurrent callers.
+
+*/
+template <class T> class ScratchPool {
+  using Pointer = std::unique_ptr<T>;
+
+  std::function<T *()> factory;
+  std::vector<Pointer> pool;
+  std::mutex lock;
+
+public:
+  //! An object checked out of the pool
+  class Handle {
+    ScratchPool *owner;
+    Pointer object;
+
+  public:
+    Handle(ScratchPool *owner, Pointer object)
+        : owner(owner), object(std::move(object)) {}
+    Handle(Handle &&other) = default;
+    Handle(const Handle &) = delete;
+    Handle &operator=(const Handle &) = delete;
+    ~Handle() {
+      if (object)
+        owner->release(std::move(object));
+    }
+    T &operator*() { return *object; }
+    T *operator->() { return object.get(); }
+  };
+
+  explicit ScratchPool(std::function<T *()> factory) : factory(factory) {}
+  ScratchPool(const ScratchPool &) = delete;
+  ScratchPool &operator=(const ScratchPool &) = delete;
+
+  //! Check an object out of the pool, building a new one if needed
+  inline Handle acquire() {
+    {
+      std::lock_guard<std::mutex> guard(lock);
+      if (pool.size()) {
+        Pointer object = std::move(pool.back());
+        pool.pop_back();
+        return Handle(this, std::move(object));
+      }
+    }
+    return Handle(this, Pointer(factory()));
+  }
+
+  //! Return an object to the pool
+  inline void release(Pointer object) {
+    std::lock_guard<std::mutex> guard(lock);
+    pool.push_back(std::move(object));
+  }
+};
+
 // --------------------------
 // ----- Linear Algebra -----
 // --------------------------
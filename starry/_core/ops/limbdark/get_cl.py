@@ -1,29 +1,34 @@
 # -*- coding: utf-8 -*-
-from ....compat import Apply, tt
-from .base_op import LimbDarkBaseOp
+from ....compat import Apply, Op, tt
 from .get_cl_rev import GetClRevOp
+import numpy as np
 
 __all__ = ["GetClOp"]
 
 
-class GetClOp(LimbDarkBaseOp):
+class GetClOp(Op):
+    """
+    Agol `c` coefficients from the limb darkening coefficients `u`.
 
-    __props__ = ()
-    func_file = "./get_cl.cc"
-    func_name = "APPLY_SPECIFIC(get_cl)"
-    num_input = 1
+    """
 
-    def __init__(self):
-        self.grad_op = GetClRevOp()
-        super(GetClOp, self).__init__()
+    def __init__(self, func, grad_func):
+        self.func = func
+        self.grad_op = GetClRevOp(grad_func)
 
     def make_node(self, arg):
-        return Apply(self, [tt.as_tensor_variable(arg)], [arg.type()])
+        arg = tt.as_tensor_variable(arg)
+        return Apply(self, [arg], [arg.type()])
 
     def infer_shape(self, *args):
         shapes = args[-1]
         return (shapes[0],)
 
+    def perform(self, node, inputs, outputs):
+        outputs[0][0] = np.asarray(
+            self.func(inputs[0]), dtype=node.outputs[0].dtype
+        )
+
     def grad(self, inputs, gradients):
         return (self.grad_op(gradients[0]),)
 
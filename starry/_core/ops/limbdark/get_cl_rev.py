@@ -1,20 +1,29 @@
 # -*- coding: utf-8 -*-
-from ....compat import Apply, tt
-from .base_op import LimbDarkBaseOp
-
+from ....compat import Apply, Op, tt
+import numpy as np
 
 __all__ = ["GetClRevOp"]
 
 
-class GetClRevOp(LimbDarkBaseOp):
+class GetClRevOp(Op):
+    """
+    Gradient of the Agol `c` coefficients with respect to the limb
+    darkening coefficients `u`.
+
+    """
 
-    __props__ = ()
-    func_file = "./get_cl_rev.cc"
-    func_name = "APPLY_SPECIFIC(get_cl_rev)"
+    def __init__(self, func):
+        self.func = func
 
     def make_node(self, bc):
-        return Apply(self, [tt.as_tensor_variable(bc)], [bc.type()])
+        bc = tt.as_tensor_variable(bc)
+        return Apply(self, [bc], [bc.type()])
 
     def infer_shape(self, *args):
         shapes = args[-1]
         return (shapes[0],)
+
+    def perform(self, node, inputs, outputs):
+        outputs[0][0] = np.asarray(
+            self.func(inputs[0]), dtype=node.outputs[0].dtype
+        )
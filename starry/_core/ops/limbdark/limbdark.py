@@ -1,16 +1,19 @@
 # -*- coding: utf-8 -*-
+from ....compat import Apply, Op, theano, tt
+import numpy as np
 
 __all__ = ["LimbDarkOp"]
 
-from ....compat import Apply, theano, tt
-from .base_op import LimbDarkBaseOp
 
+class LimbDarkOp(Op):
+    """
+    Limb-darkened occultation flux and its gradients, computed by the
+    ``LimbDark`` class in the compiled ``_c_ops`` module.
 
-class LimbDarkOp(LimbDarkBaseOp):
+    """
 
-    __props__ = ()
-    func_file = "./limbdark.cc"
-    func_name = "APPLY_SPECIFIC(limbdark)"
+    def __init__(self, func):
+        self.func = func
 
     def make_node(self, c, b, r, los):
         in_args = []
@@ -43,6 +46,20 @@ class LimbDarkOp(LimbDarkBaseOp):
             shapes[2],
         )
 
+    def perform(self, node, inputs, outputs):
+        c, b, r, los = inputs
+        shape = np.shape(b)
+        f, dfdcl, dfdb, dfdr = self.func(
+            np.reshape(c, -1),
+            np.reshape(b, -1),
+            np.reshape(r, -1),
+            np.reshape(los, -1),
+        )
+        outputs[0][0] = np.reshape(f, shape)
+        outputs[1][0] = np.reshape(dfdcl, np.shape(c) + shape)
+        outputs[2][0] = np.reshape(dfdb, shape)
+        outputs[3][0] = np.reshape(dfdr, shape)
+
     def grad(self, inputs, gradients):
         c, b, r, los = inputs
         f, dfdcl, dfdb, dfdr = self(*inputs)
@@ -69,10 +69,12 @@ class pTGradientOp(Op):
         # TODO: When any of the coords are zero, there's a div
         # by zero below. This hack fixes the issue. We should
         # think of a better way of doing this!
+        # Note that we must not modify the inputs in place, since they
+        # may be used elsewhere in the graph.
         tol = 1e-8
-        x[np.abs(x) < tol] = tol
-        y[np.abs(y) < tol] = tol
-        z[np.abs(z) < tol] = tol
+        x = np.where(np.abs(x) < tol, tol, x)
+        y = np.where(np.abs(y) < tol, tol, y)
+        z = np.where(np.abs(z) < tol, tol, z)
 
         bpTpT = bpT * self.base_op.func(self.base_op.deg, x, y, z)
         bx = np.nansum(self.xf[None, :] * bpTpT / x[:, None], axis=-1)
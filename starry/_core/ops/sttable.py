@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+from numpy.polynomial import chebyshev
+from collections import OrderedDict
+import numpy as np
+import threading
+
+__all__ = ["sTTable", "get_sT_table"]
+
+
+# Tables keyed on ``(N, r, tol, dtol, order, max_depth, safety)``;
+# see ``get_sT_table``
+_sT_table_cache = OrderedDict()
+_sT_table_cache_size = 16
+_sT_table_cache_lock = threading.Lock()
+
+
+class sTTable(object):
+    """
+    A piecewise Chebyshev interpolation table for the occultation solution
+    vector ``sT(b, r)`` and its derivatives at a fixed occultor radius ``r``.
+
+    The impact parameter is split into the region ``0 <= b <= |1 - r|``,
+    where the occultor is either entirely inside the disk or covers it
+    completely, and the partial occultation region ``|1 - r| < b < 1 + r``.
+    Since the solution has square root singularities at the points of
+    contact, we tabulate it on the latter as a function of the angle
+    ``phi``, where ``b = |1 - r| + 2 * min(1, r) * sin(phi) ** 2``, in which
+    it is smooth. Each region is bisected adaptively until the interpolant
+    of degree ``order - 1`` on each panel agrees with the exact solution to
+    within ``safety * tol`` (``sT``) and ``safety * dtol`` (the derivatives)
+    at the midpoints between the interpolation nodes and at ``4 * order``
+    evenly spaced points. Since the error is only checked at a finite
+    number of points, ``tol`` and ``dtol`` are approximate bounds; the
+    safety factor leaves room for the error between the check points.
+    Panels that do not converge within
+    ``max_depth`` bisections are flagged, and points that fall on them, as
+    well as points exactly on the region boundaries, are evaluated
+    exactly.
+
+    Tables hold only numpy arrays, so they can be pickled.
+
+    Args:
+        func (callable): A function of ``(b, r)`` that returns the exact
+            solution vectors and their derivatives with respect to ``b``
+            and ``r``, each of shape ``(len(b), N)``.
+        r (float): The occultor radius.
+        tol (float, optional): Tolerance on ``sT``. Default ``1e-10``.
+        dtol (float, optional): Tolerance on the derivatives.
+            Default ``1e-7``.
+        order (int, optional): Number of interpolation nodes per panel.
+            Default 12.
+        max_depth (int, optional): Maximum number of bisections per panel.
+            Default 12.
+        safety (float, optional): Fraction of the tolerances the error
+            at the check points must fall below. Default 0.5.
+
+    """
+
+    def __init__(
+        self,
+        func,
+        r,
+        tol=1e-10,
+        dtol=1e-7,
+        order=12,
+        max_depth=12,
+        safety=0.5,
+    ):
+        self.r = float(r)
+        self.tol = tol
+        self.dtol = dtol
+        self.order = order
+        self.lo = abs(1.0 - self.r)
+        self.hi = 1.0 + self.r
+
+        # Chebyshev nodes on [-1, 1]; we check the interpolant at the
+        # midpoints between them and on a denser uniform grid
+        nodes = np.cos(np.pi * (np.arange(order) + 0.5) / order)[::-1]
+        check = np.concatenate(
+            (
+                np.cos(np.pi * np.arange(1, order) / order)[::-1],
+                np.linspace(-1, 1, 4 * order + 2)[1:-1],
+            )
+        )
+
+        # Adaptively bisect the panels in the monotonic coordinate `u`
+        # (see `_get_u`) until they converge
+        todo = []
+        if self.lo > 0:
+            todo.append((0.0, self.lo, 0))
+        todo.append((self.lo, self.lo + 0.5 * np.pi, 0))
+        panels = []
+        while len(todo):
+            a, c, depth = todo.pop()
+            u = 0.5 * (a + c) + 0.5 * (c - a) * np.concatenate((nodes, check))
+            values = np.concatenate(func(self._get_b(u), self.r), axis=1)
+            N = values.shape[1] // 3
+            coeffs = chebyshev.chebfit(nodes, values[:order], order - 1)
+            diff = np.abs(chebyshev.chebval(check, coeffs).T - values[order:])
+            err = np.array([np.max(diff[:, :N]), np.max(diff[:, N:])])
+            converged = (err[0] <= safety * tol) and (
+                err[1] <= safety * dtol
+            )
+            if converged or (depth >= max_depth):
+                if not converged:
+                    # Evaluate points on this panel exactly
+                    coeffs[:] = np.nan
+                panels.append((a, c, coeffs, err))
+            else:
+                m = 0.5 * (a + c)
+                todo += [(a, m, depth + 1), (m, c, depth + 1)]
+
+        # Store the panels sorted by position
+        panels = sorted(panels, key=lambda panel: panel[0])
+        self.N = N
+        self.edges = np.append([panel[0] for panel in panels], panels[-1][1])
+        self.coeffs = np.array([panel[2] for panel in panels])
+        errors = np.array(
+            [panel[3] for panel in panels if np.isfinite(panel[2][0, 0])]
+        ).reshape(-1, 2)
+        if len(errors):
+            self.error = np.max(errors, axis=0)
+        else:
+            self.error = np.array([0.0, 0.0])
+
+    def _get_b(self, u):
+        """Impact parameter as a function of the table coordinate."""
+        phi = u - self.lo
+        return np.where(
+            phi <= 0,
+            u,
+            self.lo + (self.hi - self.lo) * np.sin(np.maximum(phi, 0)) ** 2,
+        )
+
+    def _get_u(self, b):
+        """Table coordinate as a function of the impact parameter."""
+        phi = np.arcsin(
+            np.sqrt(np.clip((b - self.lo) / (self.hi - self.lo), 0, 1))
+        )
+        return np.where(b <= self.lo, b, self.lo + phi)
+
+    @property
+    def npanels(self):
+        """The number of panels in the table."""
+        return len(self.coeffs)
+
+    def evaluate(self, b, func=None, gradient=False):
+        """
+        Return ``sT`` at the impact parameters ``b`` or, if ``gradient`` is
+        True, ``sT``, ``dsT / db`` and ``dsT / dr``. Points that are not
+        covered by the table are evaluated by calling ``func(b, r)``, which
+        has the same signature as the function used to build the table.
+
+        """
+        b = np.atleast_1d(np.asarray(b, dtype=np.float64))
+        ncols = 3 * self.N if gradient else self.N
+        values = np.empty((len(b), ncols))
+
+        # Locate the panels
+        u = self._get_u(b)
+        panel = np.searchsorted(self.edges, u, side="right") - 1
+        exact = (
+            (b <= 0)
+            | (b >= self.hi)
+            | (b == self.lo)
+            | (panel < 0)
+            | (panel >= self.npanels)
+        )
+        panel[exact] = -1
+
+        # Evaluate the interpolants one panel at a time
+        for k in np.unique(panel[panel >= 0]):
+            idx = np.flatnonzero(panel == k)
+            a, c = self.edges[k], self.edges[k + 1]
+            x = (2 * u[idx] - a - c) / (c - a)
+            values[idx] = np.dot(
+                chebyshev.chebvander(x, self.order - 1),
+                self.coeffs[k, :, :ncols],
+            )
+
+        # Evaluate points not covered by the table exactly
+        exact = np.flatnonzero(exact | np.isnan(values[:, 0]))
+        if len(exact):
+            if func is None:
+                raise ValueError(
+                    "Some points are not covered by the `sT` table."
+                )
+            values[exact] = np.concatenate(func(b[exact], self.r), axis=1)[
+                :, :ncols
+            ]
+
+        if gradient:
+            N = self.N
+            return values[:, :N], values[:, N : 2 * N], values[:, 2 * N :]
+        else:
+            return values
+
+
+def get_sT_table(func, N, r, **kwargs):
+    """
+    Return an :py:class:`sTTable` for the solution vectors of length ``N``
+    at radius ``r``, caching the most recently used tables.
+
+    """
+    key = (
+        int(N),
+        float(r),
+        kwargs.get("tol", 1e-10),
+        kwargs.get("dtol", 1e-7),
+        kwargs.get("order", 12),
+        kwargs.get("max_depth", 12),
+        kwargs.get("safety", 0.5),
+    )
+    with _sT_table_cache_lock:
+        table = _sT_table_cache.pop(key, None)
+        if table is not None:
+            _sT_table_cache[key] = table
+            return table
+    table = sTTable(func, r, **kwargs)
+    with _sT_table_cache_lock:
+        while len(_sT_table_cache) >= _sT_table_cache_size:
+            _sT_table_cache.popitem(last=False)
+        _sT_table_cache[key] = table
+    return table
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from ..compat import tt
+from .._constants import *
+from astropy import units, constants
+import numpy as np
+
+__all__ = ["KeplerianOrbit"]
+
+
+# Speed of light in R_sun / day
+c_light = constants.c.to(units.R_sun / units.day).value
+
+# Conversion factor from R_sun / day to m / s
+rv_factor = (units.R_sun / units.day).to(units.m / units.s)
+
+# Number of fixed-point iterations in the retarded time solve
+light_delay_iter = 4
+
+
+class KeplerianOrbit(object):
+    """
+    A system of secondary bodies on Keplerian orbits about a primary.
+
+    This follows the conventions of ``exoplanet.orbits.KeplerianOrbit``:
+    lengths are in solar radii, masses in solar masses, times in days,
+    and angles in radians, and the `z` axis points toward the observer.
+    All positions and velocities are returned as matrices of shape
+    ``(len(t), nsec)``, where ``nsec`` is the number of secondaries.
+
+    Args:
+        kepler: An instance of :py:class:`KeplerOp`.
+        period (vector): The orbital periods of the secondaries.
+        t0 (vector): The times of transit of the secondaries.
+        incl (vector): The orbital inclinations.
+        ecc (vector): The orbital eccentricities.
+        omega (vector): The arguments of pericenter.
+        Omega (vector): The longitudes of the ascending nodes.
+        m_planet (vector): The masses of the secondaries.
+        m_star (scalar): The mass of the primary.
+
+    """
+
+    def __init__(
+        self, kepler, period, t0, incl, ecc, omega, Omega, m_planet, m_star
+    ):
+        self._kepler = kepler
+        self.period = tt.as_tensor_variable(period)
+        self.t0 = tt.as_tensor_variable(t0)
+        self.ecc = tt.as_tensor_variable(ecc)
+        self.m_planet = tt.as_tensor_variable(m_planet)
+        self.m_star = tt.as_tensor_variable(m_star)
+        self.m_total = self.m_star + self.m_planet
+
+        # Trig
+        self.cos_incl = tt.cos(incl)
+        self.sin_incl = tt.sin(incl)
+        self.cos_omega = tt.cos(omega)
+        self.sin_omega = tt.sin(omega)
+        self.cos_Omega = tt.cos(Omega)
+        self.sin_Omega = tt.sin(Omega)
+
+        # Mean motion and semi-major axis
+        self.n = 2 * np.pi / self.period
+        self.a = (
+            G_grav * self.m_total * self.period ** 2 / (4 * np.pi ** 2)
+        ) ** (1.0 / 3)
+        self.a_star = self.a * self.m_planet / self.m_total
+        self.a_planet = -self.a * self.m_star / self.m_total
+        self.K0 = self.n * self.a / (self.m_total * tt.sqrt(1 - self.ecc ** 2))
+
+        # Reference time: the secondaries transit when the true
+        # anomaly is equal to `pi / 2 - omega`
+        E0 = 2 * tt.arctan2(
+            tt.sqrt(1 - self.ecc) * self.cos_omega,
+            tt.sqrt(1 + self.ecc) * (1 + self.sin_omega),
+        )
+        M0 = E0 - self.ecc * tt.sin(E0)
+        self.tref = self.t0 - M0 / self.n
+
+    def _get_true_anomaly(self, t):
+        """Return the sine and cosine of the true anomaly at times `t`."""
+        if t.ndim == 1:
+            t = tt.shape_padright(t)
+        M = self.n * (t - self.tref)
+        return self._kepler(M, self.ecc)
+
+    def _rotate_vector(self, x, y):
+        """Rotate a vector in the orbital plane to the observer frame."""
+        # Rotate about z by `omega`
+        a = self.cos_omega * x - self.sin_omega * y
+        b = self.sin_omega * x + self.cos_omega * y
+
+        # Rotate about x by `-incl`
+        y = self.cos_incl * b
+        z = -self.sin_incl * b
+
+        # Rotate about z by `Omega`
+        X = self.cos_Omega * a - self.sin_Omega * y
+        Y = self.sin_Omega * a + self.cos_Omega * y
+        return X, Y, z
+
+    def _get_position(self, R, t, light_delay=False):
+        """Position of a body on an orbit of scale `R` at times `t`."""
+        t = tt.as_tensor_variable(t)
+        sinf, cosf = self._get_true_anomaly(t)
+        if light_delay:
+            # We observe the body at the position it had when the light
+            # we receive at time `t` was emitted; a body closer to the
+            # observer (larger `z`) is seen at a later time. We solve
+            # the retarded time equation `t_r = t + z(t_r) / c` by
+            # fixed-point iteration, which converges at a rate of
+            # about `v / c` per step
+            for _ in range(light_delay_iter):
+                r = R * (1 - self.ecc ** 2) / (1 + self.ecc * cosf)
+                _, _, z = self._rotate_vector(r * cosf, r * sinf)
+                sinf, cosf = self._get_true_anomaly(
+                    tt.shape_padright(t) + z / c_light
+                )
+        r = R * (1 - self.ecc ** 2) / (1 + self.ecc * cosf)
+        return self._rotate_vector(r * cosf, r * sinf)
+
+    def get_relative_position(self, t, light_delay=False):
+        """Position of each secondary relative to the primary."""
+        return self._get_position(-self.a, t, light_delay=light_delay)
+
+    def get_star_position(self, t, light_delay=False):
+        """Barycentric position of the primary due to each secondary."""
+        return self._get_position(self.a_star, t, light_delay=light_delay)
+
+    def get_planet_position(self, t, light_delay=False):
+        """Barycentric position of each secondary."""
+        return self._get_position(self.a_planet, t, light_delay=light_delay)
+
+    def get_star_velocity(self, t):
+        """Barycentric velocity of the primary due to each secondary."""
+        sinf, cosf = self._get_true_anomaly(tt.as_tensor_variable(t))
+        K = self.K0 * self.m_planet
+        return self._rotate_vector(-K * sinf, K * (cosf + self.ecc))
+
+    def get_radial_velocity(self, t):
+        """Radial velocity of the primary in m/s due to each secondary."""
+        return -rv_factor * self.get_star_velocity(t)[2]
@@ -1,20 +1,34 @@
 # -*- coding: utf-8 -*-
 from .. import config
 from ..compat import Node, change_flags, theano, tt, is_tensor
+from ..compat import destroyhandler
 import numpy as np
+from collections import OrderedDict
 from functools import wraps
+import hashlib
 import logging
+import os
 import sys
+import threading
 
 logger = logging.getLogger("starry.ops")
 
-__all__ = ["logger", "autocompile", "is_tensor", "clear_cache"]
+__all__ = [
+    "logger",
+    "autocompile",
+    "is_tensor",
+    "clear_cache",
+    "DesignMatrixCache",
+]
 
 
 booleans = (np.array(True).dtype,)
 integers = (int, np.int16, np.int32, np.int64)
 floats = (float, np.float16, np.float32, np.float64)
 
+# Compilation is not thread-safe, so we only compile one function at a time
+_compile_lock = threading.RLock()
+
 
 class CompileLogMessage:
     """
@@ -32,15 +46,14 @@ class CompileLogMessage:
         if not config.message_lock:
             config.message_lock = True
             self.locking = True
-            config.rootHandler.terminator = ""
             if self.custom_message is None:
-                logger.info("Compiling `{0}`...".format(self.name))
+                message = "Compiling `{0}`...".format(self.name)
             else:
-                logger.info(self.custom_message)
+                message = self.custom_message
+            logger.info(message, extra={"terminator": ""})
 
     def __exit__(self, type, value, traceback):
         if self.locking:
-            config.rootHandler.terminator = "\n"
             logger.info(" Done.")
             config.message_lock = False
             self.locking = False
@@ -56,6 +69,10 @@ def _get_type(arg):
         - a numpy boolean (`np.array(True)`, `np.array(False)`)
         - a numpy float array with ndim equal to 0, 1, 2, or 3
 
+    Single precision arrays are mapped to single precision types (and
+    upcast within the graph by ``autocompile``), so they are not copied
+    when passed to the compiled function.
+
     TODO: We could just do `tt.as_tensor_variable(arg).type` and then upcast...
 
     """
@@ -95,6 +112,8 @@ def _get_type(arg):
                     return tt.bvector
                 elif arg.dtype in integers:
                     return tt.lvector
+                elif arg.dtype == np.float32:
+                    return tt.fvector
                 else:
                     return tt.dvector
             elif arg.ndim == 2:
@@ -102,6 +121,8 @@ def _get_type(arg):
                     return tt.bmatrix
                 elif arg.dtype in integers:
                     return tt.lmatrix
+                elif arg.dtype == np.float32:
+                    return tt.fmatrix
                 else:
                     return tt.dmatrix
             elif arg.ndim == 3:
@@ -109,6 +130,8 @@ def _get_type(arg):
                     return tt.btensor3
                 elif arg.dtype in integers:
                     return tt.ltensor3
+                elif arg.dtype == np.float32:
+                    return tt.ftensor3
                 else:
                     return tt.dtensor3
             else:
@@ -125,12 +148,50 @@ def _get_type(arg):
             )
 
 
-def autocompile(func):
+def _upcast(arg):
+    """Cast single precision tensors to double precision."""
+    if arg.dtype == "float32":
+        return tt.cast(arg, "float64")
+    else:
+        return arg
+
+
+def _downcast(output):
+    """Cast double precision tensor outputs to single precision."""
+    if isinstance(output, (list, tuple)):
+        return [_downcast(out) for out in output]
+    elif (
+        isinstance(getattr(output, "type", None), tt.TensorType)
+        and output.dtype == "float64"
+    ):
+        return tt.cast(output, "float32")
+    else:
+        return output
+
+
+def autocompile(func=None, downcast=False):
     """
     Wrap the method `func` and return a compiled version
     if none of the arguments are tensors.
 
+    The graph is always built in double precision. If `downcast`
+    is True and ``config.precision`` is ``single``, the outputs of
+    the compiled function are cast to single precision; this is
+    meant for large outputs such as design matrices and images.
+    Use it as ``@autocompile(downcast=True)``. Note that this only
+    changes the type of the outputs: the function is evaluated in
+    double precision, so it is no faster and its peak memory use
+    is not reduced.
+
+    Compiled functions hold their own input and output storage,
+    so they may not be called from several threads at once.
+    Threads other than the main thread therefore call copies of
+    the compiled function, which share its graph but have their
+    own storage, checked out from a :py:class:`FunctionPool`.
+
     """
+    if func is None:
+        return lambda func: autocompile(func, downcast=downcast)
 
     @wraps(func)  # inherit docstring
     def wrapper(instance, *args):
@@ -146,40 +207,218 @@ def autocompile(func):
             arg_types = tuple([_get_type(arg) for arg in args])
 
             # Get a unique name for the compiled function
+            single = downcast and (config.precision == "single")
+            key = (arg_types, single)
             cname = "__{}_{}".format(
-                func.__name__, hex(hash(arg_types) % ((sys.maxsize + 1) * 2))
+                func.__name__, hex(hash(key) % ((sys.maxsize + 1) * 2))
             )
 
-            # Compile the function if needed & cache it
-            if not hasattr(instance, cname):
-
+            def compile():
                 dummy_args = [arg_type() for arg_type in arg_types]
-
-                # Compile the function
                 with CompileLogMessage(func.__name__):
                     with change_flags(compute_test_value="off"):
-                        compiled_func = theano.function(
+                        outputs = func(
+                            instance, *[_upcast(arg) for arg in dummy_args]
+                        )
+                        if single:
+                            outputs = _downcast(outputs)
+                        return theano.function(
                             [*dummy_args],
-                            func(instance, *dummy_args),
+                            outputs,
                             on_unused_input="ignore",
                             profile=config.profile,
                             mode=config.mode,
                         )
-                    setattr(instance, cname, compiled_func)
+
+            # Compile the function if needed & cache it
+            if not hasattr(instance, cname):
+                with _compile_lock:
+                    if not hasattr(instance, cname):
+                        setattr(instance, cname, compile())
+            compiled = getattr(instance, cname)
 
             # Return the compiled version
-            return getattr(instance, cname)(*args)
+            if threading.current_thread() is threading.main_thread():
+                return compiled(*args)
+
+            # Other threads call a copy of it
+            pname = "{}_pool".format(cname)
+            if not hasattr(instance, pname):
+                with _compile_lock:
+                    if not hasattr(instance, pname):
+                        setattr(instance, pname, FunctionPool(compiled))
+            pool = getattr(instance, pname)
+            copy = pool.get()
+            try:
+                return copy(*args)
+            finally:
+                pool.put(copy)
 
     return wrapper
 
 
-def clear_cache(instance, func):
+def _copy_function(func):
+    """
+    Return a copy of the compiled function `func` that shares its graph
+    but has its own storage.
+
+    Note that ``Function.copy`` does not attach a ``DestroyHandler`` to
+    the graph of the copy, so the linker no longer schedules the in-place
+    operations inserted by the optimizer after the other operations that
+    read the variables they overwrite. We attach one and link the graph
+    again.
+
+    """
+    maker = func.copy(share_memory=False).maker
+    if not hasattr(maker.fgraph, "destroyers"):
+        maker.fgraph.attach_feature(destroyhandler.DestroyHandler())
+    copy = maker.create([i.value for i in maker.inputs])
+    copy.unpack_single = func.unpack_single
+    copy.return_none = func.return_none
+    return copy
+
+
+class FunctionPool(object):
+    """
+    A pool of copies of the compiled function `func`, for use by threads
+    other than the main thread. Threads check out a copy with :py:meth:`get`
+    and return it with :py:meth:`put`; at most `size` idle copies (by
+    default, one per CPU) are kept for later calls.
+
+    """
+
+    def __init__(self, func, size=None):
+        self.func = func
+        self.size = size if size is not None else (os.cpu_count() or 1)
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._idle)
+
+    def get(self):
+        """Check out an idle copy of the function or make a new one."""
+        with self._lock:
+            if len(self._idle):
+                return self._idle.pop()
+        with _compile_lock:
+            return _copy_function(self.func)
+
+    def put(self, func):
+        """Return a copy of the function to the pool."""
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(func)
+
+
+def clear_cache(instance, func=None):
     """
     Clear the compiled function cache for method `func` of a class
-    instance `instance`.
+    instance `instance`. If `func` is None, clears the cache for
+    all methods.
 
     """
-    basename = "__{}_".format(func.__name__)
+    if func is None:
+        basename = "__"
+    else:
+        basename = "__{}_".format(func.__name__)
     for key in list(instance.__dict__.keys()):
         if key.startswith(basename):
             delattr(instance, key)
+
+
+class DesignMatrixCache(object):
+    """
+    A bounded LRU cache for design matrices evaluated in greedy mode.
+
+    Matrices are keyed on the name of the function that computes them,
+    a hash of the values (not the identities) of all its arguments, the
+    value of ``config.precision`` and the current generation (see
+    :py:meth:`invalidate`), so any change to these results in a new
+    computation. The cache holds at most `size` matrices taking up at
+    most `memory` megabytes. A cache of size zero, or one called with
+    tensor arguments, simply calls the function.
+
+    """
+
+    # Incremented by `invalidate`
+    _generation = 0
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Invalidate the matrices in all caches. This should be called
+        whenever a setting that is not an argument of the cached functions
+        but affects their output (such as the occultation tables) changes.
+
+        """
+        cls._generation += 1
+
+    def __init__(self, size=0, memory=256):
+        self.size = int(size)
+        assert self.size >= 0, "Parameter `cache_size` must be >= 0."
+        self.memory = int(memory * 1024 ** 2)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __getstate__(self):
+        # Locks can't be pickled, and there's no need to ship the
+        # cached matrices around
+        return dict(size=self.size, memory=self.memory)
+
+    def __setstate__(self, state):
+        self.size = state["size"]
+        self.memory = state["memory"]
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """Remove all matrices from the cache."""
+        with self._lock:
+            self._cache.clear()
+
+    def __call__(self, func, *args):
+        """Return ``func(*args)``, caching the most recent results."""
+        if self.size == 0 or is_tensor(*args):
+            return func(*args)
+
+        # Hash the function name, the settings and the values of all
+        # the arguments
+        key = hashlib.sha1()
+        key.update(
+            "{0}:{1}:{2}".format(
+                getattr(func, "__qualname__", repr(func)),
+                config.precision,
+                DesignMatrixCache._generation,
+            ).encode()
+        )
+        for arg in args:
+            arg = np.ascontiguousarray(arg, dtype=np.float64)
+            key.update(str(arg.shape).encode())
+            key.update(arg.tobytes())
+        key = key.hexdigest()
+
+        with self._lock:
+            X = self._cache.pop(key, None)
+            if X is not None:
+                self._cache[key] = X
+        if X is None:
+            X = func(*args)
+            with self._lock:
+                self._cache[key] = X
+
+                # Enforce the size and memory limits
+                while (len(self._cache) > self.size) or (
+                    len(self._cache) > 1
+                    and sum(M.nbytes for M in self._cache.values())
+                    > self.memory
+                ):
+                    self._cache.popitem(last=False)
+                if X.nbytes > self.memory:
+                    self._cache.pop(key, None)
+
+        # Return a copy, since users may modify it in place
+        return np.array(X)
@@ -21,7 +21,13 @@ import aesara_theano_fallback.tensor as tt
 from aesara_theano_fallback import sparse as ts
 from aesara_theano_fallback import change_flags, ifelse, USE_AESARA
 from aesara_theano_fallback.tensor import slinalg
-from aesara_theano_fallback.graph import basic, op, params_type, fg
+from aesara_theano_fallback.graph import (
+    basic,
+    op,
+    params_type,
+    fg,
+    destroyhandler,
+)
 from inspect import getmro
 
 
@@ -34,11 +40,18 @@ else:
         from theano.scan_module.scan_utils import until as scan_until
 
 
+if USE_AESARA:
+    from aesara.tensor import fft
+else:
+    from theano.tensor import fft
+
+
 __all__ = [
     "theano",
     "tt",
     "ts",
     "slinalg",
+    "fft",
     "ifelse",
     "Apply",
     "COp",
@@ -50,6 +63,7 @@ __all__ = [
     "floatX",
     "evaluator",
     "scan_until",
+    "destroyhandler",
     "USE_AESARA",
 ]
 
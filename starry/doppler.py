@@ -7,21 +7,27 @@ from ._core.math import nadam
 from ._indices import integers, get_ylm_inds, get_ylmw_inds, get_ul_inds
 from .compat import evaluator, tt
 from .maps import YlmBase, MapBase, Map
-from .doppler_visualize import Visualize
 from .doppler_solve import Solve
 import numpy as np
 from scipy.ndimage import zoom
 from scipy.interpolate import InterpolatedUnivariateSpline as Spline
-from scipy.sparse import block_diag as sparse_block_diag
-from scipy.sparse import csr_matrix
+from scipy.sparse import kron as sparse_kron
+from scipy.sparse import eye as sparse_eye
+from scipy.sparse import hstack as sparse_hstack
+from scipy.sparse import csr_matrix, csc_matrix
+from scipy.sparse.linalg import splu
 from warnings import warn
 import os
-import matplotlib.pyplot as plt
-from matplotlib.colors import Normalize
+import json
+import time
 from astropy import units
 from tqdm.auto import tqdm
 
 
+# Autotuning results for each map shape (see ``DopplerMap.autotune``)
+_autotune_cache = {}
+
+
 class DopplerMap:
     """
     Class representing a spectral-spatial stellar surface.
@@ -101,6 +107,14 @@ class DopplerMap:
             to ensure that ``map.veq * sin(map.inc)`` is never larger than
             this quantity. Lower values of this quantity will result in faster
             evaluation times. Default is ``100 km/s``.
+        conv_method (str, optional): The strategy used to compute the
+            convolutions of the spectra with the rotational broadening
+            kernels. Options are ``direct`` (via ``conv2d``), ``fft``
+            (via fast Fourier transforms), or ``auto`` (default), which
+            selects ``fft`` only when the kernels are very wide compared
+            to the logarithm of the size of the wavelength grid. The
+            ``fft`` strategy is usually faster for high resolution
+            spectra and large values of :py:attr:`vsini_max`.
         angle_unit (``astropy.units.Unit``, optional): The unit used for
             angular quantities. Default ``deg``.
         velocity_unit (``astropy.units.Unit``, optional): The unit used for
@@ -304,35 +318,25 @@ class DopplerMap:
 
             # Interpolate from `wav_` to `wav`
             # These are used to interpolate the model and the design
-            # matrix from the internal (i) onto the external (e) grid
+            # matrix from the internal (i) onto the external (e) grid.
+            # Note that we never instantiate the block diagonal operators
+            # that act on all epochs at once; see ``_dot_Si2eBlk``.
             S = self._get_spline_operator(wav_int, wav)
-            S[np.abs(S) < interp_tol] = 0
-            S = csr_matrix(S)
+            self._Si2e_csr = S
+            self._Si2e = self._math.sparse_cast(S)
             self._Si2eTr = self._math.sparse_cast(S.T)
-            self._Si2eBlk = self._math.sparse_cast(
-                sparse_block_diag([S for n in range(nt)], format="csr")
-            )
-            self._Si2eTrBlk = self._math.sparse_cast(
-                sparse_block_diag([S.T for n in range(nt)], format="csr")
-            )
 
             # Interpolate from `wav0_` to `wav0`
             S = self._get_spline_operator(wav0_int, wav0)
-            S[np.abs(S) < interp_tol] = 0
-            S = csr_matrix(S)
             self._S0i2e = self._math.sparse_cast(S)
             self._S0i2eTr = self._math.sparse_cast(S.T)
 
             # Interpolate from `wav` to `wav_`
             S = self._get_spline_operator(wav, wav_int)
-            S[np.abs(S) < interp_tol] = 0
-            S = csr_matrix(S)
             self._Se2i = self._math.sparse_cast(S)
 
             # Interpolate from `wav0` to `wav0_`
             S = self._get_spline_operator(wav0, wav0_int)
-            S[np.abs(S) < interp_tol] = 0
-            S = csr_matrix(S)
             self._S0e2i = self._math.sparse_cast(S)
             self._S0e2iTr = self._math.sparse_cast(S.T)
 
@@ -356,6 +360,7 @@ class DopplerMap:
             vsini_max,
             self._clight,
             log_wav0_int,
+            conv_method=kwargs.pop("conv_method", "auto"),
             **kwargs,
         )
 
@@ -374,6 +379,9 @@ class DopplerMap:
         # Linear solver
         self._solver = Solve(self)
 
+        # Fastest flux method (set by ``autotune``)
+        self._auto_method = None
+
     @property
     def lazy(self):
         """Map evaluation mode -- lazy or greedy?"""
@@ -812,6 +820,7 @@ class DopplerMap:
         smoothing=None,
         fac=1.0,
         eps=1e-12,
+        svd="auto",
     ):
         """Load a spatial and/or spectral representation of a stellar surface.
 
@@ -831,6 +840,12 @@ class DopplerMap:
         surface maps and spectra (the "eigen" components) that best approximate
         the input.
 
+        Data cubes that do not fit in memory may be passed as memory-mapped
+        arrays, as the path to a ``.npy`` file (which is memory-mapped), or
+        as an HDF5 dataset (such as an ``h5py.Dataset``). These are read in
+        chunks of latitude rows by a randomized truncated SVD that computes
+        only the leading :py:attr:`nc` components.
+
         Args:
             map (str or ndarray, optional): A list or ``ndarray`` of
                 surface maps on a rectangular latitude-longitude grid. This
@@ -843,7 +858,8 @@ class DopplerMap:
             cube (ndarray, optional): A 3-dimensional ``ndarray`` of shape
                 (``nlat``, ``nlon``, :py:attr:`nw0`) containing the spectra
                 at each position on a latitude-longitude grid spanning the
-                entire surface.
+                entire surface. This may also be a memory-mapped array, an
+                HDF5 dataset, or the path to a ``.npy`` file.
             smoothing (float, optional): Gaussian smoothing strength.
                 Increase this value to suppress ringing or explicitly set to zero to
                 disable smoothing. Default is ``2/self.ydeg``.
@@ -853,6 +869,12 @@ class DopplerMap:
                 computational time).
             eps (float, optional): Regularization strength for the spherical
                 harmonic transform. Default is ``1e-12``.
+            svd (str, optional): The SVD algorithm used to decompose the
+                ``cube``. Options are ``full`` (a full SVD of the entire cube,
+                which must fit in memory) and ``randomized`` (a randomized
+                truncated SVD, which reads the cube in chunks). Default is
+                ``auto``, which uses ``full`` for in-memory arrays and
+                ``randomized`` otherwise.
         """
         # Aliases
         if maps is None:
@@ -914,6 +936,8 @@ class DopplerMap:
                                 raise ValueError("File not found: %s." % image)
 
                         # Load the image into an ndarray
+                        import matplotlib.pyplot as plt
+
                         image = plt.imread(image)
 
                         # If it's an integer, normalize to [0-1]
@@ -990,6 +1014,10 @@ class DopplerMap:
             # User is loading a full data cube
             # --------------------------------
 
+            # Memory-map cubes stored on disk
+            if type(cube) is str:
+                cube = np.load(cube, mmap_mode="r")
+
             # Input checks
             assert not is_tensor(cube)
             assert cube.ndim == 3
@@ -998,13 +1026,23 @@ class DopplerMap:
             nlon = cube.shape[1]
 
             # Singular value decomposition
-            M = cube.reshape(nlat * nlon, self.nw0)
-            U, s, VT = np.linalg.svd(M, full_matrices=False)
+            if svd == "auto":
+                if type(cube) is np.ndarray:
+                    svd = "full"
+                else:
+                    svd = "randomized"
+            if svd == "full":
+                M = np.reshape(cube, (nlat * nlon, self.nw0))
+                U, s, VT = np.linalg.svd(M, full_matrices=False)
+                U = U[:, : self.nc]
+                VT = VT[: self.nc, :]
+                s = s[: self.nc]
+            elif svd == "randomized":
+                U, s, VT = self._get_randomized_svd(cube)
+            else:
+                raise ValueError("Invalid value for `svd`.")
 
-            # Keep only `nc` components; absorb singular values into `U`
-            U = U[:, : self.nc]
-            VT = VT[: self.nc, :]
-            s = s[: self.nc]
+            # Absorb the singular values into `U`
             U = U * s
 
             # --------------------------------------
@@ -1044,18 +1082,176 @@ class DopplerMap:
                 self._math.cast(y), (self.Ny, self.nc)
             )
 
-    def _get_spline_operator(self, input_grid, output_grid):
-        """ """
+    def _get_randomized_svd(
+        self, cube, oversample=10, niter=2, chunk=2 ** 24, seed=0
+    ):
+        """
+        Return the leading :py:attr:`nc` singular values and vectors of the
+        (``nlat * nlon``, :py:attr:`nw0`) matrix formed by flattening the
+        spatial dimensions of `cube`.
+
+        This uses the randomized range finder of Halko et al. (2011) with
+        `oversample` extra columns and `niter` power iterations. The cube is
+        only ever accessed in chunks of whole latitude rows containing at
+        most `chunk` elements, so it may be memory-mapped or stored in an
+        HDF5 dataset; each pass over the cube reads it exactly once.
+
+        """
+        nlat, nlon, nw0 = cube.shape
+        nrows = max(1, chunk // (nlon * nw0))
+        chunks = [
+            slice(i, min(i + nrows, nlat)) for i in range(0, nlat, nrows)
+        ]
+        rank = min(self.nc + oversample, nlat * nlon, nw0)
+
+        def rows(c):
+            return np.reshape(np.asarray(cube[c], dtype="float64"), (-1, nw0))
+
+        def dot(X):
+            # The product `M @ X`
+            return np.concatenate([rows(c) @ X for c in chunks])
+
+        def dotT(Y):
+            # The product `M^T @ Y`
+            MTY = np.zeros((nw0, Y.shape[1]))
+            for c in chunks:
+                M = rows(c)
+                MTY += M.T @ Y[c.start * nlon : c.stop * nlon]
+            return MTY
+
+        # Find an orthonormal basis for the range of `M`
+        Omega = np.random.default_rng(seed).normal(size=(nw0, rank))
+        Q, _ = np.linalg.qr(dot(Omega))
+        for n in range(niter):
+            Q, _ = np.linalg.qr(dotT(Q))
+            Q, _ = np.linalg.qr(dot(Q))
+
+        # SVD of the projection of `M` onto this basis
+        U, s, VT = np.linalg.svd(dotT(Q).T, full_matrices=False)
+        U = Q @ U[:, : self.nc]
+        return U, s[: self.nc], VT[: self.nc, :]
+
+    def _get_spline_operator(self, input_grid, output_grid, chunk=256):
+        """
+        Return the sparse matrix that interpolates a function sampled on
+        `input_grid` onto `output_grid` with an interpolating spline of
+        order :py:attr:`interp_order`.
+
+        The spline coefficients are the solution to a linear system whose
+        matrix is the (banded) B-spline basis evaluated on the input grid,
+        so the operator is equal to the B-spline basis evaluated on the
+        output grid dotted into the inverse of that matrix. The knots are
+        the same as those used by ``InterpolatedUnivariateSpline``. For
+        linear splines, the inverse is the identity; otherwise, we apply it
+        to `chunk` columns at a time, discarding elements smaller than
+        :py:attr:`interp_tol` as we go.
+
+        """
         assert not is_tensor(
             input_grid, output_grid
         ), "Wavelength grids must be numerical quantities."
-        S = np.zeros((len(output_grid), len(input_grid)))
-        for n in range(len(input_grid)):
-            y = np.zeros_like(input_grid)
-            y[n] = 1.0
-            S[:, n] = Spline(input_grid, y, k=self._interp_order)(output_grid)
+        input_grid = np.array(input_grid, dtype="float64")
+        output_grid = np.array(output_grid, dtype="float64")
+        k = self._interp_order
+        n = len(input_grid)
+
+        # The full knot vector
+        knots = Spline(input_grid, np.zeros(n), k=k).get_knots()
+        t = np.concatenate(
+            (np.ones(k) * knots[0], knots, np.ones(k) * knots[-1])
+        )
+
+        # The interpolation operator
+        S = self._get_bspline_basis(output_grid, t, k)
+        if k > 1:
+            lu = splu(csc_matrix(self._get_bspline_basis(input_grid, t, k)))
+            blocks = []
+            for i in range(0, n, chunk):
+                m = min(chunk, n - i)
+                I = np.zeros((n, m))
+                I[i + np.arange(m), np.arange(m)] = 1.0
+                block = S.dot(lu.solve(I))
+                block[np.abs(block) < self._interp_tol] = 0
+                blocks.append(csr_matrix(block))
+            S = sparse_hstack(blocks, format="csr")
+        else:
+            S.data[np.abs(S.data) < self._interp_tol] = 0
+            S.eliminate_zeros()
         return S
 
+    def _get_bspline_basis(self, x, t, k):
+        """
+        Return the sparse matrix of B-splines of order `k` with knots `t`
+        evaluated at the points `x`, computed with the Cox-de Boor
+        recursion. Points outside the knot span are extrapolated from
+        the first or last polynomial piece.
+
+        """
+        n = len(t) - k - 1
+        npts = len(x)
+
+        # Index of the knot interval containing each point
+        l = np.clip(np.searchsorted(t, x, side="right") - 1, k, n - 1)
+
+        # The `k + 1` nonzero B-splines at each point
+        B = np.zeros((npts, k + 1))
+        B[:, 0] = 1.0
+        left = np.zeros((npts, k + 1))
+        right = np.zeros((npts, k + 1))
+        for j in range(1, k + 1):
+            left[:, j] = x - t[l + 1 - j]
+            right[:, j] = t[l + j] - x
+            saved = np.zeros(npts)
+            for r in range(j):
+                tmp = B[:, r] / (right[:, r + 1] + left[:, j - r])
+                B[:, r] = saved + right[:, r + 1] * tmp
+                saved = left[:, j - r] * tmp
+            B[:, j] = saved
+
+        # Assemble the sparse matrix
+        rows = np.repeat(np.arange(npts), k + 1)
+        cols = np.reshape(l.reshape(-1, 1) - k + np.arange(k + 1), (-1,))
+        return csr_matrix(
+            (B.reshape(-1), (rows, cols)), shape=(npts, n), dtype="float64"
+        )
+
+    def _dot_Si2eBlk(self, x, transpose=False, sparse=False):
+        """
+        Dot the block diagonal operator made up of :py:attr:`nt` copies of
+        the interpolation operator from the internal to the external
+        wavelength grid (or its transpose) into the vector or matrix `x`.
+
+        If `x` is dense, this is done without instantiating the block
+        diagonal operator by dotting the interpolation operator into a
+        reshaped version of `x`. If `sparse` is True, `x` is a sparse
+        matrix, which is dotted into the (explicit) Kronecker product of
+        the identity and the interpolation operator.
+
+        """
+        if transpose:
+            S, nin, nout = self._Si2eTr, self.nw, self.nw_
+        else:
+            S, nin, nout = self._Si2e, self.nw_, self.nw
+
+        if sparse:
+            S = sparse_kron(sparse_eye(self.nt), self._Si2e_csr, format="csr")
+            if transpose:
+                S = S.T.tocsr()
+            return self._math.sparse_dot(self._math.sparse_cast(S), x)
+
+        # Stack the epochs along the columns, interpolate, and unstack
+        ndim = x.ndim
+        x = self._math.reshape(x, (self.nt, nin, -1))
+        x = self._math.reshape(self._math.transpose(x, (1, 0, 2)), (nin, -1))
+        x = self._math.sparse_dot(S, x)
+        x = self._math.transpose(
+            self._math.reshape(x, (nout, self.nt, -1)), (1, 0, 2)
+        )
+        if ndim == 1:
+            return self._math.reshape(x, (-1,))
+        else:
+            return self._math.reshape(x, (self.nt * nout, -1))
+
     def _get_default_theta(self, theta):
         """ """
         if theta is None:
@@ -1258,7 +1454,7 @@ class DopplerMap:
 
         # Interpolate to the output grid
         if self._interp:
-            D = self._math.sparse_dot(self._Si2eBlk, D)
+            D = self._dot_Si2eBlk(D, sparse=not (fix_spectrum or fix_map))
 
         return D
 
@@ -1279,14 +1475,16 @@ class DopplerMap:
                 observable effect, since spectrographs aren't designed to
                 preserve this information!
             method (str, optional): The strategy for computing the flux. Must
-                be one of ``dotconv``, ``convdot``, ``conv``, or ``design``.
-                Default is ``dotconv``, which is the fastest method in most
-                cases. All three of ``dotconv``, ``convdot``, and ``conv``
-                compute the flux via fast two-dimensional convolutions
-                (via ``conv2d``), while ``design`` computes the flux by
-                instantiating the design matrix and dotting it in. This last
-                method is usually extremely slow and memory intensive; its
-                use is not recommended in general.
+                be one of ``dotconv``, ``convdot``, ``conv``, ``design``, or
+                ``auto``. Default is ``dotconv``, which is the fastest method
+                in most cases. All three of ``dotconv``, ``convdot``, and
+                ``conv`` compute the flux via fast convolutions, while
+                ``design`` computes the flux by instantiating the design
+                matrix and dotting it in. This last method is usually
+                extremely slow and memory intensive; its use is not
+                recommended in general. If ``auto``, uses the fastest method
+                for maps of this shape, as determined by
+                :py:meth:`autotune` (which is called if needed).
 
         This method returns a matrix of shape (:py:attr:`nt`, :py:attr:`nw`)
         corresponding to the model for the observed spectrum (evaluated on the
@@ -1294,6 +1492,10 @@ class DopplerMap:
 
         """
         theta = self._get_default_theta(theta)
+        if method == "auto":
+            if self._auto_method is None:
+                self.autotune()
+            method = self._auto_method
         if method == "dotconv":
             flux = self.ops.get_flux_from_dotconv(
                 self._inc, theta, self._veq, self._u, self._y, self._spectrum
@@ -1313,7 +1515,7 @@ class DopplerMap:
         else:
             raise ValueError(
                 "Keyword ``method`` must be one of ``dotconv``, "
-                "``convdot``, ``conv``, or ``design``."
+                "``convdot``, ``conv``, ``design``, or ``auto``."
             )
 
         # Interpolate to the output grid
@@ -1328,6 +1530,129 @@ class DopplerMap:
 
         return flux
 
+    def autotune(self, file=None, nrep=5, force=False):
+        """
+        Find the fastest strategy for computing the spectral model.
+
+        This method times the ``dotconv``, ``convdot``, and ``conv``
+        methods of :py:meth:`flux` using both the ``direct`` and ``fft``
+        convolution strategies (see the ``conv_method`` keyword of this
+        class). The fastest convolution strategy is then used by
+        :py:meth:`flux`, :py:meth:`dot`, :py:meth:`design_matrix`, and
+        :py:meth:`solve`, and the fastest flux method is used whenever
+        :py:meth:`flux` is called with ``method="auto"``.
+
+        The results are cached in memory and shared among all maps with the
+        same dimensions, so the benchmark runs only once per map shape
+        and session. They can also be cached on disk across sessions.
+
+        Args:
+            file (str, optional): Path to a JSON file in which to cache the
+                results. If it exists and contains results for maps of this
+                shape, these are used instead of running the benchmark.
+                Default is None (no disk cache).
+            nrep (int, optional): Number of timed evaluations of each
+                strategy. The fastest of these is recorded. Default is 5.
+            force (bool, optional): If True, runs the benchmark even if
+                results are cached. Default is False.
+
+        Returns:
+            A dictionary containing the selected ``conv_method`` and
+            ``method``, as well as the table of ``timings`` (in seconds),
+            a nested dictionary indexed by convolution strategy and
+            flux method.
+        """
+        key = ",".join(
+            str(n)
+            for n in (
+                self.ydeg,
+                self.udeg,
+                self.nc,
+                self.nt,
+                self.nw_,
+                self.nw0_,
+                self.ops.nk,
+            )
+        )
+
+        # Check the disk cache
+        cache = {}
+        if file is not None and os.path.exists(file):
+            with open(file, "r") as f:
+                cache = json.load(f)
+            if not force and key in cache:
+                _autotune_cache[key] = cache[key]
+
+        # Run the benchmark
+        if force or key not in _autotune_cache:
+            with CompileLogMessage(
+                "autotune", custom_message="Autotuning the Doppler ops..."
+            ):
+                _autotune_cache[key] = self._autotune(nrep)
+            if file is not None:
+                cache[key] = _autotune_cache[key]
+                with open(file, "w") as f:
+                    json.dump(cache, f, indent=2)
+
+        # Apply the results. Note that we need to re-instantiate the
+        # solver if the convolution strategy changed, since it may
+        # hold on to compiled functions.
+        result = _autotune_cache[key]
+        conv_method = self.ops.conv_method
+        self.ops.conv_method = result["conv_method"]
+        if self.ops.conv_method != conv_method:
+            self._solver = Solve(self)
+        self._auto_method = result["method"]
+        return result
+
+    def _autotune(self, nrep):
+        """
+        Benchmark all strategies for computing the flux.
+
+        """
+        # Numerical inputs; the timings don't depend on their values
+        theta = np.linspace(0, 2 * np.pi, self.nt, endpoint=False)
+        inc = 0.5 * np.pi
+        veq = 0.5 * self.ops.vsini_max
+        u = np.zeros(self.Nu)
+        u[0] = -1.0
+        y = np.zeros((self.Ny, self.nc))
+        y[0] = 1.0
+        spectrum = np.ones((self.nc, self.nw0_))
+        spectral_map = np.reshape(np.dot(y, spectrum), (-1,))
+        funcs = {
+            "dotconv": lambda: self.ops.get_flux_from_dotconv(
+                inc, theta, veq, u, y, spectrum
+            ),
+            "convdot": lambda: self.ops.get_flux_from_convdot(
+                inc, theta, veq, u, y, spectrum
+            ),
+            "conv": lambda: self.ops.get_flux_from_conv(
+                inc, theta, veq, u, spectral_map
+            ),
+        }
+
+        # Time everything (after compiling)
+        timings = {}
+        for conv_method in ["direct", "fft"]:
+            self.ops.conv_method = conv_method
+            timings[conv_method] = {}
+            for method, func in funcs.items():
+                func()
+                elapsed = []
+                for n in range(nrep):
+                    tstart = time.perf_counter()
+                    func()
+                    elapsed.append(time.perf_counter() - tstart)
+                timings[conv_method][method] = min(elapsed)
+
+        # Pick the winner
+        conv_method, method = min(
+            [(c, m) for c in timings for m in timings[c]],
+            key=lambda cm: timings[cm[0]][cm[1]],
+        )
+        return dict(conv_method=conv_method, method=method, timings=timings)
+
     def baseline(self, theta=None, full=False):
         """
         Return the photometric baseline at each epoch.
@@ -1437,7 +1762,7 @@ class DopplerMap:
 
             # Interpolate from `wav` to `wav_` at each epoch
             if self._interp:
-                x = self._math.sparse_dot(self._Si2eTrBlk, x)
+                x = self._dot_Si2eBlk(x, transpose=True)
 
             if fix_spectrum:
 
@@ -1483,7 +1808,7 @@ class DopplerMap:
 
             # Interpolate from `wav_` to `wav` at each epoch
             if self._interp:
-                product = self._math.sparse_dot(self._Si2eBlk, product)
+                product = self._dot_Si2eBlk(product)
 
         return product
 
@@ -1492,6 +1817,9 @@ class DopplerMap:
         Visualize the map using bokeh.
 
         """
+        # Bokeh is slow to import, so we defer it until needed
+        from .doppler_visualize import Visualize
+
         with CompileLogMessage("show", custom_message="Rendering the map..."):
 
             get_val = evaluator(**kwargs)
@@ -1567,6 +1895,10 @@ class DopplerMap:
         Show the individual component surface maps and spectra.
 
         """
+        # Plotting imports are slow, so we defer them until needed
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import Normalize
+
         # If we're in lazy mode, we need to evaluate stuff
         get_val = evaluator(**kwargs)
 
@@ -1846,7 +2178,8 @@ class DopplerMap:
                 the L1 solver. Increasing this value increases the sparsity of
                 the solution. Default is `1e5`.
             spectral_maxiter (int, optional): Maximum number of iterations in
-                the L1 solver. Default is `100`.
+                the L1 solver. Default is `100` for the "ridge" solver and
+                `1000` for the "fista" solver.
             spectral_eps (float, optional): Small parameter added to the
                 diagonal of the spectral covariance matrix for stability.
                 Default is `1e-12`.
@@ -1857,6 +2190,14 @@ class DopplerMap:
                 solving for both the spectrum and the map, the L1 solver is
                 used to obtain an initial guess for the spectrum, regardless
                 of this setting.
+            spectral_solver (str, optional): The algorithm used to solve
+                the L1 problem. Options are "ridge" (default), which uses
+                iterated ridge regression, and "fista", which uses a
+                proximal gradient method restricted to an active set of
+                wavelength bins. The latter avoids a matrix
+                factorization at every iteration and is warm-started from
+                the current spectrum, so it is usually much faster for
+                large problems.
             normalized (bool, optional): Whether the ``flux`` dataset is
                 continuum-normalized. Default is True. If it is normalized, the
                 solution for the map is non-linear, but typically converges
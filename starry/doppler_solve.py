@@ -32,6 +32,18 @@ class Solve:
         self.interp = map._interp
         self.continuum_idx = map._continuum_idx
 
+        # The interpolation operator from the internal to the external
+        # wavelength grid and the half-width of the bands of `S^T S`
+        if self.interp:
+            self.Si2e = map._Si2e_csr
+            rows = [
+                self.Si2e.indices[i:j]
+                for i, j in zip(self.Si2e.indptr[:-1], self.Si2e.indptr[1:])
+            ]
+            self.interp_hw = max(
+                [int(np.ptp(row)) for row in rows if len(row)] + [0]
+            )
+
         # Methods and matrices
         if map.lazy:
 
@@ -56,11 +68,12 @@ class Solve:
             maxiter = tt.iscalar()
             eps = tt.dscalar()
             tol = tt.dscalar()
+            w0 = tt.dvector()
 
             # Design matrix conditioned on current spectrum
             f = map.ops.get_D_fixed_spectrum(inc, theta, veq, u, spectrum_)
             if map._interp:
-                f = ts.dot(map._Si2eBlk, f)
+                f = map._dot_Si2eBlk(f)
             _get_S = theano.function(
                 [inc, theta, veq, u, spectrum_], f, on_unused_input="ignore"
             )
@@ -73,7 +86,7 @@ class Solve:
                 inc, theta, veq, u, y, x
             )
             if map._interp:
-                f = ts.dot(map._Si2eBlk, f)
+                f = map._dot_Si2eBlk(f)
             _dotM = theano.function(
                 [inc, theta, veq, u, y, x], f, on_unused_input="ignore"
             )
@@ -86,7 +99,7 @@ class Solve:
                 inc, theta, veq, u, y, x
             )
             if map._interp:
-                f = ts.dot(map._Si2eBlk, f)
+                f = map._dot_Si2eBlk(f)
             _dotMT = theano.function(
                 [inc, theta, veq, u, y, x], f, on_unused_input="ignore"
             )
@@ -94,6 +107,15 @@ class Solve:
                 self.inc, self.theta, self.veq, self.u, self.y, x
             )
 
+            # M^T C^-1 M for a diagonal data covariance
+            f = map.ops.get_MTCInvM_fixed_map(inc, theta, veq, u, y, x)
+            _get_MTCInvM = theano.function(
+                [inc, theta, veq, u, y, x], f, on_unused_input="ignore"
+            )
+            self._get_MTCInvM = lambda cinv: _get_MTCInvM(
+                self.inc, self.theta, self.veq, self.u, self.y, cinv
+            )
+
             # Line broadening matrix
             f = map.ops.get_kT0_matrix(veq, inc)
             _get_KT0 = theano.function([veq, inc], f)
@@ -104,6 +126,10 @@ class Solve:
                 [ATA, ATy, lam, maxiter, eps, tol],
                 map.ops.L1(ATA, ATy, lam, maxiter, eps, tol),
             )
+            self.L1_fista = theano.function(
+                [ATA, ATy, lam, maxiter, tol, w0],
+                map.ops.L1_fista(ATA, ATy, lam, maxiter, tol, w0),
+            )
 
             # Interpolation matrices
             if map._interp:
@@ -151,11 +177,20 @@ class Solve:
             self.dotM = _dotM
             self.dotMT = _dotMT
 
+            # M^T C^-1 M for a diagonal data covariance
+            def _get_MTCInvM(cinv):
+                return map.ops.get_MTCInvM_fixed_map(
+                    map._inc, self.theta, map._veq, map._u, self.y, cinv
+                )
+
+            self._get_MTCInvM = _get_MTCInvM
+
             # Line broadening matrix
             self._get_KT0 = lambda: map.ops.get_kT0_matrix(self.veq, self.inc)
 
             # LASSO solver
             self.L1 = map.ops.L1
+            self.L1_fista = map.ops.L1_fista
 
             # Interpolation matrices
             if map._interp:
@@ -219,6 +254,89 @@ class Solve:
             ]
         return self._C
 
+    def MTCInvM(self, cinv):
+        """
+        Compute ``M^T C^-1 M``, where ``M`` is the design matrix conditioned
+        on the current map and ``C`` is a diagonal data covariance whose
+        inverse has diagonal `cinv` of size ``nt * nw``.
+
+        """
+        if not self.interp:
+            return self._get_MTCInvM(np.reshape(cinv, (self.nt, self.nw)))
+
+        # The design matrix is the interpolation operator `S` (at each
+        # epoch) dotted into the design matrix `M_` on the internal grid,
+        # so we need ``M_^T W M_``, where ``W`` is block diagonal with
+        # blocks ``W_t = S^T diag(cinv_t) S``. Each block is banded,
+        # since `S` is, and the contribution of its `e`-th band is just
+        # the diagonal covariance product for that band, with the
+        # columns shifted by `e`. This way we never instantiate `M`.
+        cinv = np.reshape(cinv, (self.nt, self.nw))
+        MTCInvM = np.zeros((self.nc * self.nw0_, self.nc, self.nw0_))
+        for e, w in self._get_interp_bands(cinv):
+            A = np.reshape(
+                self._get_MTCInvM(w), (self.nc * self.nw0_, self.nc, -1)
+            )
+            if e >= 0:
+                MTCInvM[:, :, e:] += A[:, :, : self.nw0_ - e]
+            else:
+                MTCInvM[:, :, :e] += A[:, :, -e:]
+        return np.reshape(MTCInvM, (self.nc * self.nw0_, -1))
+
+    def _get_interp_bands(self, cinv):
+        """
+        Return a list of the nonzero bands ``(e, w)`` of the per-epoch
+        matrices ``W_t = S^T diag(cinv_t) S``, where `S` is the
+        interpolation operator from the internal to the external
+        wavelength grid, such that ``W_t[i, i + e] = w[t, i]``.
+
+        """
+        S = self.Si2e.tocsc()
+        bands = []
+        for e in range(-self.interp_hw, self.interp_hw + 1):
+            if e >= 0:
+                P = S[:, : self.nw_ - e].multiply(S[:, e:])
+            else:
+                P = S[:, -e:].multiply(S[:, : self.nw_ + e])
+            if P.nnz == 0:
+                continue
+            w = np.zeros((self.nt, self.nw_))
+            cols = slice(0, self.nw_ - e) if e >= 0 else slice(-e, None)
+            w[:, cols] = np.transpose(P.T.dot(np.transpose(cinv)))
+            bands.append((e, w))
+        return bands
+
+    def solve_L1(self, ATA, ATy, w0=None):
+        """
+        Solve the L1-regularized least squares problem for the weights `w`
+        given ``ATA`` and ``ATy``, using the solver set by the
+        `spectral_solver` option. If provided, `w0` is used to warm-start
+        the iterative solver.
+
+        """
+        if self.spectral_solver.lower() == "ridge":
+            return self.L1(
+                ATA,
+                ATy,
+                np.array(self.spectral_lambda),
+                self.spectral_maxiter,
+                np.array(self.spectral_eps),
+                np.array(self.spectral_tol),
+            )
+        elif self.spectral_solver.lower() == "fista":
+            if w0 is None:
+                w0 = np.zeros_like(ATy)
+            return self.L1_fista(
+                ATA,
+                ATy,
+                np.array(self.spectral_lambda),
+                self.spectral_maxiter,
+                np.array(self.spectral_tol),
+                np.reshape(w0, np.shape(ATy)),
+            )
+        else:
+            raise ValueError("Invalid `spectral_solver`.")
+
     def process_inputs(
         self,
         flux,
@@ -233,6 +351,7 @@ class Solve:
         spectral_eps=None,
         spectral_tol=None,
         spectral_method=None,
+        spectral_solver=None,
         normalized=True,
         baseline=None,
         baseline_var=None,
@@ -270,10 +389,15 @@ class Solve:
             spectral_cov = 1e-3
         if spectral_lambda is None:
             spectral_lambda = 1e5
-        if spectral_maxiter is None:
-            spectral_maxiter = 100
         if spectral_method is None:
             spectral_method = "L2"
+        if spectral_solver is None:
+            spectral_solver = "ridge"
+        if spectral_maxiter is None:
+            if spectral_solver.lower() == "fista":
+                spectral_maxiter = 1000
+            else:
+                spectral_maxiter = 100
         if spectral_eps is None:
             spectral_eps = 1e-12
         if spectral_tol is None:
@@ -455,6 +579,7 @@ class Solve:
         self.spectral_eps = spectral_eps
         self.spectral_tol = spectral_tol
         self.spectral_method = spectral_method
+        self.spectral_solver = spectral_solver
         self.normalized = normalized
         self.baseline_var = baseline_var
         self.fix_spectrum = fix_spectrum
@@ -618,17 +743,14 @@ class Solve:
                 flux_err = self.flux_err * np.ones((1, self.nw)) * baseline
             else:
                 flux_err = self.flux_err * baseline
-            CInv = np.diag(1.0 / flux_err.reshape(self.nt * self.nw) ** 2)
 
         else:
 
             flux = self.flux
-            if self.flux_err.ndim == 0:
-                CInv = (1.0 / self.flux_err ** 2) * np.eye(self.nt * self.nw)
-            else:
-                CInv = np.diag(
-                    1.0 / self.flux_err.reshape(self.nt * self.nw) ** 2
-                )
+            flux_err = self.flux_err
+
+        # The (diagonal) inverse data covariance
+        cinv = np.ones(self.nt * self.nw) / np.reshape(flux_err, (-1,)) ** 2
 
         # Unroll the data into a vector
         flux = np.reshape(flux, (-1,))
@@ -643,13 +765,12 @@ class Solve:
             invLmu = np.dot(invL, mu)
 
         # Compute M^T C^-1 M
-        # TODO: Figure out how to do this with a single convolution
-        KInv = self.dotMT(np.transpose(self.dotMT(CInv)))
+        KInv = self.MTCInvM(cinv)
 
         if self.spectral_method.upper() == "L2":
 
             # Compute M^T C^-1 f
-            term = self.dotMT(np.dot(CInv, flux)).reshape(-1)
+            term = self.dotMT(cinv * flux).reshape(-1)
 
             # Solve the L2 problem
             if invL.ndim == 1:
@@ -663,18 +784,23 @@ class Solve:
 
             # Compute M^T C^-1 f
             mean_flux = self.dotM(mu).reshape(-1)
-            term = self.dotMT(np.dot(CInv, flux - mean_flux)).reshape(-1)
+            term = self.dotMT(cinv * (flux - mean_flux)).reshape(-1)
 
-            # Solve the L1 problem
-            spectrum_ = mu + self.L1(
-                KInv,
-                term,
-                np.array(self.spectral_lambda),
-                self.spectral_maxiter,
-                np.array(self.spectral_eps),
-                np.array(self.spectral_tol),
-            )
-            choK = None
+            # Solve the L1 problem, warm-starting
+            # from the current solution (if any)
+            if self.spectrum_ is None:
+                w0 = None
+            else:
+                w0 = self.spectrum_.reshape(-1) - mu
+            spectrum_ = mu + self.solve_L1(KInv, term, w0)
+
+            # Approximate the posterior covariance with that of the
+            # L2 problem (the L1 problem has no closed form)
+            if invL.ndim == 1:
+                KInv[np.diag_indices_from(KInv)] += invL
+            else:
+                KInv += invL
+            choK = cho_factor(KInv)
 
         else:
 
@@ -700,14 +826,7 @@ class Solve:
             f -= np.mean(np.dot(self.KT0, mu), axis=1)
             CInv = np.dot(self.KT0.T, self.KT0) / np.mean(self.flux_err) ** 2
             term = np.dot(self.KT0.T, f) / np.mean(self.flux_err) ** 2
-            self.spectrum_ = mu.T + self.L1(
-                CInv,
-                term,
-                np.array(self.spectral_lambda),
-                self.spectral_maxiter,
-                np.array(self.spectral_eps),
-                np.array(self.spectral_tol),
-            )
+            self.spectrum_ = mu.T + self.solve_L1(CInv, term)
         else:
             self.spectrum_ = self.spectral_guess
         self.meta["spectrum_guess"] = self.spectrum_
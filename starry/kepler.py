@@ -3,14 +3,11 @@ from . import config
 from ._constants import *
 from .maps import MapBase, RVBase, ReflectedBase
 from ._core import OpsSystem, math
+from ._core.utils import DesignMatrixCache
 from .compat import evaluator
 import numpy as np
 from astropy import units
 from inspect import getmro
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from matplotlib.patches import Ellipse
-from IPython.display import HTML
 import os
 import logging
 
@@ -399,7 +396,9 @@ class System(object):
             time metric for this object. Defaults to
             :py:attr:`astropy.units.day.`
         light_delay (bool, optional): Account for the light travel time
-            delay to the barycenter of the system? Default is False.
+            delay to the barycenter of the system? If True, each body is
+            observed at its position at the retarded time, which we solve
+            for iteratively. Default is False.
         texp (scalar): The exposure time of each observation. This can be a
             scalar or a tensor with the same shape as ``t``. If ``texp`` is
             provided, ``t`` is assumed to indicate the timestamp at the middle
@@ -410,6 +409,17 @@ class System(object):
             be one of the following: ``0`` for a centered Riemann sum
             (equivalent to the "resampling" procedure suggested by Kipping 2010),
             ``1`` for the trapezoid rule, or ``2`` for Simpson’s rule.
+        cache_size (int, optional): The maximum number of design matrices
+            to keep in memory in greedy mode. Design matrices are keyed on
+            a hash of the time array and of all the geometric and filter
+            parameters of the bodies and their maps, so changing any of
+            these results in a new computation, while changing only the
+            map coefficients or amplitudes does not. This is useful when
+            repeatedly calling :py:meth:`flux`, :py:meth:`solve` or
+            :py:meth:`lnlike` with fixed orbital parameters. Default is
+            0 (no caching).
+        cache_memory (float, optional): The maximum total size of the
+            cached design matrices in megabytes. Default is 256.
     """
 
     def _no_spectral(self):
@@ -427,6 +437,8 @@ class System(object):
         texp=None,
         oversample=7,
         order=0,
+        cache_size=0,
+        cache_memory=256,
     ):
         # Units
         self.time_unit = time_unit
@@ -517,6 +529,9 @@ class System(object):
             order=self._order,
         )
 
+        # Design matrix cache
+        self._X_cache = DesignMatrixCache(cache_size, cache_memory)
+
         # Solve stuff
         self._flux = None
         self._C = None
@@ -525,7 +540,15 @@ class System(object):
 
     @property
     def light_delay(self):
-        """Account for the light travel time delay? *Read-only*"""
+        """Account for the light travel time delay? *Read-only*
+
+        If True, the position of each body at time ``t`` is its position
+        at the retarded time ``t_r = t + z(t_r) / c``, where ``z`` is its
+        barycentric coordinate along the line of sight. This equation is
+        solved by a fixed number of fixed-point iterations, each of which
+        reduces the error by a factor of about ``v / c``, so the solution
+        is accurate to machine precision for any non-relativistic orbit.
+        """
         return self._light_delay
 
     @property
@@ -578,6 +601,15 @@ class System(object):
         """A list of the indices corresponding to each body in the design matrix."""
         return self._inds
 
+    @property
+    def cache_size(self):
+        """The maximum number of cached design matrices. *Read-only*"""
+        return self._X_cache.size
+
+    def clear_cache(self):
+        """Remove all design matrices from the cache."""
+        self._X_cache.clear()
+
     def show(
         self,
         t,
@@ -625,6 +657,12 @@ class System(object):
             ``model.test_point`` and raises a warning.
 
         """
+        # Plotting imports are slow, so we defer them until needed
+        import matplotlib.pyplot as plt
+        from matplotlib.animation import FuncAnimation
+        from matplotlib.patches import Ellipse
+        from IPython.display import HTML
+
         # Not yet implemented
         if self._primary._map.nw is not None:  # pragma: no cover
             raise NotImplementedError(
@@ -911,7 +949,11 @@ class System(object):
             t (scalar or vector): An array of times at which to evaluate
                 the design matrix in units of :py:attr:`time_unit`.
         """
-        return self.ops.X(
+        return self._X_cache(self.ops.X, *self._get_X_args(t))
+
+    def _get_X_args(self, t):
+        """Return the arguments to the design matrix op."""
+        return (
             self._math.reshape(self._math.to_array_or_tensor(t), [-1])
             * self._time_factor,
             self._primary._r,
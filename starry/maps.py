@@ -10,7 +10,7 @@ from ._core import (
     OpsDoppler,
     math,
 )
-from ._core.utils import is_tensor
+from ._core.utils import is_tensor, DesignMatrixCache
 from ._indices import integers, get_ylm_inds, get_ul_inds, get_ylmw_inds
 from ._plotting import (
     get_ortho_latitude_lines,
@@ -21,12 +21,6 @@ from ._plotting import (
 )
 from .compat import evaluator
 import numpy as np
-import matplotlib
-import matplotlib.pyplot as plt
-from matplotlib import colors
-from matplotlib.animation import FuncAnimation
-from mpl_toolkits.axes_grid1 import make_axes_locatable
-from IPython.display import HTML
 from astropy import units
 from scipy.ndimage import zoom
 import os
@@ -68,6 +62,13 @@ class MapBase(object):
                 "Method not yet implemented for spectral maps."
             )
 
+    def _no_geometry(self):
+        if self.__props__["reflected"] or self.__props__["oblate"]:
+            raise NotImplementedError(
+                "The occultation geometry cannot be reused for reflected "
+                "light or oblate maps."
+            )
+
     def __init__(self, ydeg, udeg, fdeg, nw, **kwargs):
         # Instantiate the Theano ops class
         self.ops = self._ops_class_(ydeg, udeg, fdeg, nw, **kwargs)
@@ -87,6 +88,11 @@ class MapBase(object):
         self.angle_unit = kwargs.get("angle_unit", units.degree)
         self.wav_unit = kwargs.get("wav_unit", units.nm)
 
+        # Design matrix cache
+        self._X_cache = DesignMatrixCache(
+            kwargs.get("cache_size", 0), kwargs.get("cache_memory", 256)
+        )
+
         # Initialize
         self.reset(**kwargs)
 
@@ -112,6 +118,15 @@ class MapBase(object):
         self._wav_unit = value
         self._wav_factor = value.in_units(units.m)
 
+    @property
+    def cache_size(self):
+        """The maximum number of cached design matrices. *Read-only*"""
+        return self._X_cache.size
+
+    def clear_cache(self):
+        """Remove all design matrices from the cache."""
+        self._X_cache.clear()
+
     @property
     def ydeg(self):
         """Spherical harmonic degree of the map. *Read-only*"""
@@ -285,6 +300,8 @@ class MapBase(object):
             raise ValueError("Invalid map index.")
 
     def _get_norm(self, image_arr, **kwargs):
+        from matplotlib import colors
+
         norm = kwargs.get("norm", None)
         if norm is None:
             vmin = np.nanmin(image_arr)
@@ -433,6 +450,14 @@ class MapBase(object):
             ``model.test_point`` and raises a warning.
 
         """
+        # Plotting imports are slow, so we defer them until needed
+        import matplotlib
+        import matplotlib.pyplot as plt
+        from matplotlib import colors
+        from matplotlib.animation import FuncAnimation
+        from mpl_toolkits.axes_grid1 import make_axes_locatable
+        from IPython.display import HTML
+
         # Get kwargs
         get_val = evaluator(**kwargs)
         cmap = kwargs.pop("cmap", "plasma")
@@ -987,7 +1012,7 @@ class YlmBase(legacy.YlmBase):
     def _render_greedy(self, **kwargs):
         get_val = evaluator(**kwargs)
         amp = get_val(self.amp).reshape(-1, 1, 1)
-        return amp * self.ops.render(
+        image = self.ops.render_frames(
             kwargs.get("res", 300),
             get_projection(kwargs.get("projection", "ortho")),
             np.atleast_1d(get_val(kwargs.get("theta", 0.0)))
@@ -998,6 +1023,8 @@ class YlmBase(legacy.YlmBase):
             get_val(self._u),
             get_val(self._f),
         )
+        image *= amp
+        return image
 
     def _get_ortho_latitude_lines(self, **kwargs):
         get_val = evaluator(**kwargs)
@@ -1075,15 +1102,88 @@ class YlmBase(legacy.YlmBase):
                 this body's radius.
             theta (scalar or vector, optional): Angular phase of the body
                 in units of :py:attr:`angle_unit`.
-        """
+            geometry (tuple, optional): The occultation geometry returned
+                by :py:meth:`design_matrix_geometry`. If provided, the
+                occultor coordinates are ignored and only the rotation of
+                the map is computed. Default is None.
+        """
+        geometry = kwargs.pop("geometry", None)
+        if geometry is not None:
+            occ, sTAR = geometry
+            theta = kwargs.get("theta", 0.0)
+            theta, _ = self._math.vectorize(theta, occ)
+            theta = self._math.cast(theta) * self._angle_factor
+            return self.ops.X_rotate(
+                occ, sTAR, theta, self._inc, self._obl, self._u, self._f
+            )
+
         # Orbital kwargs
         theta, xo, yo, zo, ro = self._get_flux_kwargs(kwargs)
 
         # Compute & return
-        return self.ops.X(
-            theta, xo, yo, zo, ro, self._inc, self._obl, self._u, self._f
+        return self._X_cache(
+            self.ops.X,
+            theta,
+            xo,
+            yo,
+            zo,
+            ro,
+            self._inc,
+            self._obl,
+            self._u,
+            self._f,
         )
 
+    def design_matrix_geometry(self, **kwargs):
+        r"""Compute the occultation stage of the light curve design matrix.
+
+        The expensive part of computing the design matrix, i.e., solving
+        for the occulted flux in each spherical harmonic, depends only on
+        the position and size of the occultor and on the limb darkening
+        and filter coefficients, and not on the inclination, obliquity or
+        rotational phase of the map. This method computes it once so that
+        it can be passed to :py:meth:`design_matrix` via its ``geometry``
+        keyword when only ``inc``, ``obl`` or ``theta`` change:
+
+        .. code-block:: python
+
+            geometry = map.design_matrix_geometry(xo=xo, yo=yo, ro=ro)
+            for inc in np.linspace(30, 90, 100):
+                map.inc = inc
+                A = map.design_matrix(theta=theta, geometry=geometry)
+
+        The result must be recomputed whenever the occultor coordinates
+        or the limb darkening coefficients change.
+
+        Args:
+            xo (scalar or vector, optional): x coordinate of the occultor
+                relative to this body in units of this body's radius.
+            yo (scalar or vector, optional): y coordinate of the occultor
+                relative to this body in units of this body's radius.
+            zo (scalar or vector, optional): z coordinate of the occultor
+                relative to this body in units of this body's radius.
+            ro (scalar, optional): Radius of the occultor in units of
+                this body's radius.
+
+        .. note::
+
+            This is only available for emitted light maps. The
+            occultation solution of an oblate map depends on its projected
+            shape, i.e., on ``inc`` and ``obl``, so it cannot be separated
+            from the rotation. For reflected light maps, the solution also
+            depends on the position of the illumination source, so the
+            geometry would have to be recomputed whenever the source moves
+            anyway. Systems do not use this split either: the design
+            matrix of a :py:class:`starry.System` is a single compiled
+            function of all the orbital and map parameters, so changing
+            ``prot`` or ``theta0`` recomputes it in full (see the
+            ``cache_size`` argument of :py:class:`starry.System` for a
+            way to avoid recomputing it at repeated parameter values).
+        """
+        self._no_geometry()
+        _, xo, yo, zo, ro = self._get_flux_kwargs(kwargs)
+        return self.ops.X_geometry(xo, yo, zo, ro, self._u, self._f)
+
     def intensity_design_matrix(self, lat=0, lon=0):
         """Compute and return the pixelization matrix ``P``.
 
@@ -1188,7 +1288,7 @@ class YlmBase(legacy.YlmBase):
             lat, lon, self._y, self._u, self._f, theta, ld
         )
 
-    def render(self, res=300, projection="ortho", theta=0.0):
+    def render(self, res=300, projection="ortho", theta=0.0, out=None):
         """Compute and return the intensity of the map on a grid.
 
         Returns an image of shape ``(res, res)``, unless ``theta`` is a vector,
@@ -1203,6 +1303,13 @@ class YlmBase(legacy.YlmBase):
             each point in the rendered image by calling
             :py:meth:`get_latlon_grid()`.
 
+        .. note::
+
+            If the map is not in lazy mode, the frames are rendered a few at
+            a time, so the memory usage is dominated by the output array.
+            Long animations may be rendered directly into a memory-mapped
+            array by passing it as ``out``.
+
         Args:
             res (int, optional): The resolution of the map in pixels on a
                 side. Defaults to 300.
@@ -1215,6 +1322,9 @@ class YlmBase(legacy.YlmBase):
             theta (scalar or vector, optional): The map rotation phase in
                 units of :py:attr:`angle_unit`. If this is a vector, an
                 animation is generated. Defaults to ``0.0``.
+            out (ndarray, optional): An array of shape
+                ``(nframes, res, res)`` in which to store the result.
+                Not supported in lazy mode. Default is None.
         """
         # Multiple frames?
         if self.nw is not None:
@@ -1238,16 +1348,31 @@ class YlmBase(legacy.YlmBase):
             # The intensity has shape `(nw, res, res)`
             # so we must reshape `amp` to take the product correctly
             amp = self.amp[:, np.newaxis, np.newaxis]
-        image = amp * self.ops.render(
-            res,
-            projection,
-            theta,
-            self._inc,
-            self._obl,
-            self._y,
-            self._u,
-            self._f,
-        )
+        if self.lazy:
+            assert out is None, "Argument `out` not supported in lazy mode."
+            image = amp * self.ops.render(
+                res,
+                projection,
+                theta,
+                self._inc,
+                self._obl,
+                self._y,
+                self._u,
+                self._f,
+            )
+        else:
+            image = self.ops.render_frames(
+                res,
+                projection,
+                theta,
+                self._inc,
+                self._obl,
+                self._y,
+                self._u,
+                self._f,
+                out=out,
+            )
+            image *= amp
 
         # Squeeze?
         if animated:
@@ -1342,6 +1467,8 @@ class YlmBase(legacy.YlmBase):
                     raise ValueError("File not found: %s." % image)
 
             # Load the image into an ndarray
+            import matplotlib.pyplot as plt
+
             image = plt.imread(image)
 
             # If it's an integer, normalize to [0-1]
@@ -1545,6 +1672,58 @@ class YlmBase(legacy.YlmBase):
         self._amp = x[0]
         self._y = x / x[0]
 
+    def spots(self, *, contrast=1.0, radius=None, lat=0.0, lon=0.0, **kwargs):
+        r"""Add the expansions of several circular spots to the map at once.
+
+        This is the vectorized version of :py:meth:`spot`, which it is
+        equivalent to calling once per spot. All spots are expanded in a
+        single operation, so this is much faster (and results in much
+        smaller graphs in lazy mode) for maps with many spots.
+
+        Args:
+            contrast (scalar or vector, optional): The contrast of each spot.
+                If the map has more than one wavelength bin, this may also be
+                a matrix of shape (``nspots``, :py:attr:`nw`). Default is
+                ``1.0``.
+            radius (scalar or vector, optional): The angular radius of each
+                spot in units of :py:attr:`angle_unit`. If this is a scalar,
+                all spots share the same radius (and the same profile).
+                Defaults to ``20.0`` degrees.
+            lat (scalar or vector, optional): The latitude of each spot in
+                units of :py:attr:`angle_unit`. Defaults to ``0.0``.
+            lon (scalar or vector, optional): The longitude of each spot in
+                units of :py:attr:`angle_unit`. Defaults to ``0.0``.
+
+        This method accepts the same additional keywords as :py:meth:`spot`.
+        """
+        # Set up (if kwargs changed)
+        self.ops._spot_setup(**kwargs)
+
+        # Check inputs
+        if radius is None:
+            radius = self._math.cast(20 * np.pi / 180)
+        else:
+            radius = self._math.cast(radius) * self._angle_factor
+        lat = self._math.cast(lat) * self._angle_factor
+        lon = self._math.cast(lon) * self._angle_factor
+        contrast = self._math.cast(contrast)
+        if self.nw is not None and contrast.ndim < 2:
+            contrast = self._math.reshape(contrast, (-1, 1)) * self._math.ones(
+                (1, self.nw)
+            )
+        if radius.ndim == 0:
+            contrast, lat, lon = self._math.vectorize(contrast, lat, lon)
+        else:
+            contrast, radius, lat, lon = self._math.vectorize(
+                contrast, radius, lat, lon
+            )
+
+        # Add the spots to the map
+        y_spot = self.ops.spots(contrast, radius, lat, lon)
+        x = self._amp * self._y + y_spot
+        self._amp = x[0]
+        self._y = x / x[0]
+
     def minimize(self, oversample=1, ntries=1, bounds=None, return_info=False):
         """Find the global (optionally local) minimum of the map intensity.
 
@@ -1993,6 +2172,8 @@ class RVBase(object):
     _ops_class_ = OpsRV
 
     def _get_norm(self, image, **kwargs):
+        from matplotlib import colors
+
         norm = kwargs.get("norm", None)
         if norm is None:
             vmin = np.nanmin(image)
@@ -2215,8 +2396,11 @@ class ReflectedBase(object):
     the purposes of computing the illumination profile on the surface of the
     body and as a spherical source of finite extent for the purposes of
     modeling occultations. The point source approximation can be relaxed by
-    changing the `source_npts` keyword when instantiating the map. This may
-    be important for modeling very short-period exoplanets.
+    changing the `source_npts` keyword when instantiating the map, in which
+    case the illumination is integrated over the source disk with a polar
+    Gauss quadrature rule with about `source_npts` nodes (10 to 30 nodes
+    usually suffice; see :py:meth:`flux_error`). This may be important for
+    modeling very short-period exoplanets.
 
     The ``xs``, ``ys``, and ``zs`` parameters in several of the methods below
     specify the position of the illumination source in units of this body's
@@ -2244,8 +2428,9 @@ class ReflectedBase(object):
     @property
     def source_npts(self):
         """
-        The number of points used when approximating finite illumination
-        source size. This quantity must be set when instantiating the map.
+        The number of quadrature nodes used when integrating over the
+        finite illumination source. This quantity must be set when
+        instantiating the map.
 
         """
         return int(self.__props__["source_npts"])
@@ -2311,11 +2496,15 @@ class ReflectedBase(object):
                 in units of :py:attr:`angle_unit`.
 
         """
+        if kwargs.get("geometry", None) is not None:
+            self._no_geometry()
+
         # Orbital kwargs
         theta, xs, ys, zs, Rs, xo, yo, zo, ro = self._get_flux_kwargs(kwargs)
 
         # Compute & return
-        return self.ops.X(
+        return self._X_cache(
+            self.ops.X,
             theta,
             xs,
             ys,
@@ -2387,6 +2576,44 @@ class ReflectedBase(object):
         else:
             return self.amp * flux
 
+    def flux_error(self, **kwargs):
+        """
+        Estimate the error in the reflected flux due to the quadrature over
+        the finite illumination source.
+
+        This is the absolute difference between the flux computed with
+        :py:attr:`source_npts` quadrature nodes and that computed with about
+        half as many nodes. It is zero for a point source. Accepts the
+        same arguments as :py:meth:`flux`.
+
+        """
+        # Orbital kwargs
+        theta, xs, ys, zs, Rs, xo, yo, zo, ro = self._get_flux_kwargs(kwargs)
+
+        # Compute & return
+        err = self.ops.flux_error(
+            theta,
+            xs,
+            ys,
+            zs,
+            Rs,
+            xo,
+            yo,
+            zo,
+            ro,
+            self._inc,
+            self._obl,
+            self._y,
+            self._u,
+            self._f,
+            self._sigr,
+        )
+
+        if kwargs.get("integrated", False):
+            return self._math.dot(err, self.amp)
+        else:
+            return self.amp * err
+
     def intensity(
         self,
         lat=0,
@@ -2483,6 +2710,7 @@ class ReflectedBase(object):
         zs=1,
         rs=0,
         on94_exact=False,
+        out=None,
     ):
         """
         Compute and return the intensity of the map on a grid.
@@ -2493,6 +2721,14 @@ class ReflectedBase(object):
         a spectral map, ``nframes`` is the number of wavelength bins and
         ``theta`` must be a scalar.
 
+        .. note::
+
+            If the map is not in lazy mode, the frames are rendered a few at
+            a time and pixels on the night side are skipped, so the memory
+            usage is dominated by the output array. Long animations may be
+            rendered directly into a memory-mapped array by passing it
+            as ``out``.
+
         Args:
             res (int, optional): The resolution of the map in pixels on a
                 side. Defaults to 300.
@@ -2514,6 +2750,9 @@ class ReflectedBase(object):
                 source relative to this body in units of this body's radius.
             rs (scalar, optional): radius of the illumination source in units
                 of this body's radius.
+            out (ndarray, optional): An array of shape
+                ``(nframes, res, res)`` in which to store the result.
+                Not supported in lazy mode. Default is None.
         """
         # Multiple frames?
         if self.nw is not None:
@@ -2547,23 +2786,45 @@ class ReflectedBase(object):
             # so we must reshape `amp` to take the product correctly
             amp = self.amp[:, np.newaxis, np.newaxis]
 
-        image = amp * self.ops.render(
-            res,
-            projection,
-            illuminate,
-            theta,
-            self._inc,
-            self._obl,
-            self._y,
-            self._u,
-            self._f,
-            xs,
-            ys,
-            zs,
-            Rs,
-            self._sigr,
-            on94_exact,
-        )
+        if self.lazy:
+            assert out is None, "Argument `out` not supported in lazy mode."
+            image = amp * self.ops.render(
+                res,
+                projection,
+                illuminate,
+                theta,
+                self._inc,
+                self._obl,
+                self._y,
+                self._u,
+                self._f,
+                xs,
+                ys,
+                zs,
+                Rs,
+                self._sigr,
+                on94_exact,
+            )
+        else:
+            image = self.ops.render_frames(
+                res,
+                projection,
+                illuminate,
+                theta,
+                self._inc,
+                self._obl,
+                self._y,
+                self._u,
+                self._f,
+                xs,
+                ys,
+                zs,
+                Rs,
+                self._sigr,
+                on94_exact,
+                out=out,
+            )
+            image *= amp
 
         # Squeeze?
         if animated:
@@ -2613,9 +2874,9 @@ class ReflectedBase(object):
 
         if screen and illuminate:
 
-            # Explicitly call the compiled version of `render`
+            # Explicitly call the chunked version of `render`
             # on the *unilluminated* map
-            kwargs["image"] = amp * self.ops.render(
+            kwargs["image"] = amp * self.ops.render_frames(
                 res,
                 projection,
                 0,
@@ -2635,7 +2896,7 @@ class ReflectedBase(object):
 
             # Now call it on an illuminated uniform map
             # We'll use this as an alpha filter.
-            illum = self.ops.render(
+            illum = self.ops.render_frames(
                 res,
                 projection,
                 1,
@@ -2658,8 +2919,8 @@ class ReflectedBase(object):
 
         else:
 
-            # Explicitly call the compiled version of `render`
-            kwargs["image"] = amp * self.ops.render(
+            # Explicitly call the chunked version of `render`
+            kwargs["image"] = amp * self.ops.render_frames(
                 res,
                 projection,
                 illuminate,
@@ -2950,12 +3211,15 @@ class OblateBase(object):
         """
         # The problem isn't quite linear for spectral maps
         self._no_spectral()
+        if kwargs.get("geometry", None) is not None:
+            self._no_geometry()
 
         # Orbital kwargs
         theta, xo, yo, zo, ro = self._get_flux_kwargs(kwargs)
 
         # Compute & return
-        return self.ops.X(
+        return self._X_cache(
+            self.ops.X,
             theta,
             xo,
             yo,
@@ -3061,9 +3325,19 @@ def Map(
             from a uniform map is proportional to its projected area, which
             scales as `1 / (1 - fproj)` where `fproj` is the projected
             oblateness.
-        source_npts (int, optional): Number of points used to approximate the
-            finite illumination source size. Default is 1. Valid only if
-            `reflected` is True.
+        source_npts (int, optional): Approximate number of quadrature nodes
+            used to integrate over the finite illumination source. Default
+            is 1 (a point source). Valid only if `reflected` is True.
+        cache_size (int, optional): The maximum number of design matrices
+            to keep in memory in greedy mode. Design matrices are keyed on
+            a hash of all the arguments to :py:meth:`design_matrix` and of
+            the orientation and filter parameters of the map, so changing
+            any of these results in a new computation, while changing only
+            the map coefficients or amplitude does not. This is useful when
+            repeatedly calling ``solve`` or ``lnlike`` with fixed
+            geometry. Default is 0 (no caching).
+        cache_memory (float, optional): The maximum total size of the
+            cached design matrices in megabytes. Default is 256.
     """
     # Check args
     ydeg = int(ydeg)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Test the design matrix cache of maps.
+
+"""
+import starry
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize(
+    "kwargs", [dict(), dict(udeg=2), dict(reflected=True), dict(oblate=True)]
+)
+def test_design_matrix_cache(kwargs):
+    map0 = starry.Map(ydeg=2, **kwargs)
+    map = starry.Map(ydeg=2, cache_size=2, **kwargs)
+    assert map.cache_size == 2
+    theta = np.linspace(0, 90, 50)
+    xo = np.linspace(-1.5, 1.5, 50)
+    args = dict(theta=theta, xo=xo, yo=0.2, ro=0.1)
+
+    # Changing only the map coefficients hits the cache
+    X = map.design_matrix(**args)
+    X[:] = 0.0
+    map[1, :] = [0.1, 0.2, 0.3]
+    assert np.allclose(map.design_matrix(**args), map0.design_matrix(**args))
+    assert len(map._X_cache) == 1
+
+    # Changing the orientation, the filter or the arguments does not
+    for m in (map, map0):
+        m.inc = 60.0
+        if m.udeg > 0:
+            m[1:] = [0.4, 0.26]
+    assert np.allclose(map.design_matrix(**args), map0.design_matrix(**args))
+    args["ro"] = 0.2
+    assert np.allclose(map.design_matrix(**args), map0.design_matrix(**args))
+    assert len(map._X_cache) == 2
+    map.clear_cache()
+    assert len(map._X_cache) == 0
+
+
+
+def test_design_matrix_cache_settings():
+    map = starry.Map(ydeg=2, cache_size=4)
+    args = dict(theta=np.linspace(0, 90, 50), xo=0.3, yo=0.2, ro=0.1)
+    X = map.design_matrix(**args)
+    assert X.dtype == np.float64
+
+    # Switching the precision does not hit the cache
+    starry.config.precision = "single"
+    try:
+        X32 = map.design_matrix(**args)
+    finally:
+        starry.config.precision = "double"
+    assert X32.dtype == np.float32
+    assert map.design_matrix(**args).dtype == np.float64
+    assert len(map._X_cache) == 2
+
+    # Neither does adding or removing an occultation table
+    map.ops.add_sT_table(0.1)
+    try:
+        assert np.allclose(map.design_matrix(**args), X)
+        assert len(map._X_cache) == 3
+    finally:
+        map.ops.clear_sT_tables()
+    assert np.allclose(map.design_matrix(**args), X)
+    assert len(map._X_cache) == 4
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Test reusing the occultation geometry of the design matrix.
+
+"""
+import starry
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("kwargs", [dict(), dict(udeg=2), dict(rv=True)])
+def test_geometry(kwargs):
+    map = starry.Map(ydeg=3, **kwargs)
+    if map.udeg > 0:
+        map[1:] = [0.4, 0.26]
+    npts = 300
+    xo = np.linspace(-1.5, 1.5, npts)
+    yo = 0.2
+    zo = np.where(np.arange(npts) % 7 == 0, -1.0, 1.0)
+    ro = 0.3
+    theta = np.linspace(0, 180, npts)
+    geometry = map.design_matrix_geometry(xo=xo, yo=yo, zo=zo, ro=ro)
+    for inc, obl in [(90.0, 0.0), (60.0, 20.0), (35.0, -45.0)]:
+        map.inc = inc
+        map.obl = obl
+        X0 = map.design_matrix(theta=theta, xo=xo, yo=yo, zo=zo, ro=ro)
+        X = map.design_matrix(theta=theta, geometry=geometry)
+        assert np.allclose(X, X0)
+
+    # Scalar phase
+    X0 = map.design_matrix(theta=30.0, xo=xo, yo=yo, zo=zo, ro=ro)
+    X = map.design_matrix(theta=30.0, geometry=geometry)
+    assert np.allclose(X, X0)
+
+
+def test_no_occultations():
+    map = starry.Map(ydeg=2, inc=60.0)
+    theta = np.linspace(0, 360, 10)
+    geometry = map.design_matrix_geometry(xo=np.zeros(10) + 3.0, ro=0.1)
+    X0 = map.design_matrix(theta=theta)
+    X = map.design_matrix(theta=theta, geometry=geometry)
+    assert np.allclose(X, X0)
+
+
+@pytest.mark.parametrize("kwargs", [dict(reflected=True), dict(oblate=True)])
+def test_geometry_not_implemented(kwargs):
+    map = starry.Map(ydeg=2, **kwargs)
+    with pytest.raises(NotImplementedError):
+        map.design_matrix_geometry(xo=0.3, ro=0.1)
+
+    # The `geometry` keyword must not be silently ignored
+    with pytest.raises(NotImplementedError):
+        map.design_matrix(geometry=(np.ones(1), np.zeros((1, map.Ny))))
@@ -2,7 +2,9 @@ import starry
 import numpy as np
 from scipy.linalg import block_diag
 from scipy.sparse import diags
+from scipy.interpolate import InterpolatedUnivariateSpline as Spline
 import pytest
+import json
 
 
 @pytest.fixture(scope="module", params=[1, 2])
@@ -33,6 +35,64 @@ def test_flux(map):
     assert np.allclose(flux1, flux4)
 
 
+@pytest.mark.parametrize("transpose", [False, True])
+@pytest.mark.parametrize("fix_map", [False, True])
+def test_fft(map, random, transpose, fix_map):
+    """
+    Test that the FFT convolution strategy yields the same results as the
+    direct (`conv2d`) strategy.
+
+    """
+    kwargs = dict(ydeg=10, udeg=2, nt=3, nc=map.nc, veq=50000)
+    map_dir = starry.DopplerMap(conv_method="direct", **kwargs)
+    map_fft = starry.DopplerMap(conv_method="fft", **kwargs)
+    for m in (map_dir, map_fft):
+        m._y = map._y
+        m._u = map._u
+        m._spectrum = map._spectrum
+
+    # The model
+    assert np.allclose(map_dir.flux(), map_fft.flux())
+    assert np.allclose(
+        map_dir.flux(method="conv"), map_fft.flux(method="conv")
+    )
+
+    # Dot products
+    if transpose:
+        size = [map.nt * map.nw, 5]
+    elif fix_map:
+        size = [map.nc * map.nw0_, 5]
+    else:
+        size = [map.nw0_ * map.Ny, 5]
+    matrix = random.normal(size=size)
+    product1 = map_dir.dot(matrix, transpose=transpose, fix_map=fix_map)
+    product2 = map_fft.dot(matrix, transpose=transpose, fix_map=fix_map)
+    assert np.allclose(product1, product2)
+
+
+def test_autotune(map, tmp_path):
+    """
+    Test the selection of the fastest flux method.
+
+    """
+    file = str(tmp_path / "autotune.json")
+    result = map.autotune(file=file, nrep=1)
+    assert result["conv_method"] in ["direct", "fft"]
+    assert result["method"] in ["dotconv", "convdot", "conv"]
+    assert map.ops.conv_method == result["conv_method"]
+    for conv_method in ["direct", "fft"]:
+        assert set(result["timings"][conv_method].keys()) == set(
+            ["dotconv", "convdot", "conv"]
+        )
+
+    # The results should be cached on disk
+    with open(file, "r") as f:
+        assert result == list(json.load(f).values())[0]
+
+    # The model should not depend on the method
+    assert np.allclose(map.flux(method="auto"), map.flux())
+
+
 @pytest.mark.parametrize("ranktwo", [False, True])
 @pytest.mark.parametrize("transpose", [False, True])
 @pytest.mark.parametrize("fix_spectrum", [False, True])
@@ -138,6 +198,132 @@ def test_D_fixed_map(map, random):
     assert np.allclose(flux1, flux2)
 
 
+def test_MTCInvM_fixed_map(map, random):
+    """
+    Test that our banded convolution method for computing `M^T C^-1 M`
+    for a fixed map and diagonal covariance yields the same result as
+    instantiating the design matrix and computing the product directly.
+
+    """
+    theta = map._get_default_theta(None)
+    args = (map._inc, theta, map._veq, map._u, map._y)
+    cinv = random.uniform(0.5, 1.5, size=(map.nt, map.ops.nw))
+
+    # Compute it manually
+    M = np.array(map.ops.get_D_fixed_map(*args))
+    MTCInvM = M.T @ (cinv.reshape(-1, 1) * M)
+
+    # Compute it with starry
+    MTCInvM_fast = map.ops.get_MTCInvM_fixed_map(*args, cinv)
+
+    assert np.allclose(MTCInvM, MTCInvM_fast)
+
+
+def test_L1_fista(map, random):
+    """
+    Test that the FISTA L1 solver yields the same solution as the
+    iterated ridge regression solver, including when warm-started,
+    and that its solution satisfies the KKT conditions even though
+    the strong rule discards weights that end up in the solution.
+
+    """
+    A = random.normal(size=(200, 60))
+    w = np.zeros(60)
+    w[random.choice(60, size=8, replace=False)] = 3 * random.normal(size=8)
+    y = A @ w + 0.1 * random.normal(size=200)
+    ATA = A.T @ A
+    ATy = A.T @ y
+    lam = np.array(20.0)
+    eps = np.array(1e-12)
+    tol = np.array(1e-14)
+
+    # Iterated ridge regression
+    w1 = map.ops.L1(ATA, ATy, lam, 100, eps, tol)
+
+    # FISTA, starting from zero
+    w2 = map.ops.L1_fista(ATA, ATy, lam, 5000, tol, np.zeros(60))
+    assert np.allclose(w1, w2, atol=1e-4)
+
+    # FISTA, warm-started near the solution
+    w0 = w2 + 0.01 * random.normal(size=60)
+    w3 = map.ops.L1_fista(ATA, ATy, lam, 5000, tol, w0)
+    assert np.allclose(w1, w3, atol=1e-4)
+
+    # The strong rule at zero discards weights with
+    # |ATy| < 2 * lam - max(|ATy|). Here the first column is nearly
+    # orthogonal to `y`, so it is discarded, but it is needed to cancel
+    # the `u` component of the second column, so the KKT check must
+    # add it back to the active set
+    u, v = random.normal(size=(2, 200))
+    u -= (u @ v) / (v @ v) * v
+    A = np.hstack(
+        (
+            np.transpose([5 * u, u + 0.5 * v]),
+            0.1 * random.normal(size=(200, 5)),
+        )
+    )
+    ATA = A.T @ A
+    ATy = A.T @ v
+    lam = np.array(0.55 * np.max(np.abs(ATy)))
+    assert np.abs(ATy[0]) < 2 * lam - np.max(np.abs(ATy))
+    w4 = map.ops.L1_fista(ATA, ATy, lam, 5000, tol, np.zeros(7))
+    assert w4[0] != 0
+    grad = ATA @ w4 - ATy
+    nz = w4 != 0
+    assert np.allclose(grad[nz], -lam * np.sign(w4[nz]), rtol=1e-3)
+    assert np.all(np.abs(grad[~nz]) <= lam * (1 + 1e-3))
+
+
+@pytest.mark.parametrize("interp_order", [1, 3])
+def test_spline_operator(map, random, interp_order):
+    """
+    Test that the sparse B-spline interpolation operator matches the
+    operator obtained by interpolating each unit impulse with a spline.
+
+    """
+    input_grid = np.sort(random.uniform(0, 10, size=100))
+    output_grid = np.linspace(0, 10, 150)
+    order = map._interp_order
+    map._interp_order = interp_order
+    try:
+        S = map._get_spline_operator(input_grid, output_grid, chunk=32)
+    finally:
+        map._interp_order = order
+
+    # Compute it manually
+    S_slow = np.zeros((len(output_grid), len(input_grid)))
+    for n in range(len(input_grid)):
+        y = np.zeros_like(input_grid)
+        y[n] = 1.0
+        S_slow[:, n] = Spline(input_grid, y, k=interp_order)(output_grid)
+
+    assert np.allclose(S.toarray(), S_slow, atol=10 * map._interp_tol)
+
+
+def test_load_cube(tmp_path, random):
+    """
+    Test that loading a memory-mapped data cube with the randomized SVD
+    yields the same map as loading it in memory with the full SVD.
+
+    """
+    map = starry.DopplerMap(ydeg=5, nc=2, nt=3, veq=50000)
+    nlat, nlon = 30, 60
+    images = random.uniform(size=(2, nlat * nlon))
+    spectra = random.uniform(size=(2, map.nw0))
+    cube = (images.T @ spectra).reshape(nlat, nlon, map.nw0)
+    np.save(tmp_path / "cube.npy", cube)
+
+    # Full SVD
+    map.load(cube=cube, svd="full")
+    spectral_map1 = map.spectral_map
+
+    # Randomized SVD on a memory-mapped file
+    map.load(cube=str(tmp_path / "cube.npy"))
+    spectral_map2 = map.spectral_map
+
+    assert np.allclose(spectral_map1, spectral_map2)
+
+
 def test_ld_indices(map):
     """
     Test limb darkening coeff setting/getting.
@@ -260,3 +446,26 @@ def test_ylm_indices(map, random):
             ).reshape(-1),
             y,
         )
+
+
+def test_MTCInvM_interp(map, random):
+    """
+    Test that `M^T C^-1 M` on the interpolating path, where we never
+    instantiate the design matrix, yields the same result as computing
+    the product directly.
+
+    """
+    assert map._interp
+    solver = map._solver
+    solver.theta = map._get_default_theta(None)
+    solver.y = map._y
+    cinv = random.uniform(0.5, 1.5, size=map.nt * map.nw)
+
+    # Compute it manually
+    M = solver.dotM(np.eye(map.nc * map.nw0_))
+    MTCInvM = M.T @ (cinv.reshape(-1, 1) * M)
+
+    # Compute it with starry
+    MTCInvM_fast = solver.MTCInvM(cinv)
+
+    assert np.allclose(MTCInvM, MTCInvM_fast)
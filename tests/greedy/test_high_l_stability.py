@@ -1,12 +1,8 @@
 import starry
 import matplotlib.pyplot as plt
 import numpy as np
-import pytest
 
 
-# BROKEN. We need to re-parametrize
-# the L and K integrals (or compute them numerically).
-@pytest.mark.xfail
 def test_high_l_stability(plot=False):
     map = starry.Map(ydeg=20, reflected=False)
     map[1:, :] = 1
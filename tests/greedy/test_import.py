@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Test that importing starry does not import the slow optional modules.
+
+"""
+import subprocess
+import sys
+
+
+# Modules that should only be imported when first needed
+DEFERRED_MODULES = [
+    "matplotlib",
+    "mpl_toolkits",
+    "IPython",
+    "bokeh",
+    "exoplanet",
+    "starry.doppler_visualize",
+]
+
+
+def get_import_times(module="starry"):
+    """
+    Return a dictionary of the cumulative import time in microseconds of
+    every module imported by `module`, as reported by
+    ``python -X importtime``.
+
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import %s" % module],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        try:
+            cumulative = int(fields[1])
+        except ValueError:
+            # Header
+            continue
+        times[fields[2].strip()] = cumulative
+    return times
+
+
+def test_import_time():
+    times = get_import_times()
+    assert "starry" in times
+    print("`import starry` took {:.3f} s".format(times["starry"] / 1e6))
+    for name in times:
+        for module in DEFERRED_MODULES:
+            assert not (
+                name == module or name.startswith(module + ".")
+            ), "Module `{}` was imported by `import starry`.".format(name)
@@ -36,3 +36,59 @@ def test_quadratic():
     flux2 *= np.sqrt(np.pi) / 2  # add in the starry normalization
 
     assert np.allclose(flux1, flux2)
+
+
+def test_c_ops_kernels():
+    """Test the compiled limb darkening kernels and their gradients."""
+    from starry import _c_ops
+
+    eps = 1e-7
+    u = np.array([-1.0, 0.4, 0.26, 0.1])
+    c = _c_ops.get_cl(u)
+    bc = np.array([0.3, -0.2, 0.5, 0.7])
+    bu = _c_ops.get_cl_rev(bc)
+    for i in range(1, len(u)):
+        du = np.zeros_like(u)
+        du[i] = eps
+        fd = (_c_ops.get_cl(u + du) - c).dot(bc) / eps
+        assert np.allclose(fd, bu[i], atol=1e-5)
+
+    # Vectorized flux & gradients
+    L = _c_ops.LimbDark(len(u) - 1)
+    b = np.array([0.3, -0.5, 0.95, 2.0])
+    r = 0.1 * np.ones_like(b)
+    los = np.array([1.0, 1.0, 1.0, -1.0])
+    f, dfdcl, dfdb, dfdr = L.flux(c, b, r, los)
+    assert dfdcl.shape == (len(c), len(b))
+    assert np.allclose(dfdcl.T.dot(c), f)
+    assert np.all(f[-1:] == 0)
+    assert np.allclose(
+        (L.flux(c, b + eps, r, los)[0] - f) / eps, dfdb, atol=1e-5
+    )
+    assert np.allclose(
+        (L.flux(c, b, r + eps, los)[0] - f) / eps, dfdr, atol=1e-5
+    )
+
+
+def test_sparse_filter():
+    """Test the sparse limb darkening filter operator and its gradient."""
+    from scipy.sparse import isspmatrix_csc
+
+    map = starry.Map(ydeg=4, udeg=3)
+    u = np.array([-1.0, 0.4, 0.26, 0.1])
+    f = np.array([np.pi])
+    F = map.ops._c_ops.F(u, f)
+    assert isspmatrix_csc(F)
+    assert F.shape == (map.ops._c_ops.N, map.Ny)
+    assert F.nnz < 0.5 * np.prod(F.shape)
+    assert np.allclose(F.toarray(), map.ops.F(u, f))
+
+    # The gradient with respect to `u` for a dense `bF`
+    eps = 1e-7
+    bF = np.sin(np.arange(np.prod(F.shape))).reshape(F.shape)
+    bu, _ = map.ops._c_ops.F(u, f, bF)
+    for i in range(1, len(u)):
+        du = np.zeros_like(u)
+        du[i] = eps
+        fd = np.sum((map.ops._c_ops.F(u + du, f) - F).toarray() * bF) / eps
+        assert np.allclose(fd, bu[i], atol=1e-5)
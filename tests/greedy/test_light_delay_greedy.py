@@ -2,6 +2,7 @@
 """Test light travel time delay"""
 import starry
 import numpy as np
+from astropy import units, constants
 
 
 def test_light_delay():
@@ -9,5 +10,23 @@ def test_light_delay():
     sec = starry.Secondary(starry.Map(), porb=1.0)
     sys = starry.System(pri, sec, light_delay=True)
     assert sys.light_delay is True
+    sys0 = starry.System(pri, sec)
+    t = np.linspace(-0.5, 0.5, 100)
+    x, y, z = sys.position(t)
+    x0, y0, z0 = sys0.position(t)
 
-    # TODO: Add tests here.
+    # Solve the retarded time equation `t_r = t + z(t_r) / c`
+    # for the secondary by fixed-point iteration
+    c = constants.c.to(units.Rsun / units.day).value
+    tr = np.array(t)
+    for _ in range(10):
+        tr = t + sys0.position(tr)[2][1] / c
+    x1, y1, z1 = sys0.position(tr)
+
+    # The delay should be significant...
+    assert not np.allclose(x[1], x0[1], rtol=0, atol=1e-4)
+
+    # ...and agree with the exact solution
+    assert np.allclose(x[1], x1[1], rtol=0, atol=1e-10)
+    assert np.allclose(y[1], y1[1], rtol=0, atol=1e-10)
+    assert np.allclose(z[1], z1[1], rtol=0, atol=1e-10)
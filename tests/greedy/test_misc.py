@@ -4,6 +4,7 @@ Miscellaneous tests.
 
 """
 import starry
+import numpy as np
 import io
 import logging
 import warnings
@@ -90,3 +91,17 @@ def test_coefficient_numbers():
     assert map.Nu == 4
     assert map.Nf == 1
     assert map.N == 36
+
+
+def test_pT_gradient_inputs():
+    """Test that the polynomial basis gradient leaves its inputs intact."""
+    map = starry.Map(ydeg=2)
+    x = np.array([0.0, 0.6])
+    y = np.array([0.8, 0.0])
+    z = np.sqrt(1 - x ** 2 - y ** 2)
+    args = [np.array(x), np.array(y), np.array(z), np.ones((2, map.Ny))]
+    outputs = [[None], [None], [None]]
+    map.ops._pT._grad_op.perform(None, args, outputs)
+    assert np.array_equal(args[0], x)
+    assert np.array_equal(args[1], y)
+    assert np.array_equal(args[2], z)
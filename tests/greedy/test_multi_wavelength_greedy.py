@@ -83,3 +83,39 @@ def test_amplitude():
     assert np.allclose(map.amp, np.ones(5))
     map.amp = 10.0
     assert np.allclose(map.amp, 10.0 * np.ones(5))
+
+
+def test_oblate_grav_dark_filter():
+    """Test the batched gravity darkening filter of spectral oblate maps."""
+    wav = np.linspace(400.0, 900.0, 4)
+    map = starry.Map(ydeg=2, udeg=1, gdeg=4, oblate=True, nw=len(wav))
+    map.wav = wav
+    map.omega = 0.5
+    map.inc = 60
+    map[1, :, :] = np.random.default_rng(2).normal(size=(3, len(wav))) * 0.1
+    map[1] = 0.5
+    mono = starry.Map(ydeg=2, udeg=1, gdeg=4, oblate=True)
+    mono.omega = 0.5
+    mono.inc = 60
+    mono[1] = 0.5
+
+    # Compare the fluxes in each wavelength bin to those
+    # computed one wavelength at a time
+    theta = np.linspace(0, np.pi, 5)
+    xo = np.linspace(-1.5, 1.5, 5)
+    args = (theta, xo, 0.3 * np.ones(5), np.ones(5), 0.1)
+    flux = map.ops.flux(
+        *args, map._inc, map._obl, map.fproj, map._y, map._u, map._f
+    )
+    for i in range(len(wav)):
+        mono.wav = wav[i]
+        flux_i = mono.ops.flux(
+            *args,
+            mono._inc,
+            mono._obl,
+            mono.fproj,
+            map._y[:, i],
+            mono._u,
+            mono._f,
+        )
+        assert np.allclose(flux[:, i], flux_i)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Test the single precision evaluation mode against double precision.
+
+"""
+import starry
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def single():
+    starry.config.precision = "single"
+    yield
+    starry.config.precision = "double"
+
+
+def test_invalid_precision():
+    with pytest.raises(AssertionError):
+        starry.config.precision = "half"
+
+
+def test_flux(single):
+    map = starry.Map(ydeg=3, udeg=2)
+    np.random.seed(0)
+    map[1:, :] = 0.1 * np.random.randn(map.Ny - 1)
+    map[1:] = [0.4, 0.26]
+    kwargs = dict(
+        theta=np.linspace(0, 90, 500),
+        xo=np.linspace(-1.5, 1.5, 500),
+        yo=0.2,
+        ro=0.1,
+    )
+    X = map.design_matrix(**kwargs)
+    flux = map.flux(**kwargs)
+    assert X.dtype == np.float32
+    starry.config.precision = "double"
+    X0 = map.design_matrix(**kwargs)
+    flux0 = map.flux(**kwargs)
+    assert X0.dtype == np.float64
+    assert np.allclose(X, X0, atol=1e-6)
+    assert np.allclose(flux, flux0, atol=1e-6)
+
+
+def test_render(single):
+    map = starry.Map(ydeg=5)
+    np.random.seed(1)
+    map[1:, :] = 0.1 * np.random.randn(map.Ny - 1)
+    theta = np.linspace(0, 180, 5)
+    image = map.render(theta=theta, res=50)
+    assert image.dtype == np.float32
+    starry.config.precision = "double"
+    image0 = map.render(theta=theta, res=50)
+    assert image0.dtype == np.float64
+    assert np.array_equal(np.isnan(image), np.isnan(image0))
+    assert np.allclose(image, image0, atol=1e-5, equal_nan=True)
+
+
+def test_reflected(single):
+    map = starry.Map(ydeg=2, reflected=True)
+    map[1:, :] = 0.1
+    kwargs = dict(xs=np.linspace(-3, 3, 100), ys=1.0, zs=1.0)
+    flux = map.flux(**kwargs)
+    image = map.render(xs=1.0, ys=1.0, zs=1.0, res=30)
+    starry.config.precision = "double"
+    flux0 = map.flux(**kwargs)
+    image0 = map.render(xs=1.0, ys=1.0, zs=1.0, res=30)
+    assert np.allclose(flux, flux0, atol=1e-6)
+    assert np.allclose(image, image0, atol=1e-5, equal_nan=True)
+
+
+def test_linalg(single):
+    map = starry.Map(ydeg=2)
+    map[1:, :] = 0.1
+    xo = np.linspace(-1.5, 1.5, 200)
+    flux = map.flux(xo=xo, yo=0.2, ro=0.5)
+    assert flux.dtype == np.float64
+    assert map.design_matrix(xo=xo, yo=0.2, ro=0.5).dtype == np.float32
+    map.set_data(flux, C=1e-6)
+    map.set_prior(L=1.0)
+    x, cho_cov = map.solve(xo=xo, yo=0.2, ro=0.5)
+    lnlike = map.lnlike(xo=xo, yo=0.2, ro=0.5)
+    assert x.dtype == np.float64
+    assert cho_cov.dtype == np.float64
+    assert np.asarray(lnlike).dtype == np.float64
+    starry.config.precision = "double"
+    x0, _ = map.solve(xo=xo, yo=0.2, ro=0.5)
+    assert np.allclose(x, x0, atol=1e-4)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Test the quadrature over finite illumination sources.
+
+"""
+import starry
+import numpy as np
+import pytest
+from starry._core.core import get_disk_quadrature
+
+
+@pytest.mark.parametrize("npts", [1, 10, 30, 100])
+def test_disk_quadrature(npts):
+    """Test that the rule integrates low order moments exactly."""
+    dx, dy, w = get_disk_quadrature(npts)
+    assert np.allclose(np.sum(w), 1)
+    assert np.all(dx ** 2 + dy ** 2 < 1)
+    assert np.allclose(np.sum(w * dx), 0)
+    if npts > 1:
+        assert np.allclose(np.sum(w * dx ** 2), 1 / 4)
+        assert np.allclose(np.sum(w * dx ** 2 * dy ** 2), 1 / 24)
+
+
+def test_convergence():
+    """Test that the flux converges and the error estimate is sensible."""
+    kwargs = dict(xs=1.5, ys=3.0, zs=-0.5 * np.arange(5), rs=1.0)
+    flux = {}
+    err = {}
+    for npts in [10, 30, 300]:
+        map = starry.Map(ydeg=2, reflected=True, source_npts=npts)
+        map[1:, :] = 0.1
+        flux[npts] = map.flux(**kwargs)
+        err[npts] = map.flux_error(**kwargs)
+    assert np.allclose(flux[10], flux[300], rtol=2e-2)
+    assert np.allclose(flux[30], flux[300], rtol=5e-3)
+    assert np.max(err[30]) < np.max(err[10])
+    assert np.max(np.abs(flux[30] - flux[300])) < 10 * np.max(err[30])
+
+    # The estimate vanishes for a point source
+    map = starry.Map(ydeg=2, reflected=True)
+    assert np.allclose(map.flux_error(**kwargs), 0)
+
+
+def test_render_integrates_to_flux():
+    """Test that the rendered image integrates to the flux."""
+    xs, ys, zs, rs = 3.0, 1.0, 2.0, 1.0
+    res = 300
+    map = starry.Map(ydeg=1, reflected=True, source_npts=30)
+    map[1, :] = [0.1, 0.2, 0.3]
+    img = map.render(xs=xs, ys=ys, zs=zs, rs=rs, res=res)
+    flux_num = np.nansum(img) * 4 / res ** 2
+    flux = map.flux(xs=xs, ys=ys, zs=zs, rs=rs)
+    assert np.allclose(flux_num, flux, rtol=1e-3)
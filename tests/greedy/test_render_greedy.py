@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Test chunked map rendering.
+
+"""
+import starry
+import numpy as np
+import pytest
+from starry._plotting import get_projection
+
+
+@pytest.mark.parametrize("projection", ["ortho", "rect", "moll"])
+def test_render_chunked(projection):
+    """Test that rendering in chunks matches rendering all at once."""
+    map = starry.Map(ydeg=5, udeg=2)
+    map[1:, :] = np.random.default_rng(0).normal(size=map.Ny - 1) * 0.1
+    map[1:] = [0.4, 0.26]
+    map.inc = 60
+    theta = np.linspace(0, 360, 7)
+    res = 50
+
+    # The full render in a single graph
+    image = map.amp * map.ops.render(
+        res,
+        get_projection(projection),
+        theta * map._angle_factor,
+        map._inc,
+        map._obl,
+        map._y,
+        map._u,
+        map._f,
+    )
+
+    # Chunked render using the cached basis
+    image_chunked = map.ops.render_frames(
+        res,
+        get_projection(projection),
+        theta * map._angle_factor,
+        map._inc,
+        map._obl,
+        map._y,
+        map._u,
+        map._f,
+        chunk=2,
+    )
+    assert np.allclose(image, map.amp * image_chunked, equal_nan=True)
+
+    # Render into a preallocated array
+    out = np.zeros((len(theta), res, res))
+    image_out = map.render(
+        res=res, projection=projection, theta=theta, out=out
+    )
+    assert image_out is out
+    assert np.allclose(image, out, equal_nan=True)
+
+
+@pytest.mark.parametrize("source_npts", [1, 10])
+@pytest.mark.parametrize("projection", ["ortho", "rect"])
+def test_render_reflected_chunked(projection, source_npts):
+    """Test chunked rendering of reflected light maps."""
+    map = starry.Map(ydeg=3, reflected=True, source_npts=source_npts)
+    map[1:, :] = np.random.default_rng(1).normal(size=map.Ny - 1) * 0.1
+    theta = np.linspace(0, 360, 5)
+    xs = np.linspace(-3, 3, 5)
+    ys = 1.0
+    zs = np.linspace(1, -1, 5)
+    rs = 0.5
+    res = 50
+    args = (
+        theta * map._angle_factor,
+        map._inc,
+        map._obl,
+        map._y,
+        map._u,
+        map._f,
+        xs,
+        np.ones_like(xs) * ys,
+        zs,
+        rs,
+        map._sigr,
+        0,
+    )
+
+    # The full render in a single graph
+    image = map.ops.render(res, get_projection(projection), 1, *args)
+
+    # Chunked render, skipping the night side
+    image_chunked = map.ops.render_frames(
+        res, get_projection(projection), 1, *args, chunk=2
+    )
+    assert np.allclose(image, image_chunked, equal_nan=True)
+
+    # Render into a preallocated array
+    out = np.zeros((len(theta), res, res))
+    image_out = map.render(
+        res=res,
+        projection=projection,
+        theta=theta,
+        xs=xs,
+        ys=ys,
+        zs=zs,
+        rs=rs,
+        out=out,
+    )
+    assert image_out is out
+    assert np.allclose(image, out, equal_nan=True)
@@ -24,3 +24,19 @@ def test_rotate_spectral():
     map[1, -1, 1] = 1
     map.rotate(np.array([0, 0, 1]), np.array(90.0))
     assert np.allclose(map.y, [[1, 1], [1, 0], [0, 0], [0, -1]])
+
+
+def test_right_project_fourier():
+    """
+    Test that the Fourier series evaluation of the phase rotation matches
+    the explicit rotation of each row.
+
+    """
+    map = starry.Map(5)
+    M = np.random.default_rng(0).normal(size=(1, map.Ny))
+    inc = np.array(60.0 * np.pi / 180)
+    obl = np.array(30.0 * np.pi / 180)
+    theta = np.linspace(0, 2 * np.pi, 50)
+    MR = map.ops.right_project(np.tile(M, (50, 1)), inc, obl, theta)
+    MR_fourier = map.ops.right_project_fourier(M, inc, obl, theta)
+    assert np.allclose(MR, MR_fourier)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Test the extended precision fallback in the occultation solver.
+
+"""
+import starry
+import numpy as np
+
+
+def test_extended_flags():
+    """Test that only ill-conditioned points are flagged."""
+    map = starry.Map(ydeg=20)
+    ops = map.ops._c_ops
+    b = np.linspace(0, 1.5, 100)
+    assert not np.any(ops.sT_extended(b, 0.1))
+    assert np.all(ops.sT_extended(np.linspace(0, 0.05, 10), 0.9))
+    assert not np.any(starry.Map(ydeg=2).ops._c_ops.sT_extended(b, 0.9))
+
+    # Disable the fallback
+    ops.sT_tol = np.inf
+    assert not np.any(ops.sT_extended(b, 0.9))
+
+
+def test_extended_smooth():
+    """Test that the high degree solution is smooth inside the disk."""
+    b = np.linspace(0.01, 0.05, 50)
+    x = (b - 0.03) / 0.02
+    V = np.polynomial.chebyshev.chebvander(x, 8)
+    ops = starry.Map(ydeg=20).ops._c_ops
+    for tol, smooth in [(1e-10, True), (np.inf, False)]:
+        ops.sT_tol = tol
+        sT = ops.sT(b, 0.9)
+        coeffs = np.linalg.lstsq(V, sT, rcond=None)[0]
+        error = np.max(np.abs(V.dot(coeffs) - sT))
+        assert (error < 1e-9) == smooth
+
+
+def test_extended_gradient():
+    """Test the derivatives at points computed in extended precision."""
+    ops = starry.Map(ydeg=20).ops._c_ops
+    b = np.array([0.0, 1e-12, 0.02, 0.05])
+    r = 1.0
+    assert np.all(ops.sT_extended(b, r))
+    sT, dsTdb, dsTdr = ops.sTGrad(b, r)
+    assert np.allclose(ops.sT(b, r), sT)
+    eps = 1e-6
+    b_ = b[2:]
+    dsTdb_num = (ops.sT(b_ + eps, r) - ops.sT(b_ - eps, r)) / (2 * eps)
+    dsTdr_num = (ops.sT(b_, r + eps) - ops.sT(b_, r - eps)) / (2 * eps)
+    assert np.allclose(dsTdb[2:], dsTdb_num, atol=1e-5)
+    assert np.allclose(dsTdr[2:], dsTdr_num, atol=1e-5)
+    assert np.all(np.isfinite(dsTdb)) and np.all(np.isfinite(dsTdr))
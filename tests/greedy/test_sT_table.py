@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Test the interpolation tables for the occultation solution vector.
+
+"""
+import starry
+import numpy as np
+import pickle
+import pytest
+
+
+@pytest.mark.parametrize("ro", [0.1, 1.0, 1.5])
+def test_table_flux(ro):
+    """Test that occultations computed from a table match the exact flux."""
+    map = starry.Map(ydeg=5)
+    np.random.seed(0)
+    map[1:, :] = 0.1 * np.random.randn(map.Ny - 1)
+    xo = np.linspace(-1.5 - ro, 1.5 + ro, 1000)
+    yo = 0.3
+    flux = map.flux(xo=xo, yo=yo, ro=ro)
+    map.ops.add_sT_table(ro)
+    table = map.ops._sT.get_table(ro)
+    assert table.error[0] < table.tol
+    assert table.error[1] < table.dtol
+    assert np.allclose(map.flux(xo=xo, yo=yo, ro=ro), flux, atol=1e-9)
+
+    # Other radii are computed exactly
+    flux2 = map.flux(xo=xo, yo=yo, ro=0.5 * ro)
+    map.ops.clear_sT_tables()
+    assert np.allclose(map.flux(xo=xo, yo=yo, ro=0.5 * ro), flux2)
+
+
+def test_table_gradient():
+    """Test the derivatives of the tabulated solution vector."""
+    map = starry.Map(ydeg=3)
+    ro = 0.25
+    b = np.linspace(0.001, 1.249, 10000)
+    sT, dsTdb, dsTdr = map.ops._c_ops.sTGrad(b, ro)
+    table = starry._core.ops.get_sT_table(map.ops._c_ops.sTGrad, map.Ny, ro)
+    sT_, dsTdb_, dsTdr_ = table.evaluate(
+        b, map.ops._c_ops.sTGrad, gradient=True
+    )
+    assert np.allclose(sT_, sT, rtol=0, atol=table.tol)
+    assert np.allclose(dsTdb_, dsTdb, rtol=0, atol=table.dtol)
+    assert np.allclose(dsTdr_, dsTdr, rtol=0, atol=table.dtol)
+
+
+def test_table_pickle():
+    """Test that tables can be serialized."""
+    map = starry.Map(ydeg=2)
+    table = starry._core.ops.get_sT_table(map.ops._c_ops.sTGrad, map.Ny, 0.1)
+    table2 = pickle.loads(pickle.dumps(table))
+    b = np.linspace(0.01, 1.09, 100)
+    assert np.array_equal(table.evaluate(b), table2.evaluate(b))
@@ -72,3 +72,65 @@ def test_two_spots():
     map.spot(lon=0)
     map.spot(lon=90)
     return np.isclose(map.intensity(lon=0), map.intensity(lon=90))
+
+
+def test_spots():
+    """
+    Test that adding several spots at once is equivalent to adding them
+    one at a time.
+
+    """
+    contrast = [0.1, 0.2, 0.3]
+    radius = [10, 20, 30]
+    lat = [30, -20, 0]
+    lon = [80, 0, -45]
+
+    # One at a time
+    map1 = starry.Map(ydeg=15)
+    for n in range(3):
+        map1.spot(
+            contrast=contrast[n], radius=radius[n], lat=lat[n], lon=lon[n]
+        )
+
+    # All at once
+    map2 = starry.Map(ydeg=15)
+    map2.spots(contrast=contrast, radius=radius, lat=lat, lon=lon)
+    assert np.allclose(map1.amp, map2.amp)
+    assert np.allclose(map1.y, map2.y)
+
+    # Shared radius
+    map1 = starry.Map(ydeg=15)
+    for n in range(3):
+        map1.spot(contrast=contrast[n], radius=15, lat=lat[n], lon=lon[n])
+    map2 = starry.Map(ydeg=15)
+    map2.spots(contrast=contrast, radius=15, lat=lat, lon=lon)
+    assert np.allclose(map1.amp, map2.amp)
+    assert np.allclose(map1.y, map2.y)
+
+
+def test_spots_settings():
+    """
+    Test that changing the spot settings updates the expansion computed
+    by ``spots``.
+
+    """
+    map1 = starry.Map(ydeg=10)
+    map2 = starry.Map(ydeg=10)
+    for spot_smoothing in [0.1, 0.3]:
+        for map in [map1, map2]:
+            map.reset()
+        map1.spot(
+            contrast=0.1,
+            radius=20,
+            lat=30,
+            lon=45,
+            spot_smoothing=spot_smoothing,
+        )
+        map2.spots(
+            contrast=[0.1],
+            radius=20,
+            lat=[30],
+            lon=[45],
+            spot_smoothing=spot_smoothing,
+        )
+        assert np.allclose(map1.y, map2.y)
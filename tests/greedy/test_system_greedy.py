@@ -85,3 +85,61 @@ def test_reflected_light():
     flux = sys.flux(t)
 
     # TODO: Add an analytic validation here
+
+
+def test_kepler_solver():
+    """Test the batched Kepler solver against Kepler's equation."""
+    from starry import _c_ops
+    from starry._core.ops import KeplerOp
+
+    ecc = np.array([0.0, 0.3, 0.95])
+    M = np.linspace(-20, 20, 1000)[:, None] * np.array([1.0, 2.0, 3.0])
+    sinf, cosf = _c_ops.kepler(M, ecc)
+    assert np.allclose(sinf ** 2 + cosf ** 2, 1)
+
+    # Recover the mean anomaly from the true anomaly
+    f = np.arctan2(sinf, cosf)
+    E = 2 * np.arctan(np.sqrt((1 - ecc) / (1 + ecc)) * np.tan(f / 2))
+    dM = E - ecc * np.sin(E) - M
+    assert np.allclose(np.remainder(dM + np.pi, 2 * np.pi) - np.pi, 0)
+
+    # The op caches the most recent solutions
+    kepler = KeplerOp(_c_ops.kepler)
+    func = theano.function([], kepler(M, ecc))
+    assert np.allclose(func()[0], sinf)
+    assert len(kepler._cache) == 1
+    assert np.allclose(func()[1], cosf)
+    assert len(kepler._cache) == 1
+
+
+def test_design_matrix_cache():
+    pri = starry.Primary(starry.Map(ydeg=1, udeg=2, amp=1.0))
+    pri.map[1] = 0.4
+    sec = starry.Secondary(starry.Map(ydeg=1, amp=0.1), porb=1.0, r=0.1)
+    t = np.linspace(-0.1, 0.1, 100)
+    sys0 = starry.System(pri, sec)
+    sys = starry.System(pri, sec, cache_size=2)
+
+    # Changing only the map coefficients hits the cache
+    X = sys.design_matrix(t)
+    X[:] = 0.0
+    pri.map[1, 0] = 0.1
+    assert len(sys._X_cache) == 1
+    assert np.allclose(sys.flux(t), sys0.flux(t))
+    assert len(sys._X_cache) == 1
+
+    # Changing the geometry, the filter or the times does not
+    for attr, value in [("r", 0.2), ("ecc", 0.1), ("inc", 80.0)]:
+        setattr(sec, attr, value)
+        assert np.allclose(sys.flux(t), sys0.flux(t))
+    pri.map[1] = 0.5
+    assert np.allclose(sys.flux(t), sys0.flux(t))
+    pri.map.inc = 60.0
+    assert np.allclose(sys.flux(t), sys0.flux(t))
+    assert np.allclose(sys.flux(t + 0.01), sys0.flux(t + 0.01))
+    assert len(sys._X_cache) == 2
+
+    # Memory cap
+    sys = starry.System(pri, sec, cache_size=2, cache_memory=1e-6)
+    sys.flux(t)
+    assert len(sys._X_cache) == 0
@@ -62,6 +62,36 @@ def test_compare_to_map_rv():
     assert np.allclose(rv1, rv2)
 
 
+def test_fused_rv_design_matrix():
+    """
+    Ensure the fused velocity-weighted and plain design matrices match the
+    design matrices computed separately for each filter.
+
+    """
+    map = starry.Map(ydeg=2, udeg=2, rv=True, veq=1e4, alpha=0.3, inc=70)
+    map[1:, :] = 0.1 * np.random.default_rng(0).normal(size=map.Ny - 1)
+    map[1:] = [0.4, 0.26]
+    theta = np.linspace(0, 30, 100) * np.pi / 180
+    xo = np.linspace(-1.5, 1.5, 100)
+    yo = 0.3 * np.ones(100)
+    zo = np.ones(100)
+    ro = np.array(0.1)
+    args = (theta, xo, yo, zo, ro, map._inc, map._obl)
+
+    # The two filters
+    f = map.ops.compute_rv_filter(map._inc, map._obl, map._veq, map._alpha)
+    f0 = np.zeros_like(f)
+    f0[0] = np.pi
+
+    # Fused
+    rv = map.ops.rv(*args, map._y, map._u, map._veq, map._alpha)
+
+    # Separately
+    Iv = map.ops.X(*args, map._u, f) @ map._y
+    I = map.ops.X(*args, map._u, f0) @ map._y
+    assert np.allclose(rv, Iv / I)
+
+
 def test_compare_to_exoplanet():
     """Ensure we get the same result with `starry` and `exoplanet`."""
     # Define the star
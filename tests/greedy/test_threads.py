@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Test concurrent evaluation of maps from several threads.
+
+"""
+import starry
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_threaded_flux():
+    """Test that concurrent calls to `flux` match the serial results."""
+    map = starry.Map(ydeg=5, udeg=2)
+    np.random.seed(0)
+    map[1:, :] = 0.1 * np.random.randn(map.Ny - 1)
+    map[1:] = [0.4, 0.2]
+    xo = np.linspace(-1.5, 1.5, 500)
+    args = [
+        dict(theta=10.0 * k, xo=xo, yo=0.1 * (k % 5), ro=0.05 * (k % 4 + 1))
+        for k in range(32)
+    ]
+    expected = [map.flux(**kwargs) for kwargs in args]
+    with ThreadPoolExecutor(8) as executor:
+        for _ in range(4):
+            flux = list(executor.map(lambda kwargs: map.flux(**kwargs), args))
+            for f1, f2 in zip(flux, expected):
+                assert np.array_equal(f1, f2)
+
+
+def test_threaded_ops():
+    """Test that the C++ ops can be evaluated concurrently."""
+    ops = starry.Map(ydeg=10).ops._c_ops
+    b = [np.linspace(0, 1.05, 1000) + 0.001 * k for k in range(16)]
+    expected = [ops.sTGrad(b_, 0.9) for b_ in b]
+    with ThreadPoolExecutor(8) as executor:
+        result = list(executor.map(lambda b_: ops.sTGrad(b_, 0.9), b))
+    for res, exp in zip(result, expected):
+        for x1, x2 in zip(res, exp):
+            assert np.array_equal(x1, x2)
+
+
+def test_thread_copies():
+    """Test that copies of compiled functions are reused across threads."""
+    map = starry.Map(ydeg=2)
+    xo = np.linspace(-1.5, 1.5, 100)
+    expected = map.flux(xo=xo, ro=0.1)
+    nkeys = None
+    for _ in range(3):
+        with ThreadPoolExecutor(4) as executor:
+            flux = list(
+                executor.map(lambda k: map.flux(xo=xo, ro=0.1), range(8))
+            )
+        for f in flux:
+            assert np.array_equal(f, expected)
+        keys = [key for key in map.ops.__dict__ if key.startswith("__")]
+        if nkeys is None:
+            nkeys = len(keys)
+        assert len(keys) == nkeys
+
+    # The copies are returned to a bounded pool
+    pools = [
+        value
+        for key, value in map.ops.__dict__.items()
+        if key.startswith("__flux_") and key.endswith("_pool")
+    ]
+    assert len(pools) == 1
+    assert 1 <= len(pools[0]) <= 4
+
+    # Clearing the cache also drops the pooled copies
+    starry._core.utils.clear_cache(map.ops, map.ops.flux)
+    assert not any(key.startswith("__flux_") for key in map.ops.__dict__)
+
+
+def test_copy_function():
+    """Test that copies of compiled functions preserve in-place ops."""
+    map = starry.Map(ydeg=5, udeg=2)
+    xo = np.linspace(-1.5, 1.5, 100)
+    expected = map.flux(xo=xo, ro=0.1)
+    cname = [key for key in map.ops.__dict__ if key.startswith("__flux_")]
+    func = getattr(map.ops, cname[0])
+    setattr(map.ops, cname[0], starry._core.utils._copy_function(func))
+    assert np.array_equal(map.flux(xo=xo, ro=0.1), expected)
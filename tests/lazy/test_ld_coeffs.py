@@ -2,6 +2,7 @@
 import numpy as np
 from starry.compat import theano
 from starry.compat import tt
+from starry import _c_ops
 from starry._core.ops.limbdark.get_cl import GetClOp
 from starry._core.ops.limbdark.get_cl_rev import GetClRevOp
 
@@ -71,7 +72,7 @@ class TestGetCl(InferShapeTester):
     def setup_method(self):
         super().setup_method()
         self.op_class = GetClOp
-        self.op = GetClOp()
+        self.op = GetClOp(_c_ops.get_cl, _c_ops.get_cl_rev)
 
     def test_basic(self):
         x = tt.dvector()
@@ -98,7 +99,7 @@ class TestGetClRev(InferShapeTester):
     def setup_method(self):
         super().setup_method()
         self.op_class = GetClRevOp
-        self.op = GetClRevOp()
+        self.op = GetClRevOp(_c_ops.get_cl_rev)
 
     def test_basic(self):
         x = tt.dvector()
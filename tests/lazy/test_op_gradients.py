@@ -426,6 +426,26 @@ def test_rv(abs_tol=1e-5, rel_tol=1e-5, eps=1e-7):
         )
 
 
+def test_kepler(abs_tol=1e-5, rel_tol=1e-5, eps=1e-7):
+    from starry import _c_ops
+    from starry._core.ops import KeplerOp
+
+    with change_flags(compute_test_value="off"):
+        kepler = KeplerOp(_c_ops.kepler)
+        M = np.linspace(-3, 3, 20)[:, None] * np.array([1.0, 1.5])
+        ecc = np.array([0.1, 0.7])
+        for i in range(2):
+            theano.gradient.verify_grad(
+                lambda M, ecc: kepler(M, ecc)[i],
+                (M, ecc),
+                abs_tol=abs_tol,
+                rel_tol=rel_tol,
+                eps=eps,
+                n_tests=1,
+                rng=np.random,
+            )
+
+
 def test_spot(abs_tol=1e-5, rel_tol=1e-5, eps=1e-7):
     with change_flags(compute_test_value="off"):
         map = starry.Map(ydeg=5)